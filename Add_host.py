@@ -10,6 +10,8 @@ GREENISH = "\033[92m"
 YELLOW = "\033[93m"
 BOLD = "\033[1m"
 
+HOSTS_FILE = "/etc/hosts"
+
 def display_menu():
     print(f"{SKY_BLUE}{BOLD}Manage /etc/hosts File{RESET}")
     print(f"{GREENISH}1. Add an IP and domain")
@@ -21,7 +23,7 @@ def display_menu():
 
 def display_hosts_entries(show=True):
     """Fetch and optionally display current /etc/hosts entries."""
-    with open("/etc/hosts", "r") as hosts_file:
+    with open(HOSTS_FILE, "r") as hosts_file:
         lines = hosts_file.readlines()
         entries = [line.strip() for line in lines if line.strip() and not line.startswith("#")]
     if show:
@@ -33,13 +35,31 @@ def display_hosts_entries(show=True):
                 print(f"{idx}. {entry}")
     return entries
 
+def add_hosts_entry(ip_address, domain_name):
+    """Append an entry to /etc/hosts and return it. Raises OSError on failure."""
+    entry = f"{ip_address} {domain_name}"
+    with open(HOSTS_FILE, "a") as hosts_file:
+        hosts_file.write(f"\n{entry}\n")
+    return entry
+
+def delete_hosts_entry(entry_to_delete):
+    """Remove every /etc/hosts line matching the entry. Returns the number of removed lines."""
+    with open(HOSTS_FILE, "r") as hosts_file:
+        lines = hosts_file.readlines()
+    removed = 0
+    with open(HOSTS_FILE, "w") as hosts_file:
+        for line in lines:
+            if line.strip() != entry_to_delete:
+                hosts_file.write(line)
+            else:
+                removed += 1
+    return removed
+
 def add_entry():
     ip_address = input(f"{YELLOW}Enter the IP address: {RESET}")
     domain_name = input(f"{YELLOW}Enter the domain name: {RESET}")
-    entry = f"{ip_address} {domain_name}"
     try:
-        with open("/etc/hosts", "a") as hosts_file:
-            hosts_file.write(f"\n{entry}\n")
+        entry = add_hosts_entry(ip_address, domain_name)
         print(f"{GREENISH}Successfully added the entry: {BOLD}{entry}{RESET}")
     except PermissionError:
         print(f"{YELLOW}Permission denied. Please run the script with root privileges.{RESET}")
@@ -60,12 +80,7 @@ def delete_entry():
             print(f"{GREENISH}Deleting entry: {BOLD}{entry_to_delete}{RESET}")
             
             # Update the hosts file
-            with open("/etc/hosts", "r") as hosts_file:
-                lines = hosts_file.readlines()
-            with open("/etc/hosts", "w") as hosts_file:
-                for line in lines:
-                    if line.strip() != entry_to_delete:
-                        hosts_file.write(line)
+            delete_hosts_entry(entry_to_delete)
             print(f"{GREENISH}Successfully deleted the entry.{RESET}")
         else:
             print(f"{YELLOW}Invalid choice. No changes made.{RESET}")
@@ -0,0 +1,286 @@
+import ipaddress
+import json
+import os
+import re
+import shlex
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from Process_Runner import CommandResult, clear_observers, notify_observers, stream_command
+from Result_Cache import ResultCache, cached_result, store_result
+from Tool_Registry import ToolRegistry
+
+# Define color codes for terminal output
+RESET = "\033[0m"
+SKY_BLUE = "\033[94m"
+GREENISH = "\033[92m"
+YELLOW = "\033[93m"
+BOLD = "\033[1m"
+
+# Tools available in batch mode: name -> (category, command template, timeout)
+BATCH_TOOLS = {
+    "dig": ("dns", "dig {target} ANY", 45),
+    "nslookup": ("dns", "nslookup {target}", 45),
+    "host": ("dns", "host {target}", 45),
+    "dnsenum": ("dns", "dnsenum --noreverse --enum {target}", 180),
+    "fierce": ("dns", "fierce --domain {target}", 45),
+    "dnsrecon": ("recon", "dnsrecon -d {target}", 300),
+    "theHarvester": ("recon", "theHarvester -d {target} -l 100 -b all", 300),
+    "amass": ("recon", "amass enum -d {target} -passive", 900),
+    "assetfinder": ("recon", "assetfinder --subs-only {target}", 300),
+    "gobuster-dir": ("brute", "gobuster dir -u http://{target} -w {wordlist}", 1800),
+    "gobuster-dns": ("brute", "gobuster dns -d {target} -w {wordlist}", 1800),
+    "feroxbuster": ("brute", "feroxbuster -u http://{target} -w {wordlist}", 1800),
+}
+
+# A hostname: dot-separated labels of letters, digits, '-' and '_', optionally fully qualified
+HOSTNAME = re.compile(r"^(?=.{1,253}\.?$)([A-Za-z0-9_](?:[A-Za-z0-9_-]{0,61}[A-Za-z0-9_])?\.?)+$")
+
+_worker_cache = None
+
+def is_valid_target(target):
+    """
+    Whether target is a hostname, an IP address or a CIDR range, optionally followed by :port.
+    """
+    if target.startswith("[") and "]:" in target:
+        host, _, port = target.rpartition(":")
+    else:
+        host, _, port = target.rpartition(":") if target.count(":") == 1 else (target, "", "")
+    if port and not (port.isdigit() and 0 < int(port) < 65536):
+        return False
+    if HOSTNAME.match(host):
+        return True
+    try:
+        ipaddress.ip_network(host.strip("[]"), strict=False)
+    except ValueError:
+        return False
+    return True
+
+def read_targets(source):
+    """
+    Reads targets from a file path, or from stdin when source is "-".
+    Blank lines and '#' comments are skipped; duplicates are dropped, order is kept.
+    Targets end up in shell commands, so anything that is not a hostname, IP address
+    or CIDR range (see is_valid_target) raises ValueError.
+    """
+    stream = sys.stdin if source == "-" else open(source)
+    try:
+        targets = {}
+        for number, line in enumerate(stream, 1):
+            target = line.split("#", 1)[0].strip()
+            if not target:
+                continue
+            if not is_valid_target(target):
+                raise ValueError(f"{source}:{number}: not a hostname, IP address or CIDR range: {target!r}")
+            targets[target] = None
+        return list(targets)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def safe_name(target):
+    """
+    Turns a target into a string usable as a directory name.
+    """
+    return re.sub(r"[^A-Za-z0-9._-]", "_", target) or "_"
+
+def _init_batch_worker():
+    """
+    Forked workers inherit the parent's command observers; usage is reported back in
+    the task summary instead, so the parent's metrics are not written from stale copies.
+    """
+    clear_observers()
+
+def _run_batch_task(tool, target, command, timeout, output_path, use_cache):
+    """
+    Runs one tool against one target in a worker process, writing its output to
+    output_path. Returns a summary dict for the parent.
+    """
+    global _worker_cache
+    started = time.time()
+    summary = {"tool": tool, "target": target, "command": command, "output_file": output_path}
+    mode = "use" if use_cache else "off"
+
+    if use_cache:
+        if _worker_cache is None:
+            _worker_cache = ResultCache()
+        try:
+            cached = cached_result(_worker_cache, target, command, mode)
+        except Exception:
+            cached = None
+        if cached:
+            with open(output_path, "w") as output_file:
+                output_file.write(cached[0] + "\n")
+            summary.update(ok=True, returncode=0, timed_out=False, cached=True,
+                           lines=cached[0].count("\n") + 1, duration=round(time.time() - started, 3))
+            return summary
+
+    with open(output_path, "w") as output_file:
+        result = stream_command(command, timeout=timeout,
+                                on_line=lambda line: output_file.write(line + "\n"))
+        if result.stderr_tail:
+            output_file.write("\n# stderr (tail)\n" + result.stderr_text() + "\n")
+
+    if use_cache:
+        try:
+            store_result(_worker_cache, target, command, result, mode)
+        except Exception:
+            pass
+    if result.spill_path:
+        os.unlink(result.spill_path)
+
+    summary.update(ok=result.ok, returncode=result.returncode, timed_out=result.timed_out,
+                   cached=False, lines=result.line_count, duration=round(time.time() - started, 3),
+                   usage=result.usage())
+    return summary
+
+def run_batch(targets, tools, output_dir, wordlist=None, max_workers=None, per_target=2,
+              use_cache=True, on_result=None, registry=None):
+    """
+    Runs every selected tool against every target on a process pool.
+    max_workers bounds the total number of running tools, per_target bounds the number
+    running against any single target. Output is written to output_dir/<target>/<tool>.txt
+    with a summary.json per target and a batch_summary.json for the whole run.
+    With a ToolRegistry, tools that are not installed are reported once per target
+    instead of being started, and compatibility fixes are applied before the fan-out.
+    Returns {target: [summary, ...]}.
+    """
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    per_target = max(1, per_target)
+    missing = set()
+    if registry is not None:
+        missing = {tool for tool in tools if not registry.get(BATCH_TOOLS[tool][1].split()[0])}
+    queues = {}
+    results = {target: [] for target in targets}
+    for target in targets:
+        target_dir = os.path.join(output_dir, safe_name(target))
+        os.makedirs(target_dir, exist_ok=True)
+        tasks = deque()
+        for tool in tools:
+            _, template, timeout = BATCH_TOOLS[tool]
+            command = template.format(target=shlex.quote(target), wordlist=shlex.quote(wordlist or ""))
+            if tool in missing:
+                results[target].append({"tool": tool, "target": target, "command": command, "ok": False,
+                                        "error": "not installed"})
+                continue
+            tasks.append((tool, target, command, timeout, os.path.join(target_dir, f"{tool}.txt"), use_cache))
+        queues[target] = tasks
+
+    running = {target: 0 for target in targets}
+    order = deque(target for target in targets if queues[target])
+    total = sum(len(tasks) + len(results[target]) for target, tasks in queues.items())
+    done = 0
+    if on_result:
+        for summaries in results.values():
+            for summary in summaries:
+                done += 1
+                on_result(done, total, summary)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_worker) as executor:
+        in_flight = {}
+        while order or in_flight:
+            # Fill free worker slots round-robin, respecting the per-target limit
+            skipped = 0
+            while order and len(in_flight) < max_workers and skipped < len(order):
+                target = order[0]
+                order.rotate(-1)
+                if running[target] >= per_target:
+                    skipped += 1
+                    continue
+                skipped = 0
+                in_flight[executor.submit(_run_batch_task, *queues[target].popleft())] = target
+                running[target] += 1
+                if not queues[target]:
+                    order.remove(target)
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                target = in_flight.pop(future)
+                running[target] -= 1
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    summary = {"target": target, "ok": False, "error": str(e)}
+                if "usage" in summary:
+                    notify_observers(CommandResult.from_usage(summary["command"], summary["usage"]))
+                results[target].append(summary)
+                done += 1
+                if on_result:
+                    on_result(done, total, summary)
+
+    for target, summaries in results.items():
+        with open(os.path.join(output_dir, safe_name(target), "summary.json"), "w") as summary_file:
+            json.dump({"target": target, "results": summaries}, summary_file, indent=2)
+    with open(os.path.join(output_dir, "batch_summary.json"), "w") as summary_file:
+        json.dump({"targets": len(targets), "tools": list(tools), "results": results}, summary_file, indent=2)
+    return results
+
+# End of run_batch----------------------------------------------
+
+def batch_mode_menu(use_cache=True):
+    """
+    Interactive front end for run_batch: collects the target source, tools,
+    concurrency limits and output directory, then runs the batch.
+    """
+    print(f"{BOLD}{YELLOW}Batch Mode - run tools across many targets:{RESET}")
+    source = input(f"{BOLD}{YELLOW}Enter path to targets file ('-' to read from stdin): {RESET}").strip()
+    if not source:
+        print(f"{YELLOW}No target source provided. Returning to main menu.{RESET}")
+        return
+    if source == "-":
+        print(f"{GREENISH}Enter one target per line, then Ctrl-D:{RESET}")
+    try:
+        targets = read_targets(source)
+    except (OSError, ValueError) as e:
+        print(f"{YELLOW}Could not read targets: {e}{RESET}")
+        return
+    if not targets:
+        print(f"{YELLOW}No targets found. Returning to main menu.{RESET}")
+        return
+    print(f"{GREENISH}Loaded {len(targets)} targets.{RESET}")
+
+    names = list(BATCH_TOOLS)
+    for idx, name in enumerate(names, 1):
+        print(f"{idx}. {name} ({BATCH_TOOLS[name][0]})")
+    selection = input(f"{BOLD}{YELLOW}Select tools (comma-separated numbers) [default: 1,2,3]: {RESET}").strip() or "1,2,3"
+    try:
+        tools = [names[int(number) - 1] for number in selection.split(",") if number.strip()]
+    except (ValueError, IndexError):
+        print(f"{YELLOW}Invalid tool selection. Returning to main menu.{RESET}")
+        return
+
+    wordlist = None
+    if any(BATCH_TOOLS[tool][0] == "brute" for tool in tools):
+        wordlist = input(f"{BOLD}{YELLOW}Enter the path to your wordlist: {RESET}").strip()
+        if not wordlist:
+            print(f"{YELLOW}Brute-force tools need a wordlist. Returning to main menu.{RESET}")
+            return
+
+    try:
+        max_workers = int(input(f"{BOLD}{YELLOW}Global concurrency limit [default: {os.cpu_count() or 1}]: {RESET}").strip()
+                          or os.cpu_count() or 1)
+        per_target = int(input(f"{BOLD}{YELLOW}Per-target concurrency limit [default: 2]: {RESET}").strip() or 2)
+    except ValueError:
+        print(f"{YELLOW}Concurrency limits must be numbers. Returning to main menu.{RESET}")
+        return
+    output_dir = input(f"{BOLD}{YELLOW}Output directory [default: batch_results]: {RESET}").strip() or "batch_results"
+
+    def report(done, total, summary):
+        status = "ok" if summary.get("ok") else ("timeout" if summary.get("timed_out") else "failed")
+        cached = " (cached)" if summary.get("cached") else ""
+        print(f"{SKY_BLUE}[{done}/{total}]{RESET} {summary.get('tool', '?')} {summary['target']}: "
+              f"{status}{cached} ({summary.get('duration', 0)}s)")
+
+    started = time.time()
+    registry = ToolRegistry()
+    for tool in tools:
+        binary = BATCH_TOOLS[tool][1].split()[0]
+        if not registry.get(binary):
+            print(f"{YELLOW}{binary} is not installed; {tool} will be skipped.{RESET}")
+    run_batch(targets, tools, output_dir, wordlist=wordlist, max_workers=max_workers,
+              per_target=per_target, use_cache=use_cache, on_result=report, registry=registry)
+    print(f"{BOLD}{GREENISH}Batch finished in {time.time() - started:.1f}s. Results written to {output_dir}{RESET}")
+
+# End of batch_mode_menu----------------------------------------------
@@ -0,0 +1,267 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Output line each stub prints, in the format the real tool uses, so parsers do real work
+STUB_LINES = {
+    "dig": "example.com.\t300\tIN\tA\t93.184.216.34",
+    "nslookup": "example.com\tmail exchanger = 10 mail.example.com.",
+    "host": "example.com has address 93.184.216.34",
+    "dnsenum": "example.com.\t300\tIN\tA\t93.184.216.34",
+    "fierce": "Found: www.example.com. (93.184.216.34)",
+    "dnsrecon": "[*] \t A example.com 93.184.216.34",
+    "theHarvester": "www.example.com:93.184.216.34",
+    "amass": "www.example.com",
+    "assetfinder": "www.example.com",
+    "puredns": "www.example.com",
+    "gobuster": "/admin                (Status: 301) [Size: 178]",
+    "feroxbuster": "200      GET       10l       20w      300c http://example.com/admin",
+}
+STUB_TEMPLATE = """#!/bin/sh
+# Benchmark stub for {tool}: SCR_STUB_LATENCY seconds of work, then SCR_STUB_LINES lines
+case "$1" in
+    -v|-V|--version|-version|version) echo "{tool} 0.0.0-stub"; exit 0 ;;
+esac
+sleep "${{SCR_STUB_LATENCY:-{latency}}}"
+yes '{line}' | head -n "${{SCR_STUB_LINES:-{lines}}}"
+"""
+# Metric per benchmark that regressions are judged on (lower is better)
+PRIMARY_METRICS = {
+    "run_command_overhead": "overhead_ms_p50",
+    "dns_sweep": "concurrent_s",
+    "large_output": "peak_rss_delta_mb",
+    "batch_fanout": "seconds_per_task",
+}
+
+def write_stub_tools(directory, latency=0.0, lines=1):
+    """
+    Writes an executable stub for every tool in STUB_LINES into directory.
+    Latency and output volume can be changed per run with SCR_STUB_LATENCY/SCR_STUB_LINES.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for tool, line in STUB_LINES.items():
+        path = os.path.join(directory, tool)
+        with open(path, "w") as stub:
+            stub.write(STUB_TEMPLATE.format(tool=tool, latency=latency, lines=lines, line=line.replace("'", "")))
+        os.chmod(path, 0o755)
+
+def summarize(samples):
+    """
+    Returns min/mean/p50/p95/max of a list of seconds, in milliseconds.
+    """
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {"n": len(ordered), "min_ms": round(ordered[0] * 1000, 3),
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+            "p50_ms": round(statistics.median(ordered) * 1000, 3), "p95_ms": round(p95 * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3)}
+
+@contextlib.contextmanager
+def stub_environment(latency, lines):
+    previous = {name: os.environ.get(name) for name in ("SCR_STUB_LATENCY", "SCR_STUB_LINES")}
+    os.environ["SCR_STUB_LATENCY"] = str(latency)
+    os.environ["SCR_STUB_LINES"] = str(lines)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def _quiet(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+# Benchmarks ---------------------------------------------------------------
+
+def bench_run_command_overhead(iterations=50):
+    """
+    Per-call cost of Info_Gathering.run_command against a stub that returns at once,
+    next to a bare subprocess.run of the same command.
+    """
+    import Info_Gathering
+    command = "dig example.com A"
+    baseline, measured = [], []
+    with stub_environment(0, 1):
+        Info_Gathering.run_command(command)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            subprocess.run(command, shell=True, capture_output=True)
+            baseline.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            Info_Gathering.run_command(command)
+            measured.append(time.perf_counter() - started)
+    result = {"subprocess_run": summarize(baseline), "run_command": summarize(measured)}
+    result["overhead_ms_p50"] = round(result["run_command"]["p50_ms"] - result["subprocess_run"]["p50_ms"], 3)
+    return result
+
+def bench_dns_sweep(latency=0.2, lines=200, rounds=3):
+    """
+    Wall-clock time of run_all_dns_tools, sequential and concurrent, with every tool
+    taking latency seconds and printing lines lines.
+    """
+    import Info_Gathering
+    sequential, concurrent = [], []
+    with stub_environment(latency, lines):
+        for _ in range(rounds):
+            started = time.perf_counter()
+            _quiet(Info_Gathering.run_all_dns_tools, "example.com")
+            sequential.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            _quiet(Info_Gathering.run_all_dns_tools, "example.com", concurrent=True)
+            concurrent.append(time.perf_counter() - started)
+    return {"tools": len(Info_Gathering.DNS_SWEEP_TOOLS), "latency_s": latency, "lines": lines,
+            "sequential_s": round(statistics.median(sequential), 3),
+            "concurrent_s": round(statistics.median(concurrent), 3),
+            "speedup": round(statistics.median(sequential) / statistics.median(concurrent), 2)}
+
+def _large_output_worker(lines, stub_dir, cache_dir):
+    """
+    Runs in a fresh process so its peak RSS belongs to this measurement alone.
+    """
+    os.environ["PATH"] = stub_dir + os.pathsep + os.environ["PATH"]
+    os.environ["SCR_CACHE_DIR"] = cache_dir
+    import Info_Gathering
+    Info_Gathering.CACHE_MODE = "off"
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with stub_environment(0, lines):
+        started = time.perf_counter()
+        result = Info_Gathering.stream_command("amass enum -d example.com", timeout=600)
+        text = result.text()
+        elapsed = time.perf_counter() - started
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if result.spill_path:
+        os.unlink(result.spill_path)
+    return {"lines": result.line_count, "bytes": result.output_bytes, "spilled": bool(result.spill_path),
+            "returned_chars": len(text), "seconds": round(elapsed, 3),
+            "mb_per_s": round(result.output_bytes / 1048576 / elapsed, 1) if elapsed else None,
+            "peak_rss_delta_mb": round((after - before) / 1024, 1)}
+
+def bench_large_output(lines=2000000, stub_dir=None, cache_dir=None):
+    """
+    Memory high-water mark and throughput while streaming a very large tool output.
+    """
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_large_output_worker, (lines, stub_dir, cache_dir))
+
+def bench_batch_fanout(targets=20, tools=("dig", "host", "nslookup"), latency=0.1, workers=None):
+    """
+    Throughput of Batch_Mode.run_batch for targets x tools stub runs.
+    """
+    from Batch_Mode import run_batch
+    workers = workers or os.cpu_count() or 1
+    output_dir = tempfile.mkdtemp(prefix="scr-bench-batch-")
+    try:
+        with stub_environment(latency, 20):
+            started = time.perf_counter()
+            results = run_batch([f"t{index}.example.com" for index in range(targets)], list(tools), output_dir,
+                                max_workers=workers, per_target=2, use_cache=False)
+            elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    tasks = sum(len(summaries) for summaries in results.values())
+    failed = sum(1 for summaries in results.values() for summary in summaries if not summary.get("ok"))
+    return {"tasks": tasks, "failed": failed, "workers": workers, "latency_s": latency,
+            "seconds": round(elapsed, 3), "tasks_per_s": round(tasks / elapsed, 1),
+            "seconds_per_task": round(elapsed / tasks, 4), "ideal_seconds": round(tasks * latency / workers, 3)}
+
+# End of benchmarks----------------------------------------------
+
+def compare(current, baseline, tolerance):
+    """
+    Returns a list of regression messages: primary metrics more than tolerance
+    (a fraction) worse than in the baseline report.
+    """
+    regressions = []
+    for name, metric in PRIMARY_METRICS.items():
+        old = baseline.get("benchmarks", {}).get(name, {}).get(metric)
+        new = current["benchmarks"].get(name, {}).get(metric)
+        if old is None or new is None or old <= 0:
+            continue
+        if new > old * (1 + tolerance):
+            regressions.append(f"{name}.{metric}: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the orchestration layer against stub tools (offline, no real scans).")
+    parser.add_argument("--only", default="", help="comma-separated benchmarks to run: " + ",".join(PRIMARY_METRICS))
+    parser.add_argument("--iterations", type=int, default=50, help="run_command calls to time")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds each stub sleeps in the DNS sweep")
+    parser.add_argument("--lines", type=int, default=200, help="lines each stub prints in the DNS sweep")
+    parser.add_argument("--large-lines", type=int, default=2000000, help="lines for the large output benchmark")
+    parser.add_argument("--targets", type=int, default=20, help="targets in the batch fan-out benchmark")
+    parser.add_argument("--workers", type=int, default=None, help="batch workers [default: CPU count]")
+    parser.add_argument("-o", "--output", default="-", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs the baseline (0.2 = 20%%)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    selected = [name for name in args.only.split(",") if name] or list(PRIMARY_METRICS)
+    unknown = set(selected) - set(PRIMARY_METRICS)
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    workdir = tempfile.mkdtemp(prefix="scr-bench-")
+    stub_dir = os.path.join(workdir, "bin")
+    cache_dir = os.path.join(workdir, "cache")
+    write_stub_tools(stub_dir)
+    # Stubs shadow any real tools, and the cache starts empty and is never consulted
+    os.environ["PATH"] = stub_dir + os.pathsep + os.environ.get("PATH", "")
+    os.environ["SCR_CACHE_DIR"] = cache_dir
+    import Info_Gathering
+    Info_Gathering.CACHE_MODE = "off"
+
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "cpu_count": os.cpu_count(), "started_at": time.time(), "benchmarks": {}}
+    try:
+        for name in selected:
+            if name == "run_command_overhead":
+                result = bench_run_command_overhead(args.iterations)
+            elif name == "dns_sweep":
+                result = bench_dns_sweep(args.latency, args.lines)
+            elif name == "large_output":
+                result = bench_large_output(args.large_lines, stub_dir, cache_dir)
+            else:
+                result = bench_batch_fanout(args.targets, latency=min(args.latency, 0.1), workers=args.workers)
+            report["benchmarks"][name] = result
+            print(f"{name}: {result.get(PRIMARY_METRICS[name])} {PRIMARY_METRICS[name]}", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.tolerance)
+        report["regressions"] = regressions
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as output_file:
+            output_file.write(text + "\n")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from Findings import parse_output
+from Process_Runner import stream_command
+from Rate_Control import apply_rate_options, observe_tool_run
+from Result_Cache import CACHE_DIR
+from Wildcard_Dns import filter_lines, filtered_lines, flush_lines
+from Wordlist import Wordlist
+
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, "checkpoints")
+# Placeholder replaced by the chunk file path in chunked command templates
+WORDLIST_PLACEHOLDER = "{wordlist}"
+DEFAULT_CHUNK_LINES = 5000
+# Consecutive failed attempts at one chunk before the run is paused
+MAX_CHUNK_FAILURES = 3
+
+class Checkpoint:
+    """
+    Progress of one long-running wordlist job: the next unprocessed line of the
+    wordlist and the findings collected so far. Progress is saved atomically as a
+    small JSON file; findings are appended to a JSON lines file next to it, and the
+    progress file records how many of its bytes belong to saved chunks, so each save
+    costs only the new findings and an interrupted run resumes from the last
+    completed offset.
+    """
+
+    def __init__(self, tool, target, command, wordlist, directory=CHECKPOINT_DIR):
+        self.tool = tool
+        self.target = target
+        self.command = command
+        self.wordlist = os.path.abspath(wordlist)
+        self.job_id = hashlib.sha256(f"{tool}\0{target}\0{command}\0{self.wordlist}".encode()).hexdigest()[:16]
+        self.path = os.path.join(directory, f"{self.job_id}.json")
+        self.findings_path = os.path.join(directory, f"{self.job_id}.findings.jsonl")
+        stat = os.stat(self.wordlist)
+        self.wordlist_size = stat.st_size
+        self.wordlist_mtime_ns = stat.st_mtime_ns
+        self.offset = 0
+        self.total = None
+        self.findings = []
+        self.status = "new"
+        self.updated_at = None
+        # Bytes of findings_path written by completed saves, and findings not yet written
+        self._findings_bytes = 0
+        self._unsaved = []
+
+    def load(self):
+        """
+        Restores progress from disk. Returns True if a usable checkpoint was found;
+        a checkpoint for a wordlist that has since changed is ignored.
+        """
+        try:
+            with open(self.path) as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except (OSError, ValueError):
+            return False
+        if (state.get("wordlist_size"), state.get("wordlist_mtime_ns")) != (self.wordlist_size, self.wordlist_mtime_ns):
+            return False
+        findings_bytes = state.get("findings_bytes", 0)
+        try:
+            with open(self.findings_path, "rb") as findings_file:
+                # Anything past findings_bytes came from a chunk that never completed
+                data = findings_file.read(findings_bytes)
+        except OSError:
+            data = b""
+        if len(data) != findings_bytes:
+            return False
+        self.findings = [json.loads(line) for line in data.splitlines() if line]
+        self._findings_bytes = findings_bytes
+        self._unsaved = []
+        self.offset = state.get("offset", 0)
+        self.total = state.get("total")
+        self.status = state.get("status", "running")
+        self.updated_at = state.get("updated_at")
+        return True
+
+    def save(self):
+        self.updated_at = time.time()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if self._unsaved or not self._findings_bytes:
+            # Drop leftovers of an unfinished chunk (or an earlier run) before appending
+            with open(self.findings_path, "ab") as findings_file:
+                findings_file.truncate(self._findings_bytes)
+                findings_file.write(b"".join(json.dumps(finding).encode() + b"\n" for finding in self._unsaved))
+                self._findings_bytes = findings_file.tell()
+            self._unsaved = []
+        state = {
+            "job_id": self.job_id, "tool": self.tool, "target": self.target, "command": self.command,
+            "wordlist": self.wordlist, "wordlist_size": self.wordlist_size,
+            "wordlist_mtime_ns": self.wordlist_mtime_ns, "offset": self.offset, "total": self.total,
+            "findings_bytes": self._findings_bytes, "status": self.status, "updated_at": self.updated_at,
+        }
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as checkpoint_file:
+            json.dump(state, checkpoint_file)
+        os.replace(temp_path, self.path)
+
+    def add_findings(self, findings):
+        """
+        Adds Findings; they are written to disk by the next save().
+        """
+        findings = [finding.as_dict() for finding in findings]
+        self.findings.extend(findings)
+        self._unsaved.extend(findings)
+
+    def discard(self):
+        for path in (self.path, self.findings_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    @property
+    def resumable(self):
+        return self.status != "done" and self.offset > 0
+
+# End of Checkpoint----------------------------------------------
+
+def run_chunked(checkpoint, chunk_lines=DEFAULT_CHUNK_LINES, timeout=600, on_line=None, on_chunk=None,
+                controller=None, line_filter=None, cancel=None):
+    """
+    Runs an external tool over a wordlist in chunks, starting at checkpoint.offset.
+    checkpoint.command must contain WORDLIST_PLACEHOLDER, which is replaced with a
+    temporary file holding the chunk's lines. The checkpoint is saved after every
+    completed chunk, so a timeout, crash or Ctrl-C loses at most one chunk of work.
+    A chunk that times out is retried in halves (the next chunk is full size again); a
+    chunk that keeps failing pauses the job.
+    With an AimdController, RATE_OPTIONS_PLACEHOLDER is filled with the current thread/rate
+    flags for every chunk and each chunk's outcome is fed back into the controller.
+    Lines for which line_filter(line) is false are neither shown nor recorded.
+    Setting the cancel event stops the running chunk and pauses the job where it is.
+    Returns True when the whole wordlist was processed.
+    """
+    if line_filter and on_line:
+        on_line = filtered_lines(line_filter, on_line)
+
+    with Wordlist(checkpoint.wordlist) as words:
+        checkpoint.total = words.line_count
+        checkpoint.status = "running"
+        failures = 0
+        # Shrunk while a chunk keeps timing out, back to chunk_lines once one succeeds
+        current_lines = chunk_lines
+        while checkpoint.offset < checkpoint.total:
+            stop = min(checkpoint.offset + current_lines, checkpoint.total)
+            with tempfile.NamedTemporaryFile("w", prefix="scr-chunk-", suffix=".txt", encoding="utf-8") as chunk:
+                for line in words.lines(checkpoint.offset, stop):
+                    chunk.write(line + "\n")
+                chunk.flush()
+                command = checkpoint.command.replace(WORDLIST_PLACEHOLDER, chunk.name)
+                if controller:
+                    command = apply_rate_options(checkpoint.tool, command, controller)
+                started = time.monotonic()
+                result = stream_command(command, timeout=timeout, on_line=on_line, cancel=cancel)
+                flush_lines(on_line)
+            try:
+                if cancel is not None and cancel.is_set():
+                    checkpoint.status = "paused"
+                    checkpoint.save()
+                    return False
+                if controller:
+                    observe_tool_run(controller, stop - checkpoint.offset, result, time.monotonic() - started)
+
+                if not result.ok:
+                    failures += 1
+                    if failures >= MAX_CHUNK_FAILURES:
+                        checkpoint.status = "paused"
+                        checkpoint.save()
+                        return False
+                    if result.timed_out:
+                        # Retry the same range in smaller pieces
+                        current_lines = max(1, current_lines // 2)
+                    continue
+
+                failures = 0
+                current_lines = chunk_lines
+                lines = filter_lines(line_filter, result.iter_lines()) if line_filter else result.iter_lines()
+                checkpoint.add_findings(parse_output(checkpoint.tool, lines, checkpoint.target))
+            finally:
+                if result.spill_path:
+                    try:
+                        os.unlink(result.spill_path)
+                    except FileNotFoundError:
+                        pass
+            checkpoint.offset = stop
+            checkpoint.save()
+            if on_chunk:
+                on_chunk(checkpoint, result)
+
+        checkpoint.status = "done"
+        checkpoint.save()
+        return True
+
+# End of run_chunked----------------------------------------------
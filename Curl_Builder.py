@@ -6,9 +6,17 @@ import base64
 from datetime import datetime
 import time
 import sys
+import threading
 import tty
 import termios
 
+from Downloader import (DEFAULT_DOWNLOAD_DIR, DEFAULT_DOWNLOAD_WORKERS, download, download_many, filename_for,
+                        wants_resume)
+from Http_Executor import HttpExecutor, request_options
+from Load_Test import DEFAULT_LOAD_CONCURRENCY, DEFAULT_LOAD_REQUESTS, load_test
+from Request_Fuzzer import DEFAULT_FUZZ_WORKERS, DEFAULT_MATCH_STATUS, ResponseFilter, find_keywords, fuzz
+from Request_Replay import DEFAULT_REPLAY_WORKERS, DEFAULT_SPEC_FILE, load_specs, replay, save_spec
+
 # Define color codes for terminal output
 RESET = "\033[0m"
 SKY_BLUE = "\033[94m"
@@ -80,7 +88,7 @@ def show_tutorial():
         "9. Headers: Add custom headers to your request.",
         "10. Data Payload: Include JSON or form data in the request.",
         "11. Custom Flags: Add additional cURL flags like --verbose or --insecure.",
-        "12. Save Response: Option to save the response to a file."
+        "12. Save Response: Option to save the response to a file. Add the -C - flag to resume it if interrupted."
     ]
     for step in steps:
         print_colored(step, GREENISH)
@@ -151,11 +159,11 @@ def select_http_method():
 
     while True:
         choice = input_colored("Choose an HTTP method (1-6): ", YELLOW).strip()
-        if choice == "1": return "-X GET"
-        elif choice == "2": return "-X POST"
-        elif choice == "3": return "-X PUT"
-        elif choice == "4": return "-X DELETE"
-        elif choice == "5": return "-X PATCH"
+        if choice == "1": return "GET"
+        elif choice == "2": return "POST"
+        elif choice == "3": return "PUT"
+        elif choice == "4": return "DELETE"
+        elif choice == "5": return "PATCH"
         elif choice == "6": return ""
         else: print_colored("Invalid choice. Please enter 1-6.", YELLOW)
 
@@ -164,12 +172,11 @@ def add_custom_headers():
     while True:
         header = input_colored("Enter header (or press Enter to finish): ", YELLOW).strip()
         if not header: break
-        headers.append(f"-H '{header}'")
-    return " ".join(headers)
+        headers.append(header)
+    return headers
 
 def add_data_payload():
-    data = input_colored("Enter data payload (e.g., JSON or form data): ", YELLOW).strip()
-    return f"-d '{data}'" if data else ""
+    return input_colored("Enter data payload (e.g., JSON or form data): ", YELLOW).strip()
 
 def add_custom_flags():
     flags = []
@@ -177,15 +184,39 @@ def add_custom_flags():
         flag = input_colored("Enter a flag (or press Enter to finish): ", YELLOW).strip()
         if not flag: break
         flags.append(flag)
-    return " ".join(flags)
+    return flags
 
 def save_response_file():
-    file_name = input_colored("Save response to file (or press Enter to skip): ", YELLOW).strip()
-    return f"-o {file_name}" if file_name else ""
+    return input_colored("Save response to file (or press Enter to skip): ", YELLOW).strip()
 
 
-def assemble_curl_command():
-    """Assemble the full cURL command with all options."""
+def new_request(url, method="", headers=None, data="", flags=None, output_file=""):
+    """Create the request model shared by the menus, the headless CLI and the executors."""
+    return {
+        "url": url,
+        "method": method,
+        "headers": list(headers or []),
+        "data": data,
+        "flags": list(flags or []),
+        "output_file": output_file,
+    }
+
+def build_curl_command(request):
+    """Render a request model as a cURL command line."""
+    options = []
+    if request["method"]:
+        options.append(f"-X {request['method']}")
+    options.extend(f"-H '{header}'" for header in request["headers"])
+    if request["data"]:
+        options.append(f"-d '{request['data']}'")
+    options.extend(request["flags"])
+    if request["output_file"]:
+        options.append(f"-o {request['output_file']}")
+    options.append(f"'{request['url']}'")
+    return " ".join(["curl"] + options)
+
+def collect_request():
+    """Walk the user through every step and return the request model."""
     url = construct_url()
     print_progress("Selecting HTTP Method")
     http_method = select_http_method()
@@ -197,38 +228,255 @@ def assemble_curl_command():
     custom_flags = add_custom_flags()
     print_progress("Saving Response File")
     save_file = save_response_file()
+    return new_request(url, http_method, headers, data_payload, custom_flags, save_file)
+
+def assemble_curl_command():
+    """Assemble the full cURL command with all options."""
+    return build_curl_command(collect_request())
+
+
+# Kept for the whole session so repeated requests reuse pooled connections
+EXECUTOR = None
+LAST_REQUEST = None
+# Response body characters shown after an in-process request
+BODY_PREVIEW_CHARS = 2000
+
+def get_executor():
+    """Return the session-wide pooled executor, creating it on first use."""
+    global EXECUTOR
+    if EXECUTOR is None:
+        EXECUTOR = HttpExecutor()
+    return EXECUTOR
+
+def print_http_result(result):
+    """Print status, headers, timing and a preview of the body of an HttpResult."""
+    if not result.ok:
+        print_colored(f"Request failed: {result.error} ({result.elapsed * 1000:.1f} ms)", YELLOW)
+        return
+    print_colored(f"\nHTTP {result.status} {result.reason}  ({result.url})", GREENISH + BOLD)
+    for name, value in result.headers.items():
+        print_colored(f"{name}: {value}", SKY_BLUE)
+    if result.output_file:
+        print_colored(f"\n{result.size} bytes saved to {result.output_file}", GREENISH)
+    elif result.body:
+        text = result.body.decode(errors="replace")
+        print(f"\n{text[:BODY_PREVIEW_CHARS]}")
+        if result.size > BODY_PREVIEW_CHARS:
+            print_colored(f"... ({result.size} bytes in total)", YELLOW)
+    print_colored(f"\nTiming: {result.timing()}", GREENISH)
 
-    curl_command = "curl"
-    for option in [http_method, headers, data_payload, custom_flags, save_file, f"'{url}'"]:
-        if option:
-            curl_command += f" {option}"
+def execute_in_process(request):
+    """Send a request model on the pooled session and print the response."""
+    _, ignored = request_options(request)
+    if ignored:
+        print_colored(f"Flags without an in-process equivalent (ignored): {', '.join(ignored)}", YELLOW)
+    if request["output_file"]:
+        # Saved responses are streamed and hashed; -C resumes an interrupted download
+        result = download(request, request["output_file"], get_executor(), resume=wants_resume(request))
+        log_activity(f"Download of {result.url}: {result.describe()}")
+        print_colored(result.describe(), GREENISH if result.ok else YELLOW)
+        return result
+    result = get_executor().execute(request)
+    log_activity(f"In-process {result.method} {result.url}: {result.status or result.error} in {result.elapsed:.3f}s")
+    print_http_result(result)
+    return result
 
-    return curl_command
+def save_spec_menu(request):
+    """Append a request model to a spec file for later replay."""
+    path = input_colored(f"Spec file [default: {DEFAULT_SPEC_FILE}]: ", YELLOW).strip() or DEFAULT_SPEC_FILE
+    name = input_colored("Name for this request (optional): ", YELLOW).strip()
+    expect = input_colored("Expected status code (optional): ", YELLOW).strip()
+    try:
+        save_spec(request, path, name, int(expect) if expect.isdigit() else None)
+    except OSError as e:
+        print_colored(f"Could not save the spec: {e}", YELLOW)
+        return
+    print_colored(f"Request saved to {path}.", GREENISH)
+    log_activity(f"Saved request spec to {path}.")
+
+def replay_specs_menu():
+    """Replay every request of a spec file concurrently and report status and latency."""
+    path = input_colored(f"Spec file [default: {DEFAULT_SPEC_FILE}]: ", YELLOW).strip() or DEFAULT_SPEC_FILE
+    try:
+        specs = load_specs(path)
+    except (OSError, ValueError) as e:
+        print_colored(f"Could not load {path}: {e}", YELLOW)
+        return
+    workers = input_colored(f"Concurrent requests [default: {DEFAULT_REPLAY_WORKERS}]: ", YELLOW).strip()
+    workers = int(workers) if workers.isdigit() and int(workers) > 0 else DEFAULT_REPLAY_WORKERS
+    # Share the session's pooled connections unless the pool is too small for the workers
+    executor = get_executor() if workers <= get_executor().pool_size else None
+    print_colored(f"Replaying {len(specs)} requests with {workers} workers...", SKY_BLUE)
+    try:
+        summary = replay(specs, workers, executor, on_outcome=lambda outcome: print(outcome.describe()))
+    except KeyboardInterrupt:
+        print_colored("\nReplay interrupted.", YELLOW)
+        return
+    print_colored(f"\n{summary.describe()}", GREENISH if summary.passed == len(summary.outcomes) else YELLOW)
+    log_activity(f"Replayed {path}: {summary.describe()}")
+
+def load_test_menu(request):
+    """Benchmark a request with N requests or a duration at a given concurrency."""
+    print_colored("Only load test targets you are authorised to test.", YELLOW)
+    duration = input_colored("Duration in seconds (or press Enter to send a fixed number of requests): ", YELLOW).strip()
+    try:
+        duration = float(duration) if duration else None
+    except ValueError:
+        duration = None
+    total = DEFAULT_LOAD_REQUESTS
+    if duration is None:
+        total = input_colored(f"Total requests [default: {DEFAULT_LOAD_REQUESTS}]: ", YELLOW).strip()
+        total = int(total) if total.isdigit() and int(total) > 0 else DEFAULT_LOAD_REQUESTS
+    concurrency = input_colored(f"Concurrency [default: {DEFAULT_LOAD_CONCURRENCY}]: ", YELLOW).strip()
+    concurrency = int(concurrency) if concurrency.isdigit() and int(concurrency) > 0 else DEFAULT_LOAD_CONCURRENCY
+    keep_alive = input_colored("Keep connections alive? (Y/n): ", YELLOW).strip().lower() != "n"
 
+    def progress(completed, errors, elapsed):
+        print(f"\r{completed} requests, {errors} errors, {elapsed:.0f}s", end="", flush=True)
+
+    print_colored("Running... press Ctrl-C to stop early.", SKY_BLUE)
+    stats = load_test(request, total, duration, concurrency, keep_alive, on_progress=progress)
+    print_colored(f"\n{stats.describe()}", GREENISH)
+    log_activity(f"Load test of {request['url']}: {stats.describe().splitlines()[0]}")
+
+def download_menu():
+    """Download several URLs in parallel, resuming partial files and printing their hashes."""
+    source = input_colored("File with one URL per line (or URLs separated by spaces): ", YELLOW).strip()
+    if os.path.isfile(source):
+        with open(source) as url_file:
+            urls = [line.strip() for line in url_file if line.strip() and not line.startswith("#")]
+    else:
+        urls = source.split()
+    if not urls:
+        print_colored("No URLs given.", YELLOW)
+        return
+    directory = input_colored(f"Save into directory [default: {DEFAULT_DOWNLOAD_DIR}]: ", YELLOW).strip()
+    directory = directory or DEFAULT_DOWNLOAD_DIR
+    workers = input_colored(f"Parallel downloads [default: {DEFAULT_DOWNLOAD_WORKERS}]: ", YELLOW).strip()
+    workers = int(workers) if workers.isdigit() and int(workers) > 0 else DEFAULT_DOWNLOAD_WORKERS
+    items = [(new_request(url), filename_for(url, directory)) for url in urls]
+    paths = [path for _, path in items]
+    # Same file name from different URLs: number those so downloads do not overwrite each other
+    items = [(request, f"{path}.{number}" if paths.count(path) > 1 else path)
+             for number, (request, path) in enumerate(items, 1)]
+    executor = get_executor() if workers <= get_executor().pool_size else None
+    cancel = threading.Event()
+    try:
+        results = download_many(items, workers, executor, cancel=cancel,
+                                on_done=lambda result: print_colored(result.describe(), GREENISH if result.ok else YELLOW))
+    except KeyboardInterrupt:
+        print_colored("\nDownloads interrupted; run them again to resume the partial files.", YELLOW)
+        return
+    failed = sum(1 for result in results if not result.ok)
+    print_colored(f"\n{len(results) - failed} of {len(results)} downloads complete in {directory}.",
+                  GREENISH if not failed else YELLOW)
+    log_activity(f"Downloaded {len(results) - failed}/{len(results)} files into {directory}.")
+
+def fuzz_menu(request):
+    """Fuzz every FUZZ / FUZ2Z / ... marker of a request with words from wordlists."""
+    keywords = find_keywords(request)
+    if not keywords:
+        print_colored("Put FUZZ (and FUZ2Z, FUZ3Z, ... for more positions) in the URL, headers or data first.",
+                      YELLOW)
+        return
+    wordlists = {}
+    for keyword in keywords:
+        path = input_colored(f"Wordlist for {keyword}: ", YELLOW).strip()
+        if not os.path.isfile(path):
+            print_colored(f"Wordlist not found: {path}", YELLOW)
+            return
+        wordlists[keyword] = path
+    mode = "clusterbomb"
+    if len(keywords) > 1:
+        choice = input_colored("Mode: 1. Cluster bomb (every combination)  2. Pitchfork (lists in step) [default: 1]: ",
+                               YELLOW).strip()
+        mode = "pitchfork" if choice == "2" else "clusterbomb"
+    workers = input_colored(f"Concurrent requests [default: {DEFAULT_FUZZ_WORKERS}]: ", YELLOW).strip()
+    workers = int(workers) if workers.isdigit() and int(workers) > 0 else DEFAULT_FUZZ_WORKERS
+    match_status = input_colored(f"Show statuses [default: {DEFAULT_MATCH_STATUS}, 'all' for every status]: ",
+                                 YELLOW).strip() or DEFAULT_MATCH_STATUS
+    try:
+        response_filter = ResponseFilter(
+            "" if match_status == "all" else match_status,
+            input_colored("Hide statuses (e.g. 302,500-599, Enter for none): ", YELLOW).strip(),
+            input_colored("Hide sizes in bytes (e.g. 0,1234, Enter for none): ", YELLOW).strip(),
+            input_colored("Hide word counts (e.g. 12, Enter for none): ", YELLOW).strip(),
+        )
+    except ValueError:
+        print_colored("Filters must be numbers or ranges like 200,301-399.", YELLOW)
+        return
+    executor = get_executor() if workers <= get_executor().pool_size else None
+    print_colored(f"Fuzzing {', '.join(keywords)} ({mode}) with {workers} workers... press Ctrl-C to stop.", SKY_BLUE)
+    try:
+        stats = fuzz(request, wordlists, mode, response_filter, workers, executor,
+                     on_hit=lambda hit: print_colored(hit.describe(), GREENISH),
+                     on_progress=lambda stats: print_colored(stats.describe(), SKY_BLUE))
+    except KeyboardInterrupt:
+        print_colored("\nFuzzing interrupted.", YELLOW)
+        return
+    print_colored(f"\n{stats.describe()}", GREENISH)
+    log_activity(f"Fuzzed {request['url']}: {stats.describe()}")
 
 def main_menu():
     """Main menu to navigate and manage options."""
+    global LAST_REQUEST
     while True:
         print_colored("\n--- Main Menu ---", SKY_BLUE)
         print_colored("1. Build and Execute cURL Command.", YELLOW)
         print_colored("2. Tutorial.", YELLOW)
+        print_colored("3. Re-send Last Request (pooled session).", YELLOW)
+        print_colored("4. Save Last Request as a Replay Spec.", YELLOW)
+        print_colored("5. Replay a Spec File.", YELLOW)
+        print_colored("6. Load Test Last Request.", YELLOW)
+        print_colored("7. Fuzz Last Request (FUZZ markers).", YELLOW)
+        print_colored("8. Download Files in Parallel.", YELLOW)
         print_colored("0. Exit.", YELLOW)
         choice = input_colored("Enter your choice: ", YELLOW)
 
         if choice == "1":
-            command = assemble_curl_command()
+            request = LAST_REQUEST = collect_request()
+            command = build_curl_command(request)
             print_colored(f"\nGenerated cURL Command:\n{command}", SKY_BLUE)
-            execute = input_colored("Execute this command? (y/n): ", YELLOW).lower()
+            execute = input_colored("Execute this command? (y = curl, p = pooled in-process session, n = no): ",
+                                    YELLOW).lower()
             if execute == "y":
                 subprocess.run(command, shell=True)
+            elif execute == "p":
+                execute_in_process(request)
         elif choice == "2":
             show_tutorial()
+        elif choice == "3":
+            if LAST_REQUEST is None:
+                print_colored("No request has been built yet.", YELLOW)
+            else:
+                execute_in_process(LAST_REQUEST)
+        elif choice == "4":
+            if LAST_REQUEST is None:
+                print_colored("No request has been built yet.", YELLOW)
+            else:
+                save_spec_menu(LAST_REQUEST)
+        elif choice == "5":
+            replay_specs_menu()
+        elif choice == "6":
+            if LAST_REQUEST is None:
+                print_colored("No request has been built yet.", YELLOW)
+            else:
+                load_test_menu(LAST_REQUEST)
+        elif choice == "7":
+            if LAST_REQUEST is None:
+                print_colored("No request has been built yet.", YELLOW)
+            else:
+                fuzz_menu(LAST_REQUEST)
+        elif choice == "8":
+            download_menu()
         elif choice == "0":
+            if EXECUTOR is not None:
+                EXECUTOR.close()
             print_colored("Exiting. Goodbye!", GREENISH)
             log_activity("Script exited.")
             break
         else:
-            print_colored("Invalid choice. Please enter 0, 1, or 2.", YELLOW)
+            print_colored("Invalid choice. Please enter a number from 0 to 8.", YELLOW)
 
 if __name__ == "__main__":
     print_colored("Welcome to the Ultimate cURL Command Builder!", GREENISH + BOLD)
@@ -0,0 +1,325 @@
+import asyncio
+import ssl
+import time
+from urllib.parse import quote, urlsplit
+
+from Findings import Finding
+
+# Status codes reported when no include list is given (same as gobuster's defaults)
+DEFAULT_INCLUDE_STATUS = (200, 204, 301, 302, 307, 308, 401, 403, 405)
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; scr-dirbrute)"
+READ_CHUNK = 65536
+
+class HttpError(Exception):
+    """Raised when a server response cannot be parsed."""
+
+def parse_status_codes(text):
+    """
+    Turns "200,301, 403" into a tuple of ints. Empty input gives an empty tuple.
+    """
+    return tuple(int(code) for code in text.replace(" ", "").split(",") if code)
+
+def expand_words(words, extensions=(), start=0):
+    """
+    Yields (index, path) pairs: each word as-is, then once per extension.
+    index is the word's position in the source list (counting from start), used
+    for progress and resume.
+    """
+    extensions = [extension.lstrip(".") for extension in extensions if extension]
+    for index, word in enumerate(words, start):
+        word = word.strip()
+        if not word or word.startswith("#"):
+            continue
+        word = word.lstrip("/")
+        yield index, word
+        for extension in extensions:
+            yield index, f"{word}.{extension}"
+
+class _Connection:
+    """
+    One persistent HTTP/1.1 keep-alive connection. Reopened transparently after
+    the server closes it.
+    """
+
+    def __init__(self, host, port, ssl_context, timeout):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.requests = 0
+
+    @property
+    def open(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl_context,
+                                    server_hostname=self.host if self.ssl_context else None),
+            self.timeout,
+        )
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def _read_body(self, headers, method):
+        """
+        Reads and discards the response body, returning its size and whether the
+        connection can be reused afterwards.
+        """
+        if method == "HEAD":
+            return 0, True
+        size = 0
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                line = await self.reader.readline()
+                chunk_size = int(line.split(b";")[0].strip() or b"0", 16)
+                if chunk_size == 0:
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return size, True
+                remaining = chunk_size
+                while remaining:
+                    data = await self.reader.read(min(remaining, READ_CHUNK))
+                    if not data:
+                        raise HttpError("Connection closed inside a chunk")
+                    remaining -= len(data)
+                size += chunk_size
+                await self.reader.readline()
+        if "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining:
+                data = await self.reader.read(min(remaining, READ_CHUNK))
+                if not data:
+                    raise HttpError("Connection closed before the body ended")
+                remaining -= len(data)
+                size += len(data)
+            return size, True
+        while True:
+            data = await self.reader.read(READ_CHUNK)
+            if not data:
+                return size, False
+            size += len(data)
+
+    async def request(self, method, target, header_block):
+        """
+        Sends one request and returns (status, size, location).
+        """
+        if not self.open:
+            await self.connect()
+        self.writer.write(f"{method} {target} HTTP/1.1\r\n".encode() + header_block)
+        await self.writer.drain()
+
+        while True:
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise HttpError("Connection closed before the status line")
+            parts = status_line.split(None, 2)
+            if len(parts) < 2 or not parts[1].isdigit():
+                raise HttpError(f"Malformed status line: {status_line!r}")
+            status = int(parts[1])
+            headers = {}
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if status >= 200:
+                break
+
+        if status in (204, 304):
+            size, reusable = 0, True
+        else:
+            size, reusable = await self._read_body(headers, method)
+        if not reusable or headers.get("connection", "").lower() == "close":
+            self.close()
+        self.requests += 1
+        return status, size, headers.get("location")
+
+class DirBruteForcer:
+    """
+    Asynchronous directory/file brute forcer. Each worker keeps its own keep-alive
+    connection to the target, so the number of open connections equals concurrency.
+    """
+
+    def __init__(self, base_url, extensions=(), include_status=None, exclude_status=(404,), concurrency=20,
+                 timeout=10, method="GET", user_agent=DEFAULT_USER_AGENT, headers=None, verify_tls=False,
+                 on_result=None, on_checkpoint=None, checkpoint_interval=5, controller=None):
+        if "://" not in base_url:
+            base_url = f"http://{base_url}"
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/") + "/"
+        self.base_url = f"{parts.scheme}://{parts.netloc}"
+        self.extensions = extensions
+        self.include_status = tuple(include_status) if include_status else DEFAULT_INCLUDE_STATUS
+        self.exclude_status = tuple(exclude_status or ())
+        self.controller = controller
+        # With a controller, enough workers for its maximum are started and gated down to its current limit
+        self.concurrency = controller.maximum if controller else max(1, concurrency)
+        self.timeout = timeout
+        self.method = method
+        self.on_result = on_result
+        self.on_checkpoint = on_checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self._outstanding = {}
+        self._next_index = 0
+        self._last_checkpoint = 0.0
+        self._slots = None
+        self._feeding_done = False
+        self._next_send = 0.0
+        self.ssl_context = None
+        if self.scheme == "https":
+            self.ssl_context = ssl.create_default_context()
+            if not verify_tls:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+        host_header = parts.netloc.rsplit("@", 1)[-1]
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        self.header_block = (f"Host: {host_header}\r\nUser-Agent: {user_agent}\r\nAccept: */*\r\n"
+                             f"Connection: keep-alive\r\n{extra}\r\n").encode()
+        self.stats = {"requests": 0, "errors": 0, "found": 0, "connections": 0, "elapsed": 0.0}
+        self.results = []
+
+    def wanted(self, status):
+        return status in self.include_status and status not in self.exclude_status
+
+    @property
+    def completed_offset(self):
+        """
+        Index of the first word not fully processed yet; every word before it is done.
+        """
+        return min(self._outstanding) if self._outstanding else self._next_index
+
+    def _word_done(self, index):
+        remaining = self._outstanding[index] - 1
+        if remaining:
+            self._outstanding[index] = remaining
+        else:
+            del self._outstanding[index]
+
+    def _maybe_checkpoint(self, force=False):
+        now = time.monotonic()
+        if self.on_checkpoint and (force or now - self._last_checkpoint >= self.checkpoint_interval):
+            self._last_checkpoint = now
+            self.on_checkpoint(self.completed_offset, self.results)
+
+    async def _wait_enabled(self, worker_id):
+        """
+        Parks a worker while its id is above the controller's current concurrency, so
+        only that many workers (and connections) are busy. Returns False once the
+        wordlist is exhausted and a parked worker should exit.
+        """
+        async with self._slots:
+            await self._slots.wait_for(lambda: worker_id < self.controller.concurrency or self._feeding_done)
+        return worker_id < self.controller.concurrency
+
+    async def _pace(self):
+        """
+        Spaces requests out to the controller's rate cap, if it has one.
+        """
+        rate = self.controller.rate
+        if rate:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            send_at = max(now, self._next_send)
+            self._next_send = send_at + 1 / rate
+            if send_at > now:
+                await asyncio.sleep(send_at - now)
+
+    async def _limits_changed(self):
+        async with self._slots:
+            self._slots.notify_all()
+
+    async def _worker(self, paths, worker_id=0):
+        connection = _Connection(self.host, self.port, self.ssl_context, self.timeout)
+        try:
+            while True:
+                if self.controller and worker_id and not await self._wait_enabled(worker_id):
+                    return
+                item = await paths.get()
+                if item is None:
+                    return
+                index, path = item
+                target = quote(self.base_path + path, safe="/:@!$&'()*+,;=-._~%?")
+                if self.controller:
+                    await self._pace()
+                for attempt in range(2):
+                    started = time.monotonic()
+                    try:
+                        if not connection.open:
+                            self.stats["connections"] += 1
+                        status, size, location = await asyncio.wait_for(
+                            connection.request(self.method, target, self.header_block), self.timeout
+                        )
+                        break
+                    except (OSError, HttpError, asyncio.TimeoutError, ValueError):
+                        connection.close()
+                        status = None
+                if self.controller:
+                    if self.controller.record(time.monotonic() - started, status, error=status is None):
+                        await self._limits_changed()
+                    if worker_id >= self.controller.concurrency:
+                        # Parked workers give their connection back to the server
+                        connection.close()
+                self.stats["requests"] += 1
+                self._word_done(index)
+                if status is None:
+                    self.stats["errors"] += 1
+                    continue
+                if self.wanted(status):
+                    finding = Finding(self.host, path="/" + target.lstrip("/"), status=status, size=size,
+                                      value=location, source="dirbrute")
+                    self.stats["found"] += 1
+                    self.results.append(finding)
+                    if self.on_result:
+                        self.on_result(finding)
+        finally:
+            connection.close()
+
+    async def run_async(self, words, start=0):
+        """
+        Brute forces every word (plus extensions) and returns the list of matching Findings.
+        start is the wordlist index of the first word, so resumed runs report
+        offsets relative to the whole list. on_checkpoint(offset, results) is called
+        every checkpoint_interval seconds and once at the end.
+        With an AimdController the number of requests in flight and their rate follow
+        the controller, which is fed every request's latency and status.
+        """
+        started = time.monotonic()
+        self._next_index = start
+        self._last_checkpoint = started
+        self._slots = asyncio.Condition()
+        paths = asyncio.Queue(maxsize=self.concurrency * 4)
+        self._feeding_done = False
+        workers = [asyncio.ensure_future(self._worker(paths, worker_id)) for worker_id in range(self.concurrency)]
+        try:
+            for index, path in expand_words(words, self.extensions, start):
+                self._outstanding[index] = self._outstanding.get(index, 0) + 1
+                self._next_index = index + 1
+                await paths.put((index, path))
+                self._maybe_checkpoint()
+            if self.controller:
+                self._feeding_done = True
+                await self._limits_changed()
+            for _ in workers:
+                await paths.put(None)
+            await asyncio.gather(*workers)
+            self._maybe_checkpoint(force=True)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.stats["elapsed"] = round(time.monotonic() - started, 3)
+        return self.results
+
+    def run(self, words, start=0):
+        return asyncio.run(self.run_async(words, start))
+
+# End of DirBruteForcer----------------------------------------------
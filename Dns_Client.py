@@ -0,0 +1,323 @@
+import asyncio
+import ipaddress
+import random
+import socket
+import struct
+
+# DNS record types understood by the built-in client
+RECORD_TYPES = {
+    "A": 1, "NS": 2, "CNAME": 5, "SOA": 6, "PTR": 12,
+    "MX": 15, "TXT": 16, "AAAA": 28, "ANY": 255,
+}
+RECORD_NAMES = {value: name for name, value in RECORD_TYPES.items()}
+
+RCODES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+
+DEFAULT_SERVER = "8.8.8.8"
+
+class DnsError(Exception):
+    """Raised when a DNS message cannot be built or parsed."""
+
+class DnsRecord:
+    """
+    A single resource record from an answer section.
+    """
+    __slots__ = ("name", "rtype", "ttl", "value")
+
+    def __init__(self, name, rtype, ttl, value):
+        self.name = name
+        self.rtype = rtype
+        self.ttl = ttl
+        self.value = value
+
+    def __repr__(self):
+        return f"DnsRecord({self.name!r}, {self.rtype!r}, {self.ttl}, {self.value!r})"
+
+    def __str__(self):
+        return f"{self.name}\t{self.ttl}\tIN\t{self.rtype}\t{self.value}"
+
+class DnsResult:
+    """
+    Outcome of one query: the response code and answer records, or an error.
+    """
+    __slots__ = ("name", "rtype", "rcode", "records", "error")
+
+    def __init__(self, name, rtype, rcode=None, records=(), error=None):
+        self.name = name
+        self.rtype = rtype
+        self.rcode = rcode
+        self.records = list(records)
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and self.rcode == "NOERROR"
+
+    def __repr__(self):
+        return f"DnsResult({self.name!r}, {self.rtype!r}, rcode={self.rcode!r}, records={self.records!r}, error={self.error!r})"
+
+# End of DnsRecord/DnsResult----------------------------------------------
+
+def system_nameserver():
+    """
+    Returns the first nameserver from /etc/resolv.conf, or DEFAULT_SERVER.
+    """
+    try:
+        with open("/etc/resolv.conf") as resolv:
+            for line in resolv:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    return parts[1]
+    except OSError:
+        pass
+    return DEFAULT_SERVER
+
+def reverse_name(ip):
+    """
+    Returns the in-addr.arpa / ip6.arpa name used for a PTR lookup of ip.
+    """
+    return ipaddress.ip_address(ip).reverse_pointer
+
+def build_query(query_id, name, rtype="A"):
+    """
+    Encodes a recursive query for name/rtype as a DNS wire-format message.
+    """
+    try:
+        qtype = RECORD_TYPES[rtype.upper()]
+    except KeyError:
+        raise DnsError(f"Unsupported record type: {rtype}")
+    question = b""
+    for label in name.rstrip(".").split("."):
+        try:
+            encoded = label.encode("idna") if label else b""
+        except UnicodeError:
+            raise DnsError(f"Invalid name: {name}")
+        if not encoded or len(encoded) > 63:
+            raise DnsError(f"Invalid name: {name}")
+        question += bytes([len(encoded)]) + encoded
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    return header + question + b"\x00" + struct.pack("!HH", qtype, 1)
+
+def _read_name(message, offset):
+    """
+    Reads a possibly compressed name at offset. Returns (name, offset after the name).
+    """
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(message):
+            raise DnsError("Truncated name")
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(message):
+                raise DnsError("Truncated pointer")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | message[offset + 1]
+            jumps += 1
+            if jumps > 64:
+                raise DnsError("Compression loop")
+            continue
+        offset += 1
+        if length == 0:
+            break
+        if offset + length > len(message):
+            raise DnsError("Truncated label")
+        labels.append(message[offset:offset + length].decode("ascii", errors="replace"))
+        offset += length
+    return ".".join(labels) or ".", end if end is not None else offset
+
+def _parse_rdata(message, offset, length, rtype):
+    """
+    Decodes rdata for the record types in RECORD_TYPES into a printable value.
+    Raises DnsError when the rdata is too short for its type.
+    """
+    if offset + length > len(message):
+        raise DnsError("Truncated rdata")
+    rdata = message[offset:offset + length]
+    if rtype == "A" and length == 4:
+        return socket.inet_ntop(socket.AF_INET, rdata)
+    if rtype == "AAAA" and length == 16:
+        return socket.inet_ntop(socket.AF_INET6, rdata)
+    if rtype in ("NS", "CNAME", "PTR"):
+        return _read_name(message, offset)[0]
+    if rtype == "MX":
+        if length < 3:
+            raise DnsError("Truncated MX rdata")
+        preference = struct.unpack("!H", rdata[:2])[0]
+        return f"{preference} {_read_name(message, offset + 2)[0]}"
+    if rtype == "TXT":
+        strings = []
+        position = 0
+        while position < length:
+            size = rdata[position]
+            if position + 1 + size > length:
+                raise DnsError("TXT string longer than its rdata")
+            strings.append(rdata[position + 1:position + 1 + size].decode("utf-8", errors="replace"))
+            position += 1 + size
+        return " ".join(f'"{text}"' for text in strings)
+    if rtype == "SOA":
+        mname, position = _read_name(message, offset)
+        rname, position = _read_name(message, position)
+        if position + 20 > offset + length:
+            raise DnsError("Truncated SOA rdata")
+        numbers = struct.unpack("!IIIII", message[position:position + 20])
+        return " ".join([mname, rname] + [str(number) for number in numbers])
+    return rdata.hex()
+
+def parse_response(message):
+    """
+    Parses a DNS response.
+    Returns (query_id, rcode name, truncated flag, list of answer DnsRecords).
+    Raises DnsError for any malformed message.
+    """
+    try:
+        return _parse_response(message)
+    except (struct.error, IndexError, ValueError) as e:
+        raise DnsError(f"Malformed response: {e}")
+
+def _parse_response(message):
+    if len(message) < 12:
+        raise DnsError("Response shorter than a DNS header")
+    query_id, flags, qdcount, ancount, _, _ = struct.unpack("!HHHHHH", message[:12])
+    offset = 12
+    for _ in range(qdcount):
+        offset = _read_name(message, offset)[1] + 4
+    records = []
+    for _ in range(ancount):
+        name, offset = _read_name(message, offset)
+        if offset + 10 > len(message):
+            raise DnsError("Truncated record header")
+        rtype_code, _, ttl, length = struct.unpack("!HHIH", message[offset:offset + 10])
+        offset += 10
+        rtype = RECORD_NAMES.get(rtype_code, f"TYPE{rtype_code}")
+        records.append(DnsRecord(name, rtype, ttl, _parse_rdata(message, offset, length, rtype)))
+        offset += length
+    rcode = RCODES.get(flags & 0x000F, f"RCODE{flags & 0x000F}")
+    return query_id, rcode, bool(flags & 0x0200), records
+
+# End of wire format helpers----------------------------------------------
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    """
+    Hands every datagram to the future waiting on its query id.
+    """
+
+    def __init__(self, pending):
+        self.pending = pending
+
+    def datagram_received(self, data, addr):
+        if len(data) < 2:
+            return
+        future = self.pending.pop(struct.unpack("!H", data[:2])[0], None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        pass
+
+class DnsClient:
+    """
+    Asynchronous DNS client sharing one UDP socket for every in-flight query.
+    Falls back to TCP for truncated answers. Use as an async context manager.
+    """
+
+    def __init__(self, server=None, port=53, timeout=2.0, retries=2, concurrency=100):
+        self.server = server or system_nameserver()
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.concurrency = concurrency
+        self._pending = {}
+        self._transport = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _UdpProtocol(self._pending), remote_addr=(self.server, self.port)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._transport.close()
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def _new_id(self):
+        while True:
+            query_id = random.randint(0, 0xFFFF)
+            if query_id not in self._pending:
+                return query_id
+
+    async def _query_tcp(self, name, rtype):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.server, self.port), self.timeout
+        )
+        try:
+            message = build_query(self._new_id(), name, rtype)
+            writer.write(struct.pack("!H", len(message)) + message)
+            await writer.drain()
+            size = struct.unpack("!H", await asyncio.wait_for(reader.readexactly(2), self.timeout))[0]
+            return await asyncio.wait_for(reader.readexactly(size), self.timeout)
+        finally:
+            writer.close()
+
+    async def query(self, name, rtype="A"):
+        """
+        Resolves one name/record type, retrying on timeout. Never raises; failures
+        are reported through DnsResult.error.
+        """
+        rtype = rtype.upper()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            for _ in range(self.retries + 1):
+                query_id = self._new_id()
+                future = loop.create_future()
+                self._pending[query_id] = future
+                try:
+                    self._transport.sendto(build_query(query_id, name, rtype))
+                    data = await asyncio.wait_for(future, self.timeout)
+                    _, rcode, truncated, records = parse_response(data)
+                    if truncated:
+                        _, rcode, _, records = parse_response(await self._query_tcp(name, rtype))
+                    return DnsResult(name, rtype, rcode, records)
+                except asyncio.TimeoutError:
+                    continue
+                except (DnsError, OSError, asyncio.IncompleteReadError) as e:
+                    return DnsResult(name, rtype, error=str(e) or type(e).__name__)
+                finally:
+                    self._pending.pop(query_id, None)
+            return DnsResult(name, rtype, error="timeout")
+
+    async def query_many(self, queries):
+        """
+        Runs (name, rtype) queries concurrently, bounded by self.concurrency.
+        Results are returned in the order of queries.
+        """
+        return await asyncio.gather(*(self.query(name, rtype) for name, rtype in queries))
+
+# End of DnsClient----------------------------------------------
+
+def resolve(queries, server=None, port=53, timeout=2.0, retries=2, concurrency=100):
+    """
+    Synchronous helper: resolves a list of (name, rtype) pairs in parallel and
+    returns their DnsResults in order.
+    """
+    async def run():
+        async with DnsClient(server, port, timeout, retries, concurrency) as client:
+            return await client.query_many(queries)
+    return asyncio.run(run())
+
+def lookup_queries(target, record_types=("A", "AAAA", "MX", "NS", "TXT")):
+    """
+    Returns the queries for a target: a PTR lookup for an IP address, otherwise
+    one query per requested record type.
+    """
+    try:
+        return [(reverse_name(target), "PTR")]
+    except ValueError:
+        return [(target, rtype) for rtype in record_types]
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import shlex
+import time
+from urllib.parse import unquote, urlsplit
+
+import requests
+from urllib3.exceptions import HTTPError as TransportError
+
+from Http_Executor import DEFAULT_POOL_SIZE, HttpExecutor
+from Request_Replay import run_bounded
+
+# Bytes read from the socket and written to disk at a time, into one reused buffer
+DOWNLOAD_CHUNK = 256 * 1024
+DEFAULT_HASH = "sha256"
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_DOWNLOAD_DIR = "downloads"
+# Unfinished downloads live in <file>.part, with the server's validators in <file>.part.json
+PART_SUFFIX = ".part"
+
+def wants_resume(request):
+    """
+    Whether the request model asks for curl's -C / --continue-at behaviour.
+    """
+    for flag in request["flags"]:
+        try:
+            words = shlex.split(flag)
+        except ValueError:
+            words = flag.split()
+        if "-C" in words or "--continue-at" in words:
+            return True
+    return False
+
+def filename_for(url, directory=DEFAULT_DOWNLOAD_DIR):
+    """
+    Local path for a URL: the last path segment inside directory, or index.html for a bare host.
+    """
+    name = os.path.basename(unquote(urlsplit(url).path)) or "index.html"
+    return os.path.join(directory, name)
+
+def _load_validator(part_path):
+    try:
+        with open(part_path + ".json") as validator_file:
+            return json.load(validator_file)
+    except (OSError, ValueError):
+        return {}
+
+def _save_validator(part_path, url, response):
+    validator = {"url": url, "etag": response.headers.get("ETag"),
+                 "last_modified": response.headers.get("Last-Modified")}
+    with open(part_path + ".json", "w") as validator_file:
+        json.dump(validator, validator_file)
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _hash_file(path, digest, view):
+    """
+    Feeds an existing partial file into digest through the shared buffer.
+    """
+    with open(path, "rb", buffering=0) as existing:
+        while True:
+            read = existing.readinto(view)
+            if not read:
+                return
+            digest.update(view[:read])
+
+class DownloadResult:
+    __slots__ = ("url", "path", "algorithm", "status", "size", "resumed_from", "digest", "elapsed", "error")
+
+    def __init__(self, url, path, algorithm):
+        self.url = url
+        self.path = path
+        self.algorithm = algorithm
+        self.status = None
+        self.size = 0
+        self.resumed_from = 0
+        self.digest = None
+        self.elapsed = 0.0
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def describe(self):
+        if self.error:
+            kept = ", partial file kept for resuming" if os.path.exists(self.path + PART_SUFFIX) else ""
+            return f"{self.url}: {self.error}{kept}"
+        rate = self.size / self.elapsed / 1024 if self.elapsed else 0.0
+        resumed = f" (resumed at byte {self.resumed_from})" if self.resumed_from else ""
+        return (f"{self.path}: {self.resumed_from + self.size} bytes{resumed}, {self.size} transferred "
+                f"in {self.elapsed:.2f}s ({rate:.0f} KiB/s), {self.algorithm} {self.digest}")
+
+# End of DownloadResult----------------------------------------------
+
+def download(request, path, executor, resume=True, algorithm=DEFAULT_HASH, expected_digest=None,
+             chunk_size=DOWNLOAD_CHUNK, cancel=None):
+    """
+    Streams the response of a request model to path in chunk_size pieces read with
+    readinto into one reused buffer, hashing on the fly. Data goes to path + ".part"
+    first and is renamed when complete. With resume, an existing .part file from the
+    same URL is continued with a Range request (guarded by If-Range, so a changed file
+    starts over) and its bytes are hashed first, so the digest is always of the whole
+    file. An interrupted download (or one stopped by setting the cancel event) keeps its
+    .part file. Never raises for network or file errors; see DownloadResult.error.
+    """
+    part_path = path + PART_SUFFIX
+    result = DownloadResult(request["url"], path, algorithm)
+    digest = hashlib.new(algorithm)
+    view = memoryview(bytearray(chunk_size))
+    # Identity encoding keeps byte offsets in the file equal to offsets on the wire
+    headers = {"Accept-Encoding": "identity"}
+    offset = 0
+    if resume and os.path.exists(part_path):
+        validator = _load_validator(part_path)
+        if validator.get("url") == request["url"]:
+            offset = os.path.getsize(part_path)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            etag = validator.get("etag")
+            if_range = etag if etag and not etag.startswith("W/") else validator.get("last_modified")
+            if if_range:
+                headers["If-Range"] = if_range
+    started = time.perf_counter()
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with executor.stream(request, headers) as response:
+            result.status = response.status_code
+            if response.status_code == 416 and offset:
+                # Nothing left after offset: the partial file is complete if the size matches
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                if total != str(offset):
+                    _remove(part_path)
+                    raise ValueError("the partial file no longer matches the remote file; removed it, retry")
+                result.resumed_from = offset
+                _hash_file(part_path, digest, view)
+            elif response.status_code >= 400:
+                raise ValueError(f"HTTP {response.status_code} {response.reason}")
+            else:
+                appending = response.status_code == 206 and offset
+                if appending:
+                    result.resumed_from = offset
+                    _hash_file(part_path, digest, view)
+                _save_validator(part_path, request["url"], response)
+                with open(part_path, "ab" if appending else "wb", buffering=0) as output:
+                    while True:
+                        read = response.raw.readinto(view)
+                        if not read:
+                            break
+                        if cancel is not None and cancel.is_set():
+                            raise ValueError("cancelled")
+                        output.write(view[:read])
+                        digest.update(view[:read])
+                        result.size += read
+                expected = response.headers.get("Content-Length")
+                if expected is not None and expected.isdigit() and result.size < int(expected):
+                    raise ValueError(f"connection closed after {result.size} of {expected} bytes")
+        result.digest = digest.hexdigest()
+        if expected_digest and result.digest != expected_digest.lower():
+            result.error = f"{algorithm} mismatch: got {result.digest}, expected {expected_digest}"
+            _remove(part_path)
+            _remove(part_path + ".json")
+        else:
+            os.replace(part_path, path)
+            _remove(part_path + ".json")
+    except (requests.RequestException, TransportError, OSError, ValueError) as e:
+        result.error = str(e) or type(e).__name__
+    result.elapsed = time.perf_counter() - started
+    return result
+
+def download_many(items, workers=DEFAULT_DOWNLOAD_WORKERS, executor=None, resume=True, algorithm=DEFAULT_HASH,
+                  on_done=None, cancel=None):
+    """
+    Downloads (request model, path) pairs with at most workers transfers at once on one
+    pooled HttpExecutor. on_done(DownloadResult) is called as each one finishes. Setting
+    the cancel event stops the transfers in progress, keeping their partial files.
+    Returns the list of DownloadResults in completion order.
+    """
+    workers = max(1, workers)
+    own_executor = executor is None
+    if own_executor:
+        executor = HttpExecutor(pool_size=max(workers, DEFAULT_POOL_SIZE))
+    results = []
+
+    def collect(result):
+        results.append(result)
+        if on_done:
+            on_done(result)
+
+    try:
+        run_bounded(items, lambda item: download(*item, executor, resume, algorithm, cancel=cancel), workers, collect,
+                    cancel)
+    finally:
+        if own_executor:
+            executor.close()
+    return results
+
+# End of download_many----------------------------------------------
@@ -0,0 +1,328 @@
+import ipaddress
+import re
+
+HOSTNAME_RE = re.compile(r"^(?:[a-z0-9_*](?:[a-z0-9_-]{0,61}[a-z0-9])?\.)+[a-z][a-z0-9-]{0,62}$")
+DIG_ANSWER_RE = re.compile(r"^(\S+)\s+(\d+)\s+IN\s+([A-Z0-9]+)\s+(.+)$")
+HOST_PATTERNS = [
+    (re.compile(r"^(\S+) has address (\S+)$"), "A"),
+    (re.compile(r"^(\S+) has IPv6 address (\S+)$"), "AAAA"),
+    (re.compile(r"^(\S+) mail is handled by (\d+ \S+)$"), "MX"),
+    (re.compile(r"^(\S+) is an alias for (\S+)$"), "CNAME"),
+    (re.compile(r"^(\S+) domain name pointer (\S+)$"), "PTR"),
+]
+NSLOOKUP_PATTERNS = [
+    (re.compile(r"^(\S+)\s+canonical name = (\S+)$"), "CNAME"),
+    (re.compile(r"^(\S+)\s+mail exchanger = (.+)$"), "MX"),
+    (re.compile(r"^(\S+)\s+nameserver = (\S+)$"), "NS"),
+    (re.compile(r"^(\S+)\s+name = (\S+)$"), "PTR"),
+    (re.compile(r"^(\S+)\s+text = (.+)$"), "TXT"),
+]
+GOBUSTER_PATH_RE = re.compile(r"^(/\S*)\s+\(Status: (\d{3})\)(?:\s+\[Size: (\d+)\])?")
+GOBUSTER_FOUND_RE = re.compile(r"^Found: (\S+)(?:\s+\[(.*?)\])?(?:\s+Status: (\d{3}))?(?:\s+\[Size: (\d+)\])?")
+FEROXBUSTER_RE = re.compile(r"^(\d{3})\s+(?:[A-Z]+\s+)?(\d+)l\s+(\d+)w\s+(\d+)c\s+(\S+)")
+AMASS_GRAPH_RE = re.compile(r"^(\S+) \(FQDN\) --> \S+ --> (\S+) \((FQDN|IPAddress)\)")
+URL_RE = re.compile(r"^[a-z][a-z0-9+.-]*://([^/:?#]+)(?::\d+)?([^?#]*)")
+
+class Finding:
+    """
+    A single typed record parsed from tool output.
+    DNS records set host/rtype/ip/value; web content records set host/path/status/size.
+    """
+    __slots__ = ("host", "rtype", "ip", "value", "path", "status", "size", "source")
+
+    def __init__(self, host, rtype=None, ip=None, value=None, path="", status=None, size=None, source=None):
+        self.host = host
+        self.rtype = rtype
+        self.ip = ip
+        self.value = value
+        self.path = path
+        self.status = status
+        self.size = size
+        self.source = source
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if getattr(self, slot) not in (None, "")}
+
+    def __repr__(self):
+        return f"Finding({self.as_dict()!r})"
+
+class IndexedFinding:
+    """
+    The merged view of every Finding seen for one (host, path) key.
+    """
+    __slots__ = ("host", "path", "ips", "records", "status", "size", "sources")
+
+    def __init__(self, host, path):
+        self.host = host
+        self.path = path
+        self.ips = []
+        self.records = []
+        self.status = None
+        self.size = None
+        self.sources = []
+
+    def merge(self, finding):
+        """
+        Folds a Finding into this entry. Returns True if anything new was learned.
+        """
+        changed = False
+        if finding.ip and finding.ip not in self.ips:
+            self.ips.append(finding.ip)
+            changed = True
+        if finding.rtype and finding.value:
+            record = f"{finding.rtype} {finding.value}"
+            if record not in self.records:
+                self.records.append(record)
+                changed = True
+        if finding.status is not None and self.status is None:
+            self.status = finding.status
+            changed = True
+        if finding.size is not None and self.size is None:
+            self.size = finding.size
+            changed = True
+        if finding.source and finding.source not in self.sources:
+            self.sources.append(finding.source)
+        return changed
+
+    def as_dict(self):
+        return {"host": self.host, "path": self.path, "ips": self.ips, "records": self.records,
+                "status": self.status, "size": self.size, "sources": self.sources}
+
+# End of Finding/IndexedFinding----------------------------------------------
+
+def normalize_host(name):
+    return name.strip().rstrip(".").lower()
+
+def is_hostname(name):
+    return bool(HOSTNAME_RE.match(name))
+
+def is_ip(value):
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+def _dns_finding(host, rtype, value, source):
+    host = normalize_host(host)
+    value = value.strip()
+    if rtype in ("A", "AAAA"):
+        return Finding(host, rtype, ip=value, source=source)
+    if rtype in ("CNAME", "NS", "PTR"):
+        value = normalize_host(value)
+    elif rtype == "MX":
+        preference, _, exchange = value.partition(" ")
+        value = f"{preference} {normalize_host(exchange)}"
+    return Finding(host, rtype, value=value, source=source)
+
+def parse_dig(lines, source="dig"):
+    """
+    Yields a Finding per answer line of dig output; comments and blank lines are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(";"):
+            continue
+        match = DIG_ANSWER_RE.match(line)
+        if match:
+            name, _, rtype, value = match.groups()
+            yield _dns_finding(name, rtype, value, source)
+
+def parse_host(lines, source="host"):
+    for line in lines:
+        line = line.strip()
+        for pattern, rtype in HOST_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                yield _dns_finding(match.group(1), rtype, match.group(2), source)
+                break
+
+def parse_nslookup(lines, source="nslookup"):
+    """
+    Yields a Finding per answer in nslookup output. The resolver's own
+    Server/Address block before the first "Name:" line is ignored.
+    """
+    name = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("Name:"):
+            name = line.split(":", 1)[1].strip()
+            continue
+        if line.startswith("Address:") and name:
+            address = line.split(":", 1)[1].strip()
+            if is_ip(address):
+                yield _dns_finding(name, "AAAA" if ":" in address else "A", address, source)
+            continue
+        for pattern, rtype in NSLOOKUP_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                yield _dns_finding(match.group(1), rtype, match.group(2), source)
+                break
+
+def parse_gobuster(lines, source="gobuster", target=None):
+    """
+    Handles gobuster dir/fuzz lines ("/path (Status: 200) [Size: 12]") and
+    dns/vhost lines ("Found: name [ips]" / "Found: name Status: 200 [Size: 12]").
+    """
+    host = normalize_host(target) if target else None
+    for line in lines:
+        line = line.strip()
+        match = GOBUSTER_PATH_RE.match(line)
+        if match and host:
+            path, status, size = match.groups()
+            yield Finding(host, path=path, status=int(status), size=int(size) if size else None, source=source)
+            continue
+        match = GOBUSTER_FOUND_RE.match(line)
+        if match:
+            name, addresses, status, size = match.groups()
+            name = normalize_host(name)
+            if addresses:
+                for address in addresses.split(","):
+                    address = address.strip()
+                    if is_ip(address):
+                        yield Finding(name, "AAAA" if ":" in address else "A", ip=address, source=source)
+                continue
+            yield Finding(name, status=int(status) if status else None, size=int(size) if size else None,
+                          source=source)
+
+def parse_feroxbuster(lines, source="feroxbuster"):
+    for line in lines:
+        match = FEROXBUSTER_RE.match(line.strip())
+        if not match:
+            continue
+        status, _, _, size, url = match.groups()
+        url_match = URL_RE.match(url)
+        if url_match:
+            yield Finding(normalize_host(url_match.group(1)), path=url_match.group(2) or "/",
+                          status=int(status), size=int(size), source=source)
+
+def parse_hostnames(lines, source):
+    """
+    Parser for tools printing one hostname per line (assetfinder, amass, puredns).
+    Also understands amass graph lines ("a (FQDN) --> a_record --> 1.2.3.4 (IPAddress)").
+    """
+    for line in lines:
+        line = line.strip()
+        match = AMASS_GRAPH_RE.match(line)
+        if match:
+            name, value, kind = match.groups()
+            if kind == "IPAddress":
+                yield Finding(normalize_host(name), "AAAA" if ":" in value else "A", ip=value, source=source)
+            else:
+                yield Finding(normalize_host(value), source=source)
+            continue
+        name = normalize_host(line.split()[0]) if line else ""
+        if name and is_hostname(name):
+            yield Finding(name, source=source)
+
+PARSERS = {
+    "dig": parse_dig,
+    "host": parse_host,
+    "nslookup": parse_nslookup,
+    "gobuster": parse_gobuster,
+    "feroxbuster": parse_feroxbuster,
+    "amass": parse_hostnames,
+    "assetfinder": parse_hostnames,
+    "puredns": parse_hostnames,
+}
+
+def parse_output(tool, lines, target=None):
+    """
+    Streams Findings out of any iterable of output lines for a supported tool.
+    Unsupported tools yield nothing.
+    """
+    parser = PARSERS.get(tool)
+    if parser is None:
+        return iter(())
+    if parser is parse_gobuster:
+        return parser(lines, tool, target)
+    return parser(lines, tool)
+
+# End of parsers----------------------------------------------
+
+class FindingsIndex:
+    """
+    Deduplicated store of Findings keyed by (host, path), with a per-host index of paths.
+    Adding a record is O(1), so merging any number of sources stays linear.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._paths_by_host = {}
+
+    def add(self, finding):
+        """
+        Merges one Finding. Returns True if it created or changed an entry.
+        """
+        key = (finding.host, finding.path or "")
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = IndexedFinding(*key)
+            self._paths_by_host.setdefault(finding.host, set()).add(key[1])
+            entry.merge(finding)
+            return True
+        return entry.merge(finding)
+
+    def update(self, findings):
+        """
+        Merges an iterable of Findings. Returns the number of new or changed entries.
+        """
+        return sum(1 for finding in findings if self.add(finding))
+
+    def merge(self, other):
+        """
+        Merges every entry of another FindingsIndex into this one.
+        """
+        for entry in other:
+            key = (entry.host, entry.path)
+            target = self._entries.get(key)
+            if target is None:
+                target = self._entries[key] = IndexedFinding(*key)
+                self._paths_by_host.setdefault(entry.host, set()).add(entry.path)
+            for value in entry.ips:
+                if value not in target.ips:
+                    target.ips.append(value)
+            for value in entry.records:
+                if value not in target.records:
+                    target.records.append(value)
+            for value in entry.sources:
+                if value not in target.sources:
+                    target.sources.append(value)
+            if target.status is None:
+                target.status = entry.status
+            if target.size is None:
+                target.size = entry.size
+
+    def get(self, host, path=""):
+        return self._entries.get((normalize_host(host), path))
+
+    def hosts(self):
+        return list(self._paths_by_host)
+
+    def paths_for(self, host):
+        return sorted(path for path in self._paths_by_host.get(normalize_host(host), ()) if path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def summary(self):
+        """
+        Returns a printable one-line-per-entry summary, sorted by host then path.
+        """
+        lines = []
+        for entry in sorted(self._entries.values(), key=lambda item: (item.host, item.path)):
+            details = []
+            if entry.ips:
+                details.append(", ".join(entry.ips))
+            details.extend(entry.records)
+            if entry.status is not None:
+                details.append(f"status {entry.status}")
+            if entry.size is not None:
+                details.append(f"size {entry.size}")
+            lines.append(f"{entry.host}{entry.path}  {'; '.join(details)}  [{', '.join(entry.sources)}]")
+        return "\n".join(lines)
+
+# End of FindingsIndex----------------------------------------------
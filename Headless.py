@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import shlex
+import sys
+import time
+
+from Add_host import add_hosts_entry, delete_hosts_entry, display_hosts_entries
+from Batch_Mode import BATCH_TOOLS, is_valid_target, read_targets, run_batch
+from Curl_Builder import build_curl_command, new_request
+from Dns_Client import lookup_queries, resolve
+from Findings import parse_output
+from Info_Gathering import (
+    DNS_SWEEP_TOOLS, RESULT_CACHE, TOOLS, build_amass_command, build_assetfinder_command, build_dig_command,
+    build_dnsenum_command, build_dnsrecon_command, build_feroxbuster_command, build_fierce_command,
+    build_gobuster_command, build_host_command, build_nslookup_command, build_puredns_command,
+    build_theharvester_command, start_metrics,
+)
+from Process_Runner import stream_command
+from Result_Cache import cached_result, normalize_arguments, store_result
+
+def emit(record):
+    """
+    Writes one JSON record per line to stdout and flushes, so downstream stages see it immediately.
+    """
+    sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+def emit_findings(tool, target, lines):
+    """
+    Emits a "finding" record for every typed record the tool's parser extracts.
+    """
+    for finding in parse_output(tool, lines, target):
+        emit(dict(finding.as_dict(), type="finding", target=target))
+
+def run_tool(tool, target, command, timeout, use_cache=True):
+    """
+    Runs one command, emitting a "line" record per output line, a "finding" record per
+    parsed result and a final "result" record.
+    Returns True when the command succeeded.
+    """
+    started = time.time()
+    mode = "use" if use_cache else "off"
+    try:
+        cached = cached_result(RESULT_CACHE, target, command, mode)
+    except Exception:
+        cached = None
+    if cached:
+        for line in cached[0].splitlines():
+            emit({"type": "line", "tool": tool, "target": target, "line": line})
+        emit_findings(tool, target, cached[0].splitlines())
+        emit({"type": "result", "tool": tool, "target": target, "command": command, "ok": True,
+              "returncode": 0, "timed_out": False, "cached": True, "duration": round(time.time() - started, 3)})
+        return True
+
+    if not TOOLS.get(normalize_arguments(command)[0]):
+        emit({"type": "result", "tool": tool, "target": target, "command": command, "ok": False,
+              "returncode": 127, "timed_out": False, "cached": False, "error": "not installed",
+              "duration": round(time.time() - started, 3)})
+        return False
+
+    result = stream_command(
+        command, timeout=timeout,
+        on_line=lambda line: emit({"type": "line", "tool": tool, "target": target, "line": line}),
+    )
+    try:
+        store_result(RESULT_CACHE, target, command, result, mode)
+    except Exception:
+        pass
+    try:
+        emit_findings(tool, target, result.iter_lines())
+    finally:
+        # Output past Process_Runner's memory limit was spilled to a temp file
+        if result.spill_path:
+            os.unlink(result.spill_path)
+    record = {"type": "result", "tool": tool, "target": target, "command": command, "ok": result.ok,
+              "returncode": result.returncode, "timed_out": result.timed_out, "cached": False,
+              "lines": result.line_count, "duration": round(time.time() - started, 3)}
+    if not result.ok:
+        record["stderr"] = result.stderr_text()
+    emit(record)
+    return result.ok
+
+# End of emit/run_tool----------------------------------------------
+
+def command_for(args):
+    """
+    Maps a parsed tool subcommand onto the same command the interactive menu would build.
+    """
+    target = args.target
+    if args.tool == "dig":
+        return build_dig_command(target, args.type, args.server)
+    if args.tool == "nslookup":
+        return build_nslookup_command(target, args.server)
+    if args.tool == "host":
+        return build_host_command(target)
+    if args.tool == "dnsenum":
+        return build_dnsenum_command(target, args.options)
+    if args.tool == "fierce":
+        return build_fierce_command(target, args.server)
+    if args.tool == "dnsrecon":
+        return build_dnsrecon_command(target, args.options)
+    if args.tool == "theharvester":
+        return build_theharvester_command(target, args.limit, args.source)
+    if args.tool == "amass":
+        return build_amass_command(target, args.mode, args.output)
+    if args.tool == "assetfinder":
+        return build_assetfinder_command(target, not args.all)
+    if args.tool == "puredns":
+        return build_puredns_command(target, args.wordlist, args.resolvers, args.output, args.bruteforce)
+    if args.tool == "gobuster":
+        return build_gobuster_command(args.mode, target, args.wordlist, args.extensions, args.status_codes,
+                                      args.server, not args.no_append_domain)
+    if args.tool == "feroxbuster":
+        return build_feroxbuster_command(target, args.wordlist, args.user_agent, args.query, args.status_codes,
+                                         args.verbose, args.depth)
+    raise ValueError(f"No command builder for {args.tool}")
+
+def handle_tool(args):
+    return run_tool(args.tool, args.target, command_for(args), args.timeout, not args.no_cache)
+
+def handle_dns_all(args):
+    # The sweep templates are shell commands, so the target is validated and quoted like batch targets
+    if not is_valid_target(args.target):
+        raise ValueError(f"Not a hostname, IP address or CIDR range: {args.target!r}")
+    target = shlex.quote(args.target)
+    ok = True
+    for tool, template, timeout in DNS_SWEEP_TOOLS:
+        ok = run_tool(tool, args.target, template.format(target=target), timeout, not args.no_cache) and ok
+    return ok
+
+def handle_lookup(args):
+    types = [rtype.strip() for rtype in args.types.split(",") if rtype.strip()]
+    ok = True
+    for result in resolve(lookup_queries(args.target, types), server=args.server or None):
+        emit({"type": "dns", "name": result.name, "rtype": result.rtype, "rcode": result.rcode,
+              "error": result.error,
+              "records": [{"name": r.name, "rtype": r.rtype, "ttl": r.ttl, "value": r.value} for r in result.records]})
+        ok = ok and result.error is None
+    return ok
+
+def handle_hosts(args):
+    if args.action == "add":
+        emit({"type": "hosts", "action": "add", "entry": add_hosts_entry(args.ip, args.domain)})
+    elif args.action == "delete":
+        removed = delete_hosts_entry(args.entry)
+        emit({"type": "hosts", "action": "delete", "entry": args.entry, "removed": removed})
+        return removed > 0
+    else:
+        for entry in display_hosts_entries(show=False):
+            emit({"type": "hosts", "action": "list", "entry": entry})
+    return True
+
+def handle_curl(args):
+    request = new_request(args.url, args.method, args.header, args.data, args.flag, args.output)
+    command = build_curl_command(request)
+    if args.action == "build":
+        emit({"type": "curl", "command": command, "request": request})
+        return True
+    return run_tool("curl", args.url, command, args.timeout, use_cache=False)
+
+def handle_batch(args):
+    tools = [tool.strip() for tool in args.tools.split(",") if tool.strip()]
+    unknown = [tool for tool in tools if tool not in BATCH_TOOLS]
+    if unknown:
+        raise ValueError(f"Unknown batch tools: {', '.join(unknown)}")
+    ok = True
+
+    def report(done, total, summary):
+        nonlocal ok
+        ok = ok and summary.get("ok", False)
+        emit(dict(summary, type="batch", done=done, total=total))
+
+    run_batch(read_targets(args.targets), tools, args.output_dir, wordlist=args.wordlist,
+              max_workers=args.workers, per_target=args.per_target, use_cache=not args.no_cache,
+              on_result=report, registry=TOOLS)
+    return ok
+
+# End of handlers----------------------------------------------
+
+def build_parser():
+    """
+    Builds the argparse tree: one subcommand per interactive submenu entry.
+    """
+    parser = argparse.ArgumentParser(
+        description="Headless reconnaissance pipeline. Every result is written to stdout as one JSON record per line."
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--timeout", type=int, default=45, help="seconds before the tool is killed (default: 45)")
+    common.add_argument("--no-cache", action="store_true", help="bypass the result cache")
+    subparsers = parser.add_subparsers(dest="tool", required=True)
+
+    def tool_parser(name, help_text):
+        sub = subparsers.add_parser(name, parents=[common], help=help_text)
+        sub.add_argument("target", help="domain or IP")
+        sub.set_defaults(handler=handle_tool)
+        return sub
+
+    sub = tool_parser("dig", "DNS query with dig")
+    sub.add_argument("--type", default="A", help="record type (default: A)")
+    sub.add_argument("--server", default="", help="DNS server")
+    sub = tool_parser("nslookup", "DNS query with nslookup")
+    sub.add_argument("--server", default="", help="DNS server")
+    tool_parser("host", "DNS lookup with host")
+    sub = tool_parser("dnsenum", "DNS enumeration with dnsenum")
+    sub.add_argument("--options", default="", help="additional dnsenum options")
+    sub = tool_parser("fierce", "DNS enumeration with fierce")
+    sub.add_argument("--server", default="", help="DNS server")
+    sub = tool_parser("dnsrecon", "DNS reconnaissance with dnsrecon")
+    sub.add_argument("--options", default="", help="additional dnsrecon options")
+    sub = tool_parser("theharvester", "OSINT with theHarvester")
+    sub.add_argument("--limit", default="100")
+    sub.add_argument("--source", default="all")
+    sub = tool_parser("amass", "subdomain enumeration with amass")
+    sub.add_argument("--mode", default="passive", help="passive or active (default: passive)")
+    sub.add_argument("--output", default="", help="amass output file")
+    sub = tool_parser("assetfinder", "subdomain discovery with assetfinder")
+    sub.add_argument("--all", action="store_true", help="do not restrict to subdomains")
+    sub = tool_parser("puredns", "DNS resolution with puredns")
+    sub.add_argument("-w", "--wordlist", required=True)
+    sub.add_argument("-r", "--resolvers", default="")
+    sub.add_argument("-o", "--output", default="")
+    sub.add_argument("--bruteforce", default="", metavar="SUBDOMAINS_FILE", help="use bruteforce mode")
+    sub = subparsers.add_parser("gobuster", parents=[common], help="brute forcing with gobuster")
+    sub.add_argument("mode", choices=["dir", "dns", "fuzz", "vhost"])
+    sub.add_argument("target", help="domain or IP")
+    sub.set_defaults(handler=handle_tool)
+    sub.add_argument("-w", "--wordlist", required=True)
+    sub.add_argument("-x", "--extensions", default="")
+    sub.add_argument("-s", "--status-codes", default="")
+    sub.add_argument("-r", "--server", default="", help="DNS server (dns mode)")
+    sub.add_argument("--no-append-domain", action="store_true", help="vhost mode: do not append the domain")
+    sub = tool_parser("feroxbuster", "content discovery with feroxbuster")
+    sub.add_argument("-w", "--wordlist", required=True)
+    sub.add_argument("-a", "--user-agent", default="")
+    sub.add_argument("-Q", "--query", default="")
+    sub.add_argument("-C", "--status-codes", default="", help="status codes to filter out")
+    sub.add_argument("-v", "--verbose", action="store_true")
+    sub.add_argument("-d", "--depth", default="")
+
+    sub = subparsers.add_parser("dns-all", parents=[common], help="run every DNS tool")
+    sub.add_argument("target")
+    sub.set_defaults(handler=handle_dns_all)
+
+    sub = subparsers.add_parser("lookup", help="parallel lookups with the built-in DNS client")
+    sub.add_argument("target")
+    sub.add_argument("--types", default="A,AAAA,MX,NS,TXT")
+    sub.add_argument("--server", default="")
+    sub.set_defaults(handler=handle_lookup)
+
+    sub = subparsers.add_parser("hosts", help="manage /etc/hosts")
+    hosts = sub.add_subparsers(dest="action", required=True)
+    add = hosts.add_parser("add")
+    add.add_argument("ip")
+    add.add_argument("domain")
+    delete = hosts.add_parser("delete")
+    delete.add_argument("entry", help='exact entry, e.g. "10.0.0.1 example.htb"')
+    hosts.add_parser("list")
+    sub.set_defaults(handler=handle_hosts)
+
+    sub = subparsers.add_parser("curl", help="build or execute a cURL request")
+    sub.add_argument("action", choices=["build", "execute"])
+    sub.add_argument("url")
+    sub.add_argument("-X", "--method", default="")
+    sub.add_argument("-H", "--header", action="append", default=[])
+    sub.add_argument("-d", "--data", default="")
+    sub.add_argument("--flag", action="append", default=[], help="extra cURL flag (repeatable)")
+    sub.add_argument("-o", "--output", default="")
+    sub.add_argument("--timeout", type=int, default=45)
+    sub.set_defaults(handler=handle_curl)
+
+    sub = subparsers.add_parser("batch", help="run tools across a file of targets")
+    sub.add_argument("targets", help="targets file, or - for stdin")
+    sub.add_argument("--tools", default="dig,nslookup,host", help=f"comma-separated: {', '.join(BATCH_TOOLS)}")
+    sub.add_argument("--wordlist")
+    sub.add_argument("--workers", type=int)
+    sub.add_argument("--per-target", type=int, default=2)
+    sub.add_argument("--output-dir", default="batch_results")
+    sub.add_argument("--no-cache", action="store_true")
+    sub.set_defaults(handler=handle_batch)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start_metrics()
+    try:
+        ok = args.handler(args)
+    except (OSError, ValueError) as e:
+        emit({"type": "error", "tool": args.tool, "error": str(e)})
+        return 2
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import shlex
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connection pools kept (one per host) and connections kept per pool
+DEFAULT_POOL_HOSTS = 10
+DEFAULT_POOL_SIZE = 20
+DEFAULT_TIMEOUT = 30
+# Response bytes kept in memory for display when no output file is given
+MAX_BODY_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# curl options that take the next word as their value
+OPTIONS_WITH_VALUES = {
+    "-u", "--user", "-A", "--user-agent", "-e", "--referer", "-b", "--cookie", "-x", "--proxy",
+    "--oauth2-bearer", "--connect-timeout", "-m", "--max-time", "-c", "--cookie-jar", "-o", "--output",
+    "-C", "--continue-at", "--limit-rate", "--retry", "--retry-delay", "--retry-max-time", "--cacert",
+    "--cert", "--key", "--ciphers", "-H", "--header", "-d", "--data", "-X", "--request",
+}
+
+def parse_header(header):
+    """
+    Splits a "Name: value" header line. A line without a colon is a header with an empty value.
+    """
+    name, _, value = header.partition(":")
+    return name.strip(), value.strip()
+
+def request_options(request):
+    """
+    Translates the request model (see Curl_Builder.new_request) into requests keyword
+    arguments, following curl's defaults: POST when there is data, no redirects unless
+    -L, certificate checks unless -k. Returns (options, flags that have no equivalent).
+    """
+    options = {
+        "method": request["method"] or ("POST" if request["data"] else "GET"),
+        "url": request["url"],
+        "headers": dict(parse_header(header) for header in request["headers"]),
+        "data": request["data"].encode() if request["data"] else None,
+        "allow_redirects": False,
+        "verify": True,
+        "timeout": DEFAULT_TIMEOUT,
+    }
+    ignored = []
+    connect_timeout = None
+    for flag in request["flags"]:
+        try:
+            parts = shlex.split(flag)
+        except ValueError:
+            parts = flag.split()
+        while parts:
+            name = parts.pop(0)
+            value = parts.pop(0) if parts and name in OPTIONS_WITH_VALUES else None
+            if name in ("-k", "--insecure"):
+                options["verify"] = False
+            elif name in ("-L", "--location"):
+                options["allow_redirects"] = True
+            elif name in ("-I", "--head"):
+                options["method"] = "HEAD"
+            elif name in ("-G", "--get"):
+                options["method"] = "GET"
+                options["params"], options["data"] = options["data"], None
+            elif name in ("-u", "--user") and value is not None:
+                user, _, password = value.partition(":")
+                options["auth"] = (user, password)
+            elif name in ("-A", "--user-agent") and value is not None:
+                options["headers"]["User-Agent"] = value
+            elif name in ("-e", "--referer") and value is not None:
+                options["headers"]["Referer"] = value
+            elif name in ("-b", "--cookie") and value is not None and "=" in value:
+                options["headers"]["Cookie"] = value
+            elif name in ("-x", "--proxy") and value is not None:
+                options["proxies"] = {"http": value, "https": value}
+            elif name == "--oauth2-bearer" and value is not None:
+                options["headers"]["Authorization"] = f"Bearer {value}"
+            elif name in ("--connect-timeout", "-m", "--max-time") and value is not None:
+                try:
+                    seconds = float(value)
+                except ValueError:
+                    # Not a number curl would accept either; report it instead of failing the request
+                    ignored.append(f"{name} {value}")
+                    continue
+                if name == "--connect-timeout":
+                    connect_timeout = seconds
+                else:
+                    options["timeout"] = seconds
+            elif name in ("-C", "--continue-at"):
+                # Resuming is done by Downloader, which sends the Range header itself
+                continue
+            elif name in ("-s", "--silent", "-v", "--verbose", "--compressed", "-#"):
+                # Output-only flags; requests already asks for compressed responses
+                continue
+            else:
+                ignored.append(name if value is None else f"{name} {value}")
+    if connect_timeout is not None:
+        options["timeout"] = (connect_timeout, options["timeout"])
+    return options, ignored
+
+# End of request_options----------------------------------------------
+
+class HttpResult:
+    """
+    Outcome of one request: status, headers and size, total time and time to the
+    response headers, and whether a pooled connection was reused. error is set
+    (and status is None) when the request failed before a response arrived, with the
+    exception's class name in error_type.
+    """
+    __slots__ = ("url", "method", "status", "reason", "headers", "size", "body", "elapsed", "ttfb",
+                 "reused", "output_file", "error", "error_type")
+
+    def __init__(self, url, method):
+        self.url = url
+        self.method = method
+        self.status = None
+        self.reason = ""
+        self.headers = {}
+        self.size = 0
+        self.body = b""
+        self.elapsed = 0.0
+        self.ttfb = None
+        self.reused = None
+        self.output_file = None
+        self.error = None
+        self.error_type = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def timing(self):
+        connection = {True: "reused connection", False: "new connection", None: "connection unknown"}[self.reused]
+        ttfb = f", headers after {self.ttfb * 1000:.1f} ms" if self.ttfb is not None else ""
+        return f"{self.elapsed * 1000:.1f} ms total{ttfb}, {connection}"
+
+    def describe(self):
+        if self.error:
+            return f"{self.method} {self.url}: {self.error} ({self.elapsed * 1000:.1f} ms)"
+        return f"{self.status} {self.reason}  {self.size} bytes  {self.timing()}"
+
+# End of HttpResult----------------------------------------------
+
+class HttpExecutor:
+    """
+    Runs request models in-process on one persistent requests.Session, with a
+    connection pool per host, so repeated requests to the same host skip both the
+    process start and the TCP/TLS handshake. Safe to share between threads.
+    """
+
+    def __init__(self, pool_hosts=DEFAULT_POOL_HOSTS, pool_size=DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        # Sockets that have carried a request; a socket seen again means a reused connection
+        self._sockets = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _mark_used(self, response):
+        """
+        Returns whether the socket behind a response has carried an earlier request.
+        None when that is unknown: the server closed the connection with the response
+        (HTTP/1.0, "Connection: close"), or the adapter does not expose it.
+        """
+        connection = getattr(response.raw, "connection", None)
+        sock = getattr(connection, "sock", None)
+        if sock is None:
+            return None
+        with self._lock:
+            reused = sock in self._sockets
+            self._sockets.add(sock)
+        return reused
+
+    def stream(self, request, headers=None):
+        """
+        Sends a request model with extra headers and returns the requests.Response with
+        the body not yet read. The caller must close it. Raises requests exceptions.
+        """
+        options, _ = request_options(request)
+        options["headers"].update(headers or {})
+        return self.session.request(stream=True, **options)
+
+    def execute(self, request, keep_body=MAX_BODY_BYTES, output_file=None, keep_alive=True, on_chunk=None):
+        """
+        Sends one request model and reads the whole response. The body is written to
+        output_file (default: the model's output_file) in chunks, or kept in memory up
+        to keep_body bytes. on_chunk(bytes) sees every chunk of the full body either way.
+        Without keep_alive the connection is closed afterwards instead of going back to
+        the pool. Never raises for network errors; see HttpResult.error.
+        """
+        options, _ = request_options(request)
+        result = HttpResult(options["url"], options["method"])
+        output_file = output_file if output_file is not None else request["output_file"]
+        started = time.perf_counter()
+        try:
+            if not keep_alive:
+                options["headers"]["Connection"] = "close"
+            response = self.session.request(stream=True, **options)
+            with response:
+                result.ttfb = response.elapsed.total_seconds()
+                result.reused = self._mark_used(response)
+                result.status = response.status_code
+                result.reason = response.reason
+                result.headers = dict(response.headers)
+                result.url = response.url
+                if output_file:
+                    with open(output_file, "wb") as output:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            if on_chunk:
+                                on_chunk(chunk)
+                            output.write(chunk)
+                            result.size += len(chunk)
+                    result.output_file = output_file
+                else:
+                    body = bytearray()
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        if on_chunk:
+                            on_chunk(chunk)
+                        result.size += len(chunk)
+                        if len(body) < keep_body:
+                            body += chunk[:keep_body - len(body)]
+                    result.body = bytes(body)
+                if not keep_alive and getattr(response.raw, "connection", None) is not None:
+                    response.raw.connection.close()
+        except (requests.RequestException, OSError, ValueError) as e:
+            result.error = str(e) or type(e).__name__
+            result.error_type = type(e).__name__
+        result.elapsed = time.perf_counter() - started
+        return result
+
+# End of HttpExecutor----------------------------------------------
@@ -1,7 +1,29 @@
-import subprocess
+import atexit
+import ipaddress
+import os
 import sys
 import threading
-import fileinput
+import time
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from Batch_Mode import batch_mode_menu
+from Checkpoint import WORDLIST_PLACEHOLDER, Checkpoint, run_chunked
+from Dir_Brute import DirBruteForcer, parse_status_codes
+from Dns_Client import DnsError, lookup_queries, resolve
+from Findings import Finding, FindingsIndex, parse_output
+from Job_Scheduler import JobScheduler
+from Metrics import MetricsRecorder
+from Process_Runner import CommandResult, add_observer, stream_command
+from Rate_Control import RATE_OPTIONS_PLACEHOLDER, AimdController
+from Resolvers import benchmark_resolvers, pruned_path, read_resolvers, write_resolvers
+from Result_Cache import ResultCache, cached_result, normalize_arguments, store_result
+from Reverse_Dns import DEFAULT_WINDOW, MAX_ADDRESSES, count_addresses, parse_ranges, ptr_findings, reverse_sweep
+from Scan_History import ScanHistory, describe_row
+from Subdomain_Pipeline import SubdomainPipeline
+from Tool_Registry import ToolRegistry
+from Wildcard_Dns import WildcardFilter, filter_lines, filtered_lines, flush_lines
+from Wordlist import Wordlist
 
 # Define color codes for terminal output
 RESET = "\033[0m"
@@ -9,49 +31,573 @@ SKY_BLUE = "\033[94m"
 GREENISH = "\033[92m"
 YELLOW = "\033[93m"
 BOLD = "\033[1m"
+RED = "\033[91m"
 
-def patch_fierce():
+# Installed tools, probed on first use; compatibility fixes such as the fierce
+# randint patch are applied then and only redone when the tool changes
+TOOLS = ToolRegistry()
+
+# Shared on-disk cache of tool output; CACHE_MODE is "use", "refresh" or "off"
+RESULT_CACHE = ResultCache()
+CACHE_MODE = "use"
+
+# Deduplicated findings from every tool run in this session; background jobs
+# merge into it from their own threads, so updates go through FINDINGS_LOCK
+FINDINGS = FindingsIndex()
+FINDINGS_LOCK = threading.Lock()
+
+# Every run's findings across sessions, for run-to-run diffs and full-text search
+HISTORY = ScanHistory()
+
+# Resource usage of every command and timing of every menu action, written to
+# metrics.json and a Prometheus textfile under the cache directory. Only entry
+# points turn it on (start_metrics), so importing this module writes nothing.
+METRICS = None
+
+def start_metrics():
     """
-    Automatically patches the 'fierce' script to fix the float issue.
+    Creates METRICS, records every command through it and writes it at exit. Safe to call more than once.
     """
-    filepath = "/usr/lib/python3/dist-packages/fierce/fierce.py"
-    with fileinput.input(filepath, inplace=True, backup=".bak") as file:
-        for line in file:
-            if "random.randint(1e10, 1e11)" in line:
-                print(line.replace("random.randint(1e10, 1e11)", "random.randint(10**10, 10**11)"), end="")
-            else:
-                print(line, end="")
+    global METRICS
+    if METRICS is None:
+        METRICS = MetricsRecorder()
+        add_observer(METRICS.record_command)
+        atexit.register(METRICS.write)
+    return METRICS
+
+# Tools started from the menus run as background jobs when BACKGROUND_JOBS is on;
+# each job prints one line when it ends and can be attached to from the jobs menu
+def announce_job(job):
+    color = GREENISH if job.ok and job.state == "done" else YELLOW
+    print(f"\n{color}[job {job.id}] {job.label} {job.state}: {job.summary}{RESET}")
+
+JOBS = JobScheduler(on_finish=announce_job)
+BACKGROUND_JOBS = False
+
+# Name each main menu choice is timed under in METRICS
+MAIN_MENU_ACTIONS = {
+    1: "dns_tools",
+    2: "recon_tools",
+    3: "directory_brute_force",
+    4: "puredns",
+    5: "edit_target",
+    6: "cache_settings",
+    7: "batch_mode",
+    8: "findings_summary",
+    9: "subdomain_pipeline",
+    10: "wordlist_tools",
+    11: "installed_tools",
+    12: "session_metrics",
+    13: "background_jobs",
+    14: "scan_history",
+}
+
+def describe_failure(result, timeout):
+    """
+    Returns a message explaining why a CommandResult did not succeed, or None if it did.
+    """
+    if result.timed_out:
+        return f"Timeout after {timeout} seconds."
+    if result.returncode != 0:
+        return f"Error executing command: {result.stderr_text()}"
+    return None
 
-patch_fierce()
+def _cache_lookup(target, command):
+    """
+    Returns (output, stored_at) from the result cache, or None on a miss, when caching
+    is off or refreshing, when the command writes its own output file, or when the
+    cache cannot be read.
+    """
+    try:
+        return cached_result(RESULT_CACHE, target, command, CACHE_MODE)
+    except (sqlite3.Error, OSError) as e:
+        print(f"{YELLOW}Result cache unavailable: {e}{RESET}")
+        return None
+
+def _cache_store(target, command, result):
+    """
+    Stores a successful, fully in-memory result in the result cache, unless the
+    command writes its own output file.
+    """
+    try:
+        store_result(RESULT_CACHE, target, command, result, CACHE_MODE)
+    except (sqlite3.Error, OSError) as e:
+        print(f"{YELLOW}Result cache unavailable: {e}{RESET}")
 
-def run_command(command, timeout=45):
+def tool_ready(command, quiet=False):
+    """
+    Looks up the command's tool in TOOLS (probing it on first use) and reports
+    whether it is installed.
+    """
+    tool = normalize_arguments(command)[0]
+    if not tool or TOOLS.get(tool):
+        return True
+    if not quiet:
+        print(f"{YELLOW}{tool} is not installed or not on PATH.{RESET}")
+    return False
+
+def run_command(command, timeout=45, target=None):
     """
     Executes a shell command with a timeout.
     Returns command output or error message.
+    Output is read as it arrives and spilled to a temp file past Process_Runner's
+    memory limit; on timeout the whole process group is killed.
+    When a target is given, fresh results are served from and saved to the result cache.
+    """
+    cached = _cache_lookup(target, command)
+    if cached:
+        return cached[0]
+    if not tool_ready(command, quiet=True):
+        return f"Error executing command: {normalize_arguments(command)[0]} is not installed."
+    result = stream_command(command, timeout=timeout)
+    failure = describe_failure(result, timeout)
+    if failure:
+        return failure
+    _cache_store(target, command, result)
+    return result.text()
+
+def record_history(target, tool, command, findings, returncode=None):
+    """
+    Stores a run and its findings in HISTORY. Returns the number of findings never
+    seen before for this target and tool, or None when the history is unavailable.
+    """
+    try:
+        return HISTORY.record_run(target or "", tool, command, findings, returncode)[1]
+    except (sqlite3.Error, OSError) as e:
+        print(f"{YELLOW}Scan history unavailable: {e}{RESET}")
+        return None
+
+def record_findings(command, result, target=None, line_filter=None):
+    """
+    Parses a finished CommandResult with the parser for its tool, merges the records
+    into the session's FINDINGS index and stores the run in HISTORY.
+    Returns the number of new or changed entries. Lines rejected by line_filter are skipped.
+    """
+    tool = normalize_arguments(command)[0]
+    lines = filter_lines(line_filter, result.iter_lines()) if line_filter else result.iter_lines()
+    findings = list(parse_output(tool, lines, target))
+    record_history(target, tool, command, findings, result.returncode)
+    with FINDINGS_LOCK:
+        return FINDINGS.update(findings)
+
+def filtered_print(line_filter, write=print):
+    """
+    Returns an on_line callback passing only the lines line_filter keeps to write (print by default).
+    Call flush_lines() on it once the output ends; wildcard filters check lines in batches.
+    """
+    if not line_filter:
+        return write
+    return filtered_lines(line_filter, write)
+
+def execute_command(label, command, timeout=45, target=None, line_filter=None):
+    """
+    Executes a shell command for a menu, printing each output line as soon as it arrives.
+    When a target is given, fresh results are served from and saved to the result cache.
+    Parsed records are merged into FINDINGS. Returns the CommandResult.
+    Lines rejected by line_filter (e.g. wildcard DNS answers) are neither shown nor indexed.
+    """
+    print(f"{BOLD}{SKY_BLUE}Executing: {command}{RESET}")
+    cached = _cache_lookup(target, command)
+    if cached:
+        output, stored_at = cached
+        print(f"{GREENISH}Output of {label} (cached {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stored_at))}):{RESET}")
+        if line_filter:
+            for line in filter_lines(line_filter, output.splitlines()):
+                print(line)
+        else:
+            print(output)
+        print(f"{'='*40}\n")
+        result = CommandResult.from_output(command, output)
+        record_findings(command, result, target, line_filter)
+        return result
+
+    if not tool_ready(command):
+        return CommandResult.from_output(command, "", returncode=127)
+    print(f"{GREENISH}Output of {label}:{RESET}")
+    show = filtered_print(line_filter)
+    result = stream_command(command, timeout=timeout, on_line=show)
+    flush_lines(show)
+    failure = describe_failure(result, timeout)
+    if failure:
+        print(f"{YELLOW}{failure}{RESET}")
+    if result.spill_path:
+        print(f"{GREENISH}Full output ({result.output_bytes} bytes) saved to {result.spill_path}{RESET}")
+    print(f"{'='*40}\n")
+    _cache_store(target, command, result)
+    new_findings = record_findings(command, result, target, line_filter)
+    if new_findings:
+        print(f"{GREENISH}{new_findings} new findings indexed ({len(FINDINGS)} total).{RESET}\n")
+    return result
+
+def merge_checkpoint_findings(checkpoint):
+    """
+    Merges a checkpointed run's findings into FINDINGS and records the run in HISTORY.
     """
+    findings = [Finding(**finding) for finding in checkpoint.findings]
+    record_history(checkpoint.target, checkpoint.tool, checkpoint.command, findings)
+    with FINDINGS_LOCK:
+        FINDINGS.update(findings)
+
+def load_checkpoint(tool, target, command, wordlist):
+    """
+    Returns the saved Checkpoint for this job if the user wants to resume it,
+    otherwise a fresh one.
+    """
+    checkpoint = Checkpoint(tool, target, command, wordlist)
+    if checkpoint.load() and checkpoint.resumable:
+        answer = input(
+            f"{BOLD}{YELLOW}Resume previous run from line {checkpoint.offset} of {checkpoint.total} "
+            f"({len(checkpoint.findings)} findings so far)? (y/n) [default: y]: {RESET}"
+        ).strip().lower() or "y"
+        if answer == "y":
+            return checkpoint
+    return Checkpoint(tool, target, command, wordlist)
+
+def resumable_execute(label, tool, target, command_template, wordlist, timeout=600, controller=None,
+                      line_filter=None):
+    """
+    Runs a wordlist-driven tool in checkpointed chunks (see Checkpoint.run_chunked).
+    Offers to resume an earlier interrupted run with the same options.
+    With an AimdController the tool's threads/rate are re-tuned between chunks.
+    Returns the Checkpoint, or None when the tool is not installed.
+    """
+    if not tool_ready(command_template):
+        return None
+    checkpoint = load_checkpoint(tool, target, command_template, wordlist)
+
+    def on_chunk(progress, result):
+        rate = f" [{controller.describe()}]" if controller else ""
+        print(f"{SKY_BLUE}[checkpoint] {progress.offset}/{progress.total} lines done, "
+              f"{len(progress.findings)} findings saved.{rate}{RESET}")
+
+    shown = command_template.replace(WORDLIST_PLACEHOLDER, wordlist).replace(RATE_OPTIONS_PLACEHOLDER, "<adaptive>")
+    print(f"{BOLD}{SKY_BLUE}Executing (resumable): {shown}{RESET}")
+    print(f"{GREENISH}Output of {label}:{RESET}")
+    try:
+        completed = run_chunked(checkpoint, timeout=timeout, on_line=print, on_chunk=on_chunk, controller=controller,
+                                line_filter=line_filter)
+    except KeyboardInterrupt:
+        print(f"{YELLOW}Interrupted. Progress saved at line {checkpoint.offset} of {checkpoint.total}; "
+              f"run the same options again to resume.{RESET}")
+        merge_checkpoint_findings(checkpoint)
+        return checkpoint
+    if completed:
+        print(f"{GREENISH}Completed {checkpoint.total} lines with {len(checkpoint.findings)} findings.{RESET}")
+    else:
+        print(f"{YELLOW}Paused at line {checkpoint.offset} of {checkpoint.total} after repeated failures; "
+              f"run the same options again to resume.{RESET}")
+    merge_checkpoint_findings(checkpoint)
+    print(f"{'='*40}\n")
+    return checkpoint
+
+# Tools that recurse into found directories per invocation; a chunked run would recurse
+# with one chunk's words only, so resumable runs switch recursion off with this flag
+NO_RECURSION_FLAGS = {"feroxbuster": "--no-recursion"}
+
+def run_wordlist_tool(label, tool, target, command_template, wordlist, line_filter=None, on_done=None):
+    """
+    Asks whether to run a brute-force tool in resumable chunks or as a single command.
+    command_template uses WORDLIST_PLACEHOLDER where the wordlist path goes.
+    Returns the Checkpoint for resumable runs, otherwise None; in background mode the
+    run is submitted as a job and its Job is returned. on_done(outcome) is called once
+    the run is over with its Checkpoint or CommandResult (None if nothing ran).
+    """
+    if tool in NO_RECURSION_FLAGS:
+        print(f"{SKY_BLUE}{tool} only recurses with the words of the current chunk, so resumable runs "
+              f"disable recursion ({NO_RECURSION_FLAGS[tool]}); answer n to recurse over the whole wordlist.{RESET}")
+    resumable = input(
+        f"{BOLD}{YELLOW}Run resumable (checkpointed in chunks)? (y/n) [default: y]: {RESET}"
+    ).strip().lower() or "y"
+    if resumable != "y":
+        dispatch_command(label, command_template.replace(WORDLIST_PLACEHOLDER, wordlist), target=target,
+                         line_filter=line_filter, on_done=on_done)
+        return None
+    if tool in NO_RECURSION_FLAGS:
+        command_template += f" {NO_RECURSION_FLAGS[tool]}"
+    adaptive = input(
+        f"{BOLD}{YELLOW}Adapt threads and request rate to the target automatically? (y/n) [default: y]: {RESET}"
+    ).strip().lower() or "y"
+    controller = None
+    if adaptive == "y":
+        command_template += f" {RATE_OPTIONS_PLACEHOLDER}"
+        # puredns has no thread flag, so only its rate is controlled
+        controller = AimdController(initial=1, maximum=1) if tool == "puredns" else AimdController()
+    if BACKGROUND_JOBS:
+        work = resumable_job(tool, target, command_template, wordlist, controller, line_filter)
+        return submit_job(label, work, target, on_done)
+    checkpoint = None
+    try:
+        checkpoint = resumable_execute(label, tool, target, command_template, wordlist, controller=controller,
+                                       line_filter=line_filter)
+        return checkpoint
+    finally:
+        if on_done:
+            on_done(checkpoint)
+
+# End of resumable_execute----------------------------------------------
+
+def command_job(command, timeout=45, target=None, line_filter=None):
+    """
+    Returns a JobScheduler work function that runs a command the way execute_command
+    does (result cache, FINDINGS, line_filter), with its output going to the job instead
+    of the terminal. Returns None when the tool is not installed.
+    """
+    if not tool_ready(command):
+        return None
+
+    def work(job):
+        cached = _cache_lookup(target, command)
+        if cached:
+            result = job.result = CommandResult.from_output(command, cached[0])
+            lines = filter_lines(line_filter, result.iter_lines()) if line_filter else result.iter_lines()
+            for line in lines:
+                job.emit(line)
+            source = "cached, "
+        else:
+            emit = filtered_print(line_filter, job.emit)
+            result = job.result = stream_command(command, timeout=timeout, cancel=job.cancel_event, on_line=emit)
+            flush_lines(emit)
+            if result.interrupted:
+                job.ok = False
+                return f"stopped after {result.line_count} lines"
+            failure = describe_failure(result, timeout)
+            if failure:
+                job.ok = False
+                return failure
+            _cache_store(target, command, result)
+            source = ""
+        new_findings = record_findings(command, result, target, line_filter)
+        saved = f", full output in {result.spill_path}" if result.spill_path else ""
+        return f"{source}{result.line_count} lines, {new_findings} new findings{saved}"
+    return work
+
+def resumable_job(tool, target, command_template, wordlist, controller=None, line_filter=None):
+    """
+    Background counterpart of resumable_execute: checks the tool and asks about resuming
+    now, on the menu thread, and returns a work function that runs the chunks.
+    Cancelling the job pauses it at its last checkpoint. Returns None when the tool is not installed.
+    """
+    if not tool_ready(command_template):
+        return None
+    checkpoint = load_checkpoint(tool, target, command_template, wordlist)
+
+    def work(job):
+        job.result = checkpoint
+
+        def on_chunk(progress, result):
+            rate = f" [{controller.describe()}]" if controller else ""
+            job.progress = (f"{progress.offset}/{progress.total} lines, "
+                            f"{len(progress.findings)} findings{rate}")
+
+        try:
+            completed = run_chunked(checkpoint, timeout=600, on_line=job.emit, on_chunk=on_chunk,
+                                    controller=controller, line_filter=line_filter, cancel=job.cancel_event)
+        finally:
+            merge_checkpoint_findings(checkpoint)
+        if not completed:
+            job.ok = False
+            return (f"paused at line {checkpoint.offset} of {checkpoint.total}; "
+                    f"run the same options again to resume")
+        return f"completed {checkpoint.total} lines with {len(checkpoint.findings)} findings"
+    return work
+
+def submit_job(label, work, target=None, on_done=None):
+    """
+    Submits a work function from command_job/resumable_job to JOBS. on_done(job.result)
+    is called when the job ends. Returns the Job, or None (after calling on_done(None))
+    when there is nothing to run.
+    """
+    if work is None:
+        if on_done:
+            on_done(None)
+        return None
+    job = JOBS.submit(label, work, target, on_done=(lambda job: on_done(job.result)) if on_done else None)
+    running = len(JOBS.jobs(active_only=True))
+    queued = f" ({running} jobs active, {JOBS.max_workers} run at a time)" if running > JOBS.max_workers else ""
+    print(f"{GREENISH}Submitted job {job.id}: {label}{queued}. Follow it from Background Jobs in the main menu.{RESET}")
+    return job
+
+def dispatch_command(label, command, timeout=45, target=None, line_filter=None, on_done=None):
+    """
+    Runs a menu's command with execute_command, or as a background job when BACKGROUND_JOBS is on.
+    on_done(result) is called once the command is over either way. Returns the CommandResult or the Job.
+    """
+    if BACKGROUND_JOBS:
+        return submit_job(label, command_job(command, timeout, target, line_filter), target, on_done)
     result = None
+    try:
+        result = execute_command(label, command, timeout, target, line_filter)
+        return result
+    finally:
+        if on_done:
+            on_done(result)
+
+# End of background job helpers----------------------------------------------
 
-    def target():
-        nonlocal result
+def detect_wildcards(domain, dns_server=""):
+    """
+    Probes random names under the domain and reports any wildcard DNS answer.
+    Returns an open, probed WildcardFilter for filtering tool output in-stream,
+    or None when the probe could not be run.
+    """
+    print(f"{BOLD}{SKY_BLUE}Checking {domain} for wildcard DNS...{RESET}")
+    try:
+        wildcards = WildcardFilter(domain, dns_server or None)
+        wildcards.detect()
+    except (OSError, DnsError) as e:
+        print(f"{YELLOW}Wildcard check failed: {e}{RESET}")
+        return None
+    if wildcards.apex.wildcard:
+        answers = ", ".join(sorted(wildcards.apex.addresses | wildcards.apex.cnames))
+        print(f"{YELLOW}Wildcard DNS detected: *.{wildcards.domain} -> {answers}. "
+              f"Matching results will be filtered out.{RESET}")
+    else:
+        print(f"{GREENISH}No wildcard at *.{wildcards.domain}; deeper wildcards are still filtered as found.{RESET}")
+    return wildcards
+
+def close_wildcards(wildcards):
+    if wildcards:
+        if wildcards.filtered:
+            print(f"{GREENISH}{wildcards.filtered} wildcard names filtered out.{RESET}")
+        wildcards.close()
+
+# End of detect_wildcards----------------------------------------------
+
+def cache_settings_menu():
+    """
+    Lets the user switch the result cache between use, refresh and off, and clear it.
+    """
+    global CACHE_MODE
+    modes = {
+        "1": ("use", "Serve repeated lookups from the cache"),
+        "2": ("refresh", "Always re-run tools and overwrite cached results"),
+        "3": ("off", "Bypass the cache entirely"),
+    }
+
+    while True:
         try:
-            result = subprocess.run(
-                command, shell=True, check=True,
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-            )
-        except subprocess.CalledProcessError as e:
-            result = e
-
-    thread = threading.Thread(target=target)
-    thread.start()
-    thread.join(timeout)
-
-    if thread.is_alive():
-        return f"Timeout after {timeout} seconds."
+            entries, size = RESULT_CACHE.stats()
+            print(f"\n{BOLD}{YELLOW}Result Cache ({entries} entries, {size} bytes) - current mode: {CACHE_MODE}{RESET}")
+        except (sqlite3.Error, OSError) as e:
+            print(f"\n{BOLD}{YELLOW}Result Cache (unavailable: {e}) - current mode: {CACHE_MODE}{RESET}")
+        for key, (mode, description) in modes.items():
+            print(f"{key}. {mode} - {description}")
+        print("4. Clear cache")
+        print("0. Exit")
+
+        choice = input(f"{BOLD}{YELLOW}Enter your choice: {RESET}").strip()
+
+        if choice == "0":
+            print(f"{BOLD}{YELLOW}Returning to main menu.{RESET}")
+            break
+        elif choice in modes:
+            CACHE_MODE = modes[choice][0]
+            print(f"{BOLD}{GREENISH}Cache mode set to: {CACHE_MODE}{RESET}")
+        elif choice == "4":
+            try:
+                removed = RESULT_CACHE.invalidate()
+                print(f"{BOLD}{GREENISH}Removed {removed} cached results.{RESET}")
+            except (sqlite3.Error, OSError) as e:
+                print(f"{YELLOW}Could not clear the cache: {e}{RESET}")
+        else:
+            print(f"{YELLOW}Invalid choice. Please try again.{RESET}")
+
+# End of cache_settings_menu--------------------------------------------
 
-    if isinstance(result, subprocess.CalledProcessError):
-        return f"Error executing command: {result.stderr.strip()}"
+def build_dig_command(target, record_type="A", dns_server=""):
+    return f"dig @{dns_server} {target} {record_type}" if dns_server else f"dig {target} {record_type}"
 
-    return result.stdout.strip()
+def build_nslookup_command(target, dns_server=""):
+    return f"nslookup {target} {dns_server}" if dns_server else f"nslookup {target}"
+
+def build_host_command(target):
+    return f"host {target}"
+
+def build_dnsenum_command(target, additional_options=""):
+    return f"dnsenum {additional_options} {target}" if additional_options else f"dnsenum {target}"
+
+def build_fierce_command(target, dns_server=""):
+    return f"fierce --domain {target} --dnsserver {dns_server}" if dns_server else f"fierce --domain {target}"
+
+def build_dnsrecon_command(target, additional_options=""):
+    return f"dnsrecon -d {target} {additional_options}".rstrip()
+
+def build_theharvester_command(target, limit="100", source="all"):
+    return f"theHarvester -d {target} -l {limit} -b {source}"
+
+def build_amass_command(target, mode="passive", output_file=""):
+    command = f"amass enum -d {target} -{mode}"
+    if output_file:
+        command += f" -o {output_file}"
+    return command
+
+def build_assetfinder_command(target, subdomains_only=True):
+    return f"assetfinder --subs-only {target}" if subdomains_only else f"assetfinder {target}"
+
+def build_puredns_command(target, wordlist, resolve_file="", output_file="", subdomains_file="",
+                          skip_wildcard_filter=False):
+    """
+    Builds a puredns command; a subdomains_file switches to bruteforce mode.
+    """
+    if subdomains_file:
+        command = f"puredns bruteforce {subdomains_file} {target}"
+    else:
+        command = f"puredns resolve {target} -w {wordlist}"
+    if resolve_file:
+        command += f" -r {resolve_file}"
+    if output_file:
+        command += f" -o {output_file}"
+    if skip_wildcard_filter:
+        command += " --skip-wildcard-filter"
+    return command
+
+def build_gobuster_command(mode, target, wordlist, extensions="", status_codes="", dns_server="",
+                           append_domain=True, show_ips=False, wildcard=False):
+    """
+    Builds a gobuster command for the dir, dns, fuzz or vhost mode.
+    """
+    if mode == "dir":
+        command = f"gobuster dir -u http://{target} -w {wordlist}"
+        if extensions:
+            command += f" -x {extensions}"
+        if status_codes:
+            command += f" -s {status_codes}"
+    elif mode == "dns":
+        command = f"gobuster dns -d {target} -w {wordlist}"
+        if dns_server:
+            command += f" -r {dns_server}"
+        if show_ips:
+            command += " -i"
+        if wildcard:
+            command += " --wildcard"
+    elif mode == "fuzz":
+        command = f"gobuster fuzz -u http://{target} -w {wordlist} -z"
+        if status_codes:
+            command += f" -s {status_codes}"
+    elif mode == "vhost":
+        command = f"gobuster vhost -u http://{target} -w {wordlist}"
+        if append_domain:
+            command += " --append-domain"
+    else:
+        raise ValueError(f"Unknown gobuster mode: {mode}")
+    return command
+
+def build_feroxbuster_command(target, wordlist, user_agent="", query="", status_codes="", verbose=False,
+                              depth=""):
+    command = f"feroxbuster -u http://{target} -w {wordlist}"
+    if user_agent:
+        command += f" -a \"{user_agent}\""
+    if query:
+        command += f" -Q \"{query}\""
+    if status_codes:
+        command += f" -C {status_codes}"
+    if verbose:
+        command += " -v"
+    if depth:
+        command += f" -d {depth}"
+    return command
+
+# End of command builders--------------------------------------------
 
 def dns_tools_submenu(domain_or_ip):
     """
@@ -59,7 +605,8 @@ def dns_tools_submenu(domain_or_ip):
     Users can select a tool, input required parameters, and execute commands.
     Includes an option to run all DNS tools automatically.
     """
-    tools = ["dig", "nslookup", "host", "dnsenum", "fierce", "Run All DNS Tools Automatically"]
+    tools = ["dig", "nslookup", "host", "dnsenum", "fierce", "Run All DNS Tools Automatically",
+             "Run All DNS Tools Concurrently", "Built-in DNS Lookup", "Reverse DNS Sweep (CIDR or IP ranges)"]
 
     while True:
         print(f"{BOLD}{YELLOW}DNS Tools - Enhanced Options:{RESET}")
@@ -94,7 +641,7 @@ def dns_tools_submenu(domain_or_ip):
             dns_server = input(
                 f"{BOLD}{YELLOW}Enter DNS server [default: system default]: {RESET}"
             ).strip()
-            command = f"dig {domain_or_ip} {record_type}" if not dns_server else f"dig @{dns_server} {domain_or_ip} {record_type}"
+            command = build_dig_command(domain_or_ip, record_type, dns_server)
 
         elif tool == "nslookup":
             print(f"{BOLD}{YELLOW}Using 'nslookup' for DNS queries:{RESET}")
@@ -105,7 +652,7 @@ def dns_tools_submenu(domain_or_ip):
             dns_server = input(
                 f"{BOLD}{YELLOW}Enter DNS server [default: system default]: {RESET}"
             ).strip()
-            command = f"nslookup {domain_or_ip} {dns_server}" if dns_server else f"nslookup {domain_or_ip}"
+            command = build_nslookup_command(domain_or_ip, dns_server)
 
         elif tool == "host":
             print(f"{BOLD}{YELLOW}Using 'host' for DNS lookups:{RESET}")
@@ -113,7 +660,7 @@ def dns_tools_submenu(domain_or_ip):
             print(f"- Basic usage: host <domain>\n"
                   f"- Reverse lookup: host <IP address>\n"
                   f"- Specify DNS server: host <domain> <server>")
-            command = f"host {domain_or_ip}"
+            command = build_host_command(domain_or_ip)
 
         elif tool == "dnsenum":
             print(f"{BOLD}{YELLOW}Using 'dnsenum' for DNS enumeration:{RESET}")
@@ -124,7 +671,7 @@ def dns_tools_submenu(domain_or_ip):
             additional_options = input(
                 f"{BOLD}{YELLOW}Enter additional options (e.g., --dnsserver 8.8.8.8): {RESET}"
             ).strip()
-            command = f"dnsenum {additional_options} {domain_or_ip}" if additional_options else f"dnsenum {domain_or_ip}"
+            command = build_dnsenum_command(domain_or_ip, additional_options)
 
         elif tool == "fierce":
             print(f"{BOLD}{YELLOW}Using 'fierce' for DNS enumeration:{RESET}")
@@ -134,74 +681,195 @@ def dns_tools_submenu(domain_or_ip):
             dns_server = input(
                 f"{BOLD}{YELLOW}Enter DNS server [default: system default]: {RESET}"
             ).strip()
-            command = f"fierce --domain {domain_or_ip} --dnsserver {dns_server}" if dns_server else f"fierce --domain {domain_or_ip}"
+            command = build_fierce_command(domain_or_ip, dns_server)
 
         elif tool == "Run All DNS Tools Automatically":
             print(f"{BOLD}{YELLOW}Running all DNS tools automatically...{RESET}")
             run_all_dns_tools(domain_or_ip)
             continue
 
+        elif tool == "Run All DNS Tools Concurrently":
+            print(f"{BOLD}{YELLOW}Running all DNS tools concurrently...{RESET}")
+            run_all_dns_tools(domain_or_ip, concurrent=True)
+            continue
+
+        elif tool == "Built-in DNS Lookup":
+            print(f"{BOLD}{YELLOW}Using the built-in asynchronous DNS client:{RESET}")
+            print(f"{GREENISH}Queries are sent in parallel without spawning dig/nslookup/host.\n"
+                  f"An IP address is looked up with a PTR query.{RESET}")
+            record_types = input(
+                f"{BOLD}{YELLOW}Enter record types (comma-separated) [default: A,AAAA,MX,NS,TXT]: {RESET}"
+            ).strip() or "A,AAAA,MX,NS,TXT"
+            dns_server = input(
+                f"{BOLD}{YELLOW}Enter DNS server [default: system default]: {RESET}"
+            ).strip()
+            builtin_dns_lookup(domain_or_ip, [rtype.strip() for rtype in record_types.split(",") if rtype.strip()],
+                               dns_server or None)
+            continue
+
+        elif tool == "Reverse DNS Sweep (CIDR or IP ranges)":
+            reverse_sweep_menu(domain_or_ip)
+            continue
+
         else:
             print(f"{YELLOW}Tool not recognized. Skipping.{RESET}")
             continue
 
-        # Execute and display the output
-        print(f"{BOLD}{SKY_BLUE}Executing: {command}{RESET}")
-        output = run_command(command)
-        print(f"{GREENISH}Output of {tool}:{RESET}\n{output}\n{'='*40}\n")
+        # Execute and display the output (or start it as a background job)
+        dispatch_command(tool, command, target=domain_or_ip)
 
 # End of dns_tools_submenu--------------------------------------------
 
-def run_all_dns_tools(domain_or_ip):
+# Commands run by run_all_dns_tools, in the order they appear in the report.
+DNS_SWEEP_TOOLS = [
+    ("dig", "dig {target} ANY", 45),
+    ("nslookup", "nslookup {target}", 45),
+    ("host", "host {target}", 45),
+    ("dnsenum", "dnsenum --noreverse --enum {target}", 180),  # Increased timeout
+    ("fierce", "fierce --domain {target}", 45),
+]
+
+def _run_dns_sweep_tool(tool, command, timeout, target=None):
     """
-    Runs all DNS tools sequentially for the given domain or IP.
-    Consolidates the output from each tool and presents it in a single post.
+    Runs one tool of the DNS sweep and formats its section of the report.
+    Returns (section, list of Findings parsed from the output).
     """
-    print(f"{BOLD}{YELLOW}Running all DNS tools for: {domain_or_ip}{RESET}")    
-    results = []
-
-    # 1. Run `dig`
-    print(f"{BOLD}{YELLOW}Running 'dig'...{RESET}")
-    dig_command = f"dig {domain_or_ip} ANY"
-    dig_output = run_command(dig_command)
-    results.append(f"{BOLD}{GREENISH}Output of 'dig':{RESET}\n{dig_output}\n{'='*40}\n")
-
-    # 2. Run `nslookup`
-    print(f"{BOLD}{YELLOW}Running 'nslookup'...{RESET}")
-    nslookup_command = f"nslookup {domain_or_ip}"
-    nslookup_output = run_command(nslookup_command)
-    results.append(f"{BOLD}{GREENISH}Output of 'nslookup':{RESET}\n{nslookup_output}\n{'='*40}\n")
-
-    # 3. Run `host`
-    print(f"{BOLD}{YELLOW}Running 'host'...{RESET}")
-    host_command = f"host {domain_or_ip}"
-    host_output = run_command(host_command)
-    results.append(f"{BOLD}{GREENISH}Output of 'host':{RESET}\n{host_output}\n{'='*40}\n")
-
-    # 4. Run `dnsenum` with reduced options
-    print(f"{BOLD}{YELLOW}Running 'dnsenum'...{RESET}")
-    dnsenum_command = f"dnsenum --noreverse --enum {domain_or_ip}"
-    dnsenum_output = run_command(dnsenum_command, timeout=180)  # Increased timeout
-    results.append(f"{BOLD}{GREENISH}Output of 'dnsenum':{RESET}\n{dnsenum_output}\n{'='*40}\n")
-
-    # 5. Run `fierce` (patched or replaced)
-    print(f"{BOLD}{YELLOW}Running 'fierce'...{RESET}")
     try:
-        fierce_command = f"fierce --domain {domain_or_ip}"  # Correct argument
-        fierce_output = run_command(fierce_command)
-        results.append(f"{BOLD}{GREENISH}Output of 'fierce':{RESET}\n{fierce_output}\n{'='*40}\n")
+        output = run_command(command, timeout=timeout, target=target)
+        findings = list(parse_output(tool, output.splitlines(), target))
+        return f"{BOLD}{GREENISH}Output of '{tool}':{RESET}\n{output}\n{'='*40}\n", findings
     except Exception as e:
-        fierce_error = f"Error running 'fierce': {e}"
-        results.append(f"{BOLD}{RED}Output of 'fierce': {RESET}\n{fierce_error}\n{'='*40}\n")
+        return f"{BOLD}{RED}Output of '{tool}': {RESET}\nError running '{tool}': {e}\n{'='*40}\n", []
+
+def run_all_dns_tools(domain_or_ip, concurrent=False, max_workers=len(DNS_SWEEP_TOOLS)):
+    """
+    Runs all DNS tools for the given domain or IP.
+    Sequentially by default; with concurrent=True the tools run together on a
+    bounded thread pool and each section is printed as soon as its tool finishes.
+    The consolidated output always keeps the order of DNS_SWEEP_TOOLS.
+    """
+    print(f"{BOLD}{YELLOW}Running all DNS tools for: {domain_or_ip}{RESET}")
+    results = [None] * len(DNS_SWEEP_TOOLS)
+
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {}
+            for idx, (tool, template, timeout) in enumerate(DNS_SWEEP_TOOLS):
+                print(f"{BOLD}{YELLOW}Starting '{tool}'...{RESET}")
+                command = template.format(target=domain_or_ip)
+                futures[executor.submit(_run_dns_sweep_tool, tool, command, timeout, domain_or_ip)] = idx
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+                print(results[idx][0])
+    else:
+        for idx, (tool, template, timeout) in enumerate(DNS_SWEEP_TOOLS):
+            print(f"{BOLD}{YELLOW}Running '{tool}'...{RESET}")
+            results[idx] = _run_dns_sweep_tool(tool, template.format(target=domain_or_ip), timeout, domain_or_ip)
 
     # Consolidate results
     print(f"{BOLD}{SKY_BLUE}All DNS tool outputs consolidated:{RESET}")
-    consolidated_output = "\n".join(results)
+    consolidated_output = "\n".join(section for section, _ in results)
     print(consolidated_output)
+
+    # Deduplicate what every tool found into one view
+    sweep_findings = FindingsIndex()
+    for (tool, template, _), (_, findings) in zip(DNS_SWEEP_TOOLS, results):
+        record_history(domain_or_ip, tool, template.format(target=domain_or_ip), findings)
+        sweep_findings.update(findings)
+        with FINDINGS_LOCK:
+            FINDINGS.update(findings)
+    if len(sweep_findings):
+        print(f"{BOLD}{SKY_BLUE}Deduplicated findings ({len(sweep_findings)}):{RESET}\n{sweep_findings.summary()}\n")
     return consolidated_output
 
 # End of run_all_dns_tools--------------------------------------------
 
+def builtin_dns_lookup(domain_or_ip, record_types, dns_server=None):
+    """
+    Resolves the given record types for a domain (or PTR for an IP) with Dns_Client.
+    Prints the answers and returns the list of DnsResults.
+    """
+    queries = lookup_queries(domain_or_ip, record_types)
+    try:
+        results = resolve(queries, server=dns_server)
+    except (DnsError, OSError) as e:
+        print(f"{YELLOW}DNS lookup failed: {e}{RESET}")
+        return []
+    for result in results:
+        print(f"{GREENISH}{result.name} {result.rtype}:{RESET} {result.error or result.rcode}")
+        for record in result.records:
+            print(f"  {record}")
+    print(f"{'='*40}\n")
+    return results
+
+# End of builtin_dns_lookup--------------------------------------------
+
+def reverse_sweep_menu(domain_or_ip):
+    """
+    PTR sweep over CIDRs or IP ranges with the built-in DNS client. Addresses are
+    expanded lazily and queried with a bounded in-flight window; hostnames are printed
+    as they are found and merged into FINDINGS. Runs as a job in background mode.
+    """
+    print(f"{BOLD}{YELLOW}Reverse DNS sweep:{RESET}")
+    print(f"{GREENISH}Examples: 10.0.0.0/24, 192.168.1.10-192.168.1.80, 172.16.0.1-50 (several separated by commas){RESET}")
+    try:
+        default = f"{ipaddress.ip_network(f'{domain_or_ip}/24', strict=False)}"
+    except ValueError:
+        default = ""
+    prompt = f" [default: {default}]" if default else ""
+    specs = input(f"{BOLD}{YELLOW}Enter CIDRs or IP ranges{prompt}: {RESET}").strip() or default
+    try:
+        ranges = parse_ranges(specs)
+    except ValueError as e:
+        print(f"{YELLOW}Invalid range: {e}{RESET}")
+        return
+    if not ranges:
+        print(f"{YELLOW}No ranges given. Returning to DNS tools.{RESET}")
+        return
+    total = count_addresses(ranges)
+    if total > MAX_ADDRESSES:
+        answer = input(f"{BOLD}{YELLOW}{total} addresses to query. Continue? (y/n) [default: n]: {RESET}").strip().lower() or "n"
+        if answer != "y":
+            return
+    dns_server = input(f"{BOLD}{YELLOW}Enter DNS server [default: system default]: {RESET}").strip()
+    window = input(f"{BOLD}{YELLOW}Queries in flight [default: {DEFAULT_WINDOW}]: {RESET}").strip()
+    window = int(window) if window.isdigit() and int(window) > 0 else DEFAULT_WINDOW
+
+    def sweep(write, on_progress, cancel=None):
+        found = []
+
+        def on_result(ip, hostnames):
+            write(f"{ip}\t{', '.join(hostnames)}")
+            findings = ptr_findings(ip, hostnames)
+            found.extend(findings)
+            with FINDINGS_LOCK:
+                FINDINGS.update(findings)
+        try:
+            return reverse_sweep(ranges, dns_server or None, window=window, on_result=on_result,
+                                 on_progress=on_progress, cancel=cancel)
+        finally:
+            record_history(specs, "reverse-sweep", f"reverse-sweep {specs}", found)
+
+    if BACKGROUND_JOBS:
+        def work(job):
+            stats = sweep(job.emit, lambda stats: setattr(job, "progress", stats.describe()), job.cancel_event)
+            return stats.describe()
+        submit_job(f"PTR sweep {specs}", work)
+        return
+
+    print(f"{BOLD}{SKY_BLUE}Sweeping {total} addresses, {window} queries in flight (Ctrl-C stops){RESET}")
+    try:
+        stats = sweep(print, lambda stats: print(f"{SKY_BLUE}[ptr] {stats.describe()}{RESET}"))
+        print(f"{GREENISH}Done: {stats.describe()} in {stats.elapsed:.1f}s.{RESET}")
+    except KeyboardInterrupt:
+        print(f"{YELLOW}Sweep interrupted.{RESET}")
+    except (DnsError, OSError) as e:
+        print(f"{YELLOW}Reverse sweep failed: {e}{RESET}")
+    print(f"{'='*40}\n")
+
+# End of reverse_sweep_menu--------------------------------------------
+
 def recon_tools_submenu(domain_or_ip):
     """
     Submenu for Reconnaissance tools with expanded options, detailed explanations, and examples.
@@ -238,7 +906,7 @@ def recon_tools_submenu(domain_or_ip):
             additional_options = input(
                 f"{BOLD}{YELLOW}Enter additional options (e.g., -t axfr, -D wordlist.txt): {RESET}"
             ).strip()
-            command = f"dnsrecon -d {domain_or_ip} {additional_options}"
+            command = build_dnsrecon_command(domain_or_ip, additional_options)
 
         elif tool == "theHarvester":
             print(f"{BOLD}{YELLOW}Using 'theHarvester' for gathering open-source intelligence (OSINT):{RESET}")
@@ -253,7 +921,7 @@ def recon_tools_submenu(domain_or_ip):
             limit = input(
                 f"{BOLD}{YELLOW}Enter the result limit [default: 100]: {RESET}"
             ).strip() or "100"
-            command = f"theHarvester -d {domain} -l {limit} -b {source}"
+            command = build_theharvester_command(domain, limit, source)
 
         elif tool == "amass":
             print(f"{BOLD}{YELLOW}Using 'amass' for in-depth subdomain enumeration:{RESET}")
@@ -268,9 +936,7 @@ def recon_tools_submenu(domain_or_ip):
             output_file = input(
                 f"{BOLD}{YELLOW}Enter output file name [default: none]: {RESET}"
             ).strip()
-            command = f"amass enum -d {domain_or_ip} -{mode}"
-            if output_file:
-                command += f" -o {output_file}"
+            command = build_amass_command(domain_or_ip, mode, output_file)
 
         elif tool == "assetfinder":
             print(f"{BOLD}{YELLOW}Using 'assetfinder' for discovering subdomains:{RESET}")
@@ -280,22 +946,67 @@ def recon_tools_submenu(domain_or_ip):
             subdomains_only = input(
                 f"{BOLD}{YELLOW}Search for subdomains only? (y/n) [default: y]: {RESET}"
             ).strip().lower() or "y"
-            if subdomains_only == "y":
-                command = f"assetfinder --subs-only {domain_or_ip}"
-            else:
-                command = f"assetfinder {domain_or_ip}"
+            command = build_assetfinder_command(domain_or_ip, subdomains_only == "y")
 
         else:
             print(f"{YELLOW}Tool not recognized. Skipping.{RESET}")
             continue
 
-        # Execute and display the output
-        print(f"{BOLD}{SKY_BLUE}Executing: {command}{RESET}")
-        output = run_command(command)
-        print(f"{GREENISH}Output of {tool}:{RESET}\n{output}\n{'='*40}\n")
+        # Execute and display the output (or start it as a background job)
+        dispatch_command(tool, command, target=domain_or_ip)
 
 # End of recon_tools_submenu----------------------------------------------
 
+def prune_resolvers(resolve_file):
+    """
+    Offers to benchmark a resolver list (latency, known answers, NXDOMAIN hijacking)
+    and returns the path of a pruned list with the healthy resolvers fastest first.
+    Falls back to the original file when declined or when nothing usable is left.
+    """
+    answer = input(
+        f"{BOLD}{YELLOW}Benchmark resolvers and keep only fast, honest ones? (y/n) [default: y]: {RESET}"
+    ).strip().lower() or "y"
+    if answer != "y":
+        return resolve_file
+    try:
+        resolvers = read_resolvers(resolve_file, on_invalid=lambda number, line, e: print(
+            f"{YELLOW}Skipping line {number} of {resolve_file}: {e}{RESET}"))
+    except OSError as e:
+        print(f"{YELLOW}Could not read resolver file: {e}{RESET}")
+        return resolve_file
+    limit = input(f"{BOLD}{YELLOW}Keep at most how many resolvers? [default: all healthy]: {RESET}").strip()
+    print(f"{BOLD}{SKY_BLUE}Benchmarking {len(resolvers)} resolvers (cached scores are reused)...{RESET}")
+    measured = []
+
+    def on_score(score):
+        measured.append(score)
+        if len(measured) % 50 == 0:
+            print(f"{SKY_BLUE}{len(measured)} resolvers measured...{RESET}")
+
+    scores = benchmark_resolvers(resolvers, on_score=on_score)
+    healthy = [score for score in scores if score.healthy]
+    print(f"{GREENISH}Fastest resolvers:{RESET}")
+    for score in healthy[:10]:
+        print(score.describe())
+    rejected = [score for score in scores if not score.healthy]
+    if rejected:
+        print(f"{YELLOW}Rejected {len(rejected)} resolvers, e.g.:{RESET}")
+        for score in rejected[:5]:
+            print(score.describe())
+    if not healthy:
+        print(f"{YELLOW}No healthy resolvers found; using {resolve_file} as is.{RESET}")
+        return resolve_file
+    output_path = pruned_path(resolve_file)
+    try:
+        written = write_resolvers(output_path, scores, int(limit) if limit.isdigit() else None)
+    except OSError as e:
+        print(f"{YELLOW}Could not write pruned resolver list: {e}{RESET}")
+        return resolve_file
+    print(f"{GREENISH}Using {written} of {len(resolvers)} resolvers from {output_path}{RESET}")
+    return output_path
+
+# End of prune_resolvers----------------------------------------------
+
 def puredns_tool(domain_or_ip):
     """
     Executes Puredns with expanded options, explanations, and examples.
@@ -316,6 +1027,8 @@ def puredns_tool(domain_or_ip):
 
     # Resolver File
     resolve_file = input(f"{BOLD}{YELLOW}Enter resolver file path (optional) [default: none]: {RESET}").strip()
+    if resolve_file:
+        resolve_file = prune_resolvers(resolve_file)
 
     # Output File
     output_file = input(f"{BOLD}{YELLOW}Enter output file path (optional) [default: none]: {RESET}").strip()
@@ -330,21 +1043,40 @@ def puredns_tool(domain_or_ip):
         if not subdomains_file:
             print(f"{YELLOW}Subdomains file is required for brute force mode. Exiting.{RESET}")
             return
-        command = f"puredns bruteforce {subdomains_file} {domain_or_ip}"
     else:
-        command = f"puredns resolve {domain_or_ip} -w {wordlist}"
-
-    # Append resolver file if specified
-    if resolve_file:
-        command += f" -r {resolve_file}"
-
-    # Append output file if specified
-    if output_file:
-        command += f" -o {output_file}"
+        subdomains_file = ""
+
+    wildcards = detect_wildcards(domain_or_ip)
+    # puredns's own wildcard pass costs extra resolution rounds; without a wildcard at the
+    # apex it is skipped and deeper wildcards are caught by the in-stream filter instead
+    skip_wildcard_filter = bool(wildcards and not wildcards.apex.wildcard)
+    line_filter = wildcards.line_filter("puredns") if wildcards else None
+
+    def finish(outcome):
+        close_wildcards(wildcards)
+        # Bruteforce mode walks the subdomains file in chunks, so -o cannot be passed to puredns
+        if output_file and isinstance(outcome, Checkpoint):
+            try:
+                with open(output_file, "w") as output:
+                    for host in dict.fromkeys(finding["host"] for finding in outcome.findings):
+                        output.write(host + "\n")
+            except OSError as e:
+                print(f"{YELLOW}Could not write {output_file}: {e}. The results are kept in the checkpoint "
+                      f"and in the scan history.{RESET}")
+                return
+            print(f"{GREENISH}Results written to {output_file}{RESET}")
+
+    if subdomains_file:
+        # Bruteforce mode walks the subdomains file, so that is what gets checkpointed
+        template = build_puredns_command(domain_or_ip, wordlist, resolve_file, subdomains_file=WORDLIST_PLACEHOLDER,
+                                         skip_wildcard_filter=skip_wildcard_filter)
+        run_wordlist_tool("Puredns", "puredns", domain_or_ip, template, subdomains_file, line_filter=line_filter,
+                          on_done=finish)
+        return
 
-    print(f"{BOLD}{SKY_BLUE}Executing: {command}{RESET}")
-    output = run_command(command)
-    print(f"{GREENISH}Output of Puredns:{RESET}\n{output}\n{'='*40}\n")
+    command = build_puredns_command(domain_or_ip, wordlist, resolve_file, output_file, subdomains_file,
+                                    skip_wildcard_filter=skip_wildcard_filter)
+    dispatch_command("Puredns", command, target=domain_or_ip, line_filter=line_filter, on_done=finish)
 
 # End of puredns_tool----------------------------------------------
 
@@ -353,7 +1085,7 @@ def directory_brute_force_submenu(domain_or_ip):
     Submenu for Directory Brute Force tools with expanded options and detailed examples.
     Allows users to discover directories and files on web servers.
     """
-    tools = ["gobuster", "feroxbuster"]
+    tools = ["gobuster", "feroxbuster", "built-in async brute forcer"]
 
     while True:
         print(f"{BOLD}{YELLOW}Directory Brute Force Tools - Enhanced Options:{RESET}")
@@ -377,6 +1109,8 @@ def directory_brute_force_submenu(domain_or_ip):
             gobuster_submenu(domain_or_ip)
         elif tool == "feroxbuster":
             feroxbuster_submenu(domain_or_ip)
+        elif tool == "built-in async brute forcer":
+            native_dir_brute_menu(domain_or_ip)
 
 # End of directory_brute_force_submenul----------------------------------------------
 
@@ -385,6 +1119,9 @@ def gobuster_submenu(domain_or_ip):
     Submenu for Gobuster options with detailed explanations and examples.
     """
     wordlist = select_wordlist()
+    if not wordlist:
+        print(f"{YELLOW}Wordlist is required for Gobuster. Exiting this option.{RESET}")
+        return
     gobuster_modes = ["dir (Directory Brute Force)", "dns (DNS Enumeration)", "fuzz (Fuzz Testing)", "vhost (Virtual Hosts)"]
 
     while True:
@@ -413,42 +1150,38 @@ def gobuster_submenu(domain_or_ip):
                   f"- Specify extensions: gobuster dir -u <URL> -w <wordlist> -x php,html\n")
             extensions = input(f"{BOLD}{YELLOW}Enter file extensions (e.g., php,html) [default: none]: {RESET}").strip()
             status_codes = input(f"{BOLD}{YELLOW}Enter status codes to filter (e.g., 200,301) [default: none]: {RESET}").strip()
-            command = f"gobuster dir -u http://{domain_or_ip} -w {wordlist}"
-            if extensions:
-                command += f" -x {extensions}"
-            if status_codes:
-                command += f" -s {status_codes}"
+            command = build_gobuster_command(mode, domain_or_ip, WORDLIST_PLACEHOLDER, extensions=extensions,
+                                             status_codes=status_codes)
 
         elif mode == "dns":
             print(f"{GREENISH}Examples for 'dns' mode:{RESET}")
             print(f"- Basic usage: gobuster dns -d <domain> -w <wordlist>\n"
                   f"- Use a specific DNS server: gobuster dns -d <domain> -w <wordlist> -r <DNS server>\n")
             dns_server = input(f"{BOLD}{YELLOW}Enter DNS server [default: system default]: {RESET}").strip()
-            command = f"gobuster dns -d {domain_or_ip} -w {wordlist}"
-            if dns_server:
-                command += f" -r {dns_server}"
+            wildcards = detect_wildcards(domain_or_ip, dns_server)
+            # -i prints each name's addresses, so wildcard answers are filtered without re-resolving them
+            command = build_gobuster_command(mode, domain_or_ip, WORDLIST_PLACEHOLDER, dns_server=dns_server,
+                                             show_ips=True, wildcard=bool(wildcards and wildcards.apex.wildcard))
+            run_wordlist_tool(f"Gobuster {mode} mode", "gobuster", domain_or_ip, command, wordlist,
+                              line_filter=wildcards.line_filter("gobuster") if wildcards else None,
+                              on_done=lambda outcome: close_wildcards(wildcards))
+            continue
 
         elif mode == "fuzz":
             print(f"{GREENISH}Examples for 'fuzz' mode:{RESET}")
             print(f"- Basic usage: gobuster fuzz -u <URL> -w <wordlist> -z\n"
                   f"- Filter by status codes: gobuster fuzz -u <URL> -w <wordlist> -s 200,404\n")
             status_codes = input(f"{BOLD}{YELLOW}Enter status codes to filter (e.g., 200,404) [default: none]: {RESET}").strip()
-            command = f"gobuster fuzz -u http://{domain_or_ip} -w {wordlist} -z"
-            if status_codes:
-                command += f" -s {status_codes}"
+            command = build_gobuster_command(mode, domain_or_ip, WORDLIST_PLACEHOLDER, status_codes=status_codes)
 
         elif mode == "vhost":
             print(f"{GREENISH}Examples for 'vhost' mode:{RESET}")
             print(f"- Basic usage: gobuster vhost -u <URL> -w <wordlist>\n"
                   f"- Append domain: gobuster vhost -u <URL> -w <wordlist> --append-domain\n")
             append_domain = input(f"{BOLD}{YELLOW}Append domain to results? (y/n) [default: y]: {RESET}").strip().lower() or "y"
-            command = f"gobuster vhost -u http://{domain_or_ip} -w {wordlist}"
-            if append_domain == "y":
-                command += " --append-domain"
+            command = build_gobuster_command(mode, domain_or_ip, WORDLIST_PLACEHOLDER, append_domain=append_domain == "y")
 
-        print(f"{BOLD}{SKY_BLUE}Executing: {command}{RESET}")
-        output = run_command(command)
-        print(f"{GREENISH}Output of Gobuster {mode} mode:{RESET}\n{output}\n{'='*40}\n")
+        run_wordlist_tool(f"Gobuster {mode} mode", "gobuster", domain_or_ip, command, wordlist)
 
 # End of gobuster_submenu----------------------------------------------
 
@@ -457,6 +1190,9 @@ def feroxbuster_submenu(domain_or_ip):
     Submenu for Feroxbuster options with detailed explanations and examples.
     """
     wordlist = select_wordlist()
+    if not wordlist:
+        print(f"{YELLOW}Wordlist is required for Feroxbuster. Exiting this option.{RESET}")
+        return
     feroxbuster_options = [
         "basic scan",
         "set custom user-agent",
@@ -485,46 +1221,437 @@ def feroxbuster_submenu(domain_or_ip):
         option = feroxbuster_options[int(choice) - 1]
 
         print(f"{BOLD}{YELLOW}Using Feroxbuster with option: {option}{RESET}")
-        command = f"feroxbuster -u http://{domain_or_ip} -w {wordlist}"
+        extra = {}
 
         if option == "set custom user-agent":
-            user_agent = input(f"{BOLD}{YELLOW}Enter custom User-Agent: {RESET}").strip()
-            command += f" -a \"{user_agent}\""
+            extra["user_agent"] = input(f"{BOLD}{YELLOW}Enter custom User-Agent: {RESET}").strip()
 
         elif option == "add query parameters":
-            query = input(f"{BOLD}{YELLOW}Enter query parameters (key=value): {RESET}").strip()
-            command += f" -Q \"{query}\""
+            extra["query"] = input(f"{BOLD}{YELLOW}Enter query parameters (key=value): {RESET}").strip()
 
         elif option == "filter responses by status codes":
-            status_codes = input(f"{BOLD}{YELLOW}Enter status codes to filter (comma-separated): {RESET}").strip()
-            command += f" -C {status_codes}"
+            extra["status_codes"] = input(f"{BOLD}{YELLOW}Enter status codes to filter (comma-separated): {RESET}").strip()
 
         elif option == "increase verbosity":
-            command += " -v"
+            extra["verbose"] = True
 
         elif option == "custom recursion depth":
-            depth = input(f"{BOLD}{YELLOW}Enter recursion depth: {RESET}").strip()
-            command += f" -d {depth}"
+            extra["depth"] = input(f"{BOLD}{YELLOW}Enter recursion depth: {RESET}").strip()
 
-        print(f"{BOLD}{SKY_BLUE}Executing: {command}{RESET}")
-        output = run_command(command)
-        print(f"{GREENISH}Output of Feroxbuster ({option}):{RESET}\n{output}\n{'='*40}\n")
+        command = build_feroxbuster_command(domain_or_ip, WORDLIST_PLACEHOLDER, **extra)
+        run_wordlist_tool(f"Feroxbuster ({option})", "feroxbuster", domain_or_ip, command, wordlist)
 
 # End of feroxbuster_submenu----------------------------------------------
 
+def subdomain_pipeline_menu(domain_or_ip):
+    """
+    Chains subdomain discovery (amass/assetfinder) into resolution and then into
+    gobuster dir runs against live hosts only, without intermediate files.
+    """
+    print(f"{BOLD}{YELLOW}Subdomain Pipeline: discovery -> resolution -> content brute force{RESET}")
+    print(f"{GREENISH}Discovered names are resolved as they arrive, and each live host is\n"
+          f"brute forced while discovery is still running.{RESET}")
+    use_amass = input(f"{BOLD}{YELLOW}Use amass (passive) for discovery? (y/n) [default: y]: {RESET}").strip().lower() or "y"
+    use_assetfinder = input(f"{BOLD}{YELLOW}Use assetfinder for discovery? (y/n) [default: y]: {RESET}").strip().lower() or "y"
+    discovery_commands = []
+    if use_amass == "y":
+        discovery_commands.append(("amass", build_amass_command(domain_or_ip, "passive")))
+    if use_assetfinder == "y":
+        discovery_commands.append(("assetfinder", build_assetfinder_command(domain_or_ip)))
+    discovery_commands = [(tool, command) for tool, command in discovery_commands if tool_ready(command)]
+    if not tool_ready("gobuster"):
+        print(f"{YELLOW}gobuster is required for the brute-force stage. Returning to main menu.{RESET}")
+        return
+
+    wordlist = select_wordlist()
+    if not wordlist:
+        print(f"{YELLOW}Wordlist is required for the brute-force stage. Returning to main menu.{RESET}")
+        return
+    dns_server = input(f"{BOLD}{YELLOW}Enter DNS server [default: system default]: {RESET}").strip()
+    workers = input(f"{BOLD}{YELLOW}Parallel brute-force runs [default: 2]: {RESET}").strip() or "2"
+    if not workers.isdigit() or int(workers) < 1:
+        print(f"{YELLOW}Invalid number of runs. Returning to main menu.{RESET}")
+        return
+
+    def on_event(stage, kind, data):
+        if kind == "subdomain":
+            print(f"{SKY_BLUE}[discovery]{RESET} {data}")
+        elif kind == "live":
+            print(f"{GREENISH}[live]{RESET} {data['host']} ({', '.join(data['addresses'])})")
+        elif kind == "started":
+            print(f"{BOLD}{SKY_BLUE}[brute] Executing: {data['command']}{RESET}")
+        elif kind == "finding":
+            print(f"{GREENISH}[found]{RESET} {data.host}{data.path} (Status: {data.status})")
+        elif kind in ("finished", "error"):
+            print(f"{YELLOW}[{stage}] {kind}: {data}{RESET}")
+
+    pipeline = SubdomainPipeline(
+        domain_or_ip, discovery_commands,
+        lambda host: ("gobuster", build_gobuster_command("dir", host, wordlist)),
+        dns_server=dns_server or None, brute_workers=int(workers), on_event=on_event,
+    )
+    try:
+        findings = pipeline.run()
+    except KeyboardInterrupt:
+        print(f"{YELLOW}Pipeline interrupted.{RESET}")
+        findings = pipeline.findings
+    record_history(domain_or_ip, "pipeline", f"pipeline {' | '.join(command for _, command in discovery_commands)}", findings)
+    with FINDINGS_LOCK:
+        FINDINGS.merge(findings)
+    stats = pipeline.stats
+    print(f"{BOLD}{GREENISH}Pipeline finished: {stats['discovered']} discovered, {stats['wildcard']} wildcard, {stats['live']} live, "
+          f"{stats['brute_forced']} brute forced.{RESET}")
+    print(f"{findings.summary()}\n{'='*40}\n")
+
+# End of subdomain_pipeline_menu----------------------------------------------
+
+def native_dir_brute_menu(domain_or_ip):
+    """
+    Runs the built-in asyncio directory brute forcer with keep-alive connections.
+    Mirrors the gobuster/feroxbuster prompts for extensions (-x) and status filters (-s/-C).
+    """
+    print(f"{BOLD}{YELLOW}Built-in async directory brute forcer:{RESET}")
+    print(f"{GREENISH}Each worker keeps one persistent keep-alive connection to the target.{RESET}")
+    base_url = input(f"{BOLD}{YELLOW}Enter base URL [default: http://{domain_or_ip}/]: {RESET}").strip() or f"http://{domain_or_ip}/"
+    wordlist = select_wordlist()
+    if not wordlist:
+        print(f"{YELLOW}Wordlist is required for brute forcing. Exiting this option.{RESET}")
+        return
+    extensions = input(f"{BOLD}{YELLOW}Enter file extensions (e.g., php,html) [default: none]: {RESET}").strip()
+    include = input(f"{BOLD}{YELLOW}Enter status codes to show (e.g., 200,301) [default: common codes]: {RESET}").strip()
+    exclude = input(f"{BOLD}{YELLOW}Enter status codes to filter out (e.g., 404,403) [default: 404]: {RESET}").strip() or "404"
+    concurrency = input(f"{BOLD}{YELLOW}Enter concurrency, or 'auto' to adapt it to the target [default: auto]: {RESET}").strip() or "auto"
+    controller = None
+    if concurrency.lower() == "auto":
+        controller = AimdController()
+        concurrency = controller.concurrency
+    try:
+        brute_forcer = DirBruteForcer(
+            base_url,
+            extensions=[extension.strip() for extension in extensions.split(",") if extension.strip()],
+            include_status=parse_status_codes(include),
+            exclude_status=parse_status_codes(exclude),
+            concurrency=int(concurrency),
+            on_result=lambda finding: print(f"{finding.path:<30} (Status: {finding.status}) [Size: {finding.size}]"
+                                            + (f" [--> {finding.value}]" if finding.value else "")),
+            controller=controller,
+        )
+    except ValueError as e:
+        print(f"{YELLOW}Invalid option: {e}{RESET}")
+        return
+
+    checkpoint = load_checkpoint("dirbrute", base_url, f"dirbrute -x {extensions} -s {include} -C {exclude}", wordlist)
+    # Dir_Brute only appends to its results, so each save adds just the ones not saved yet
+    saved = 0
+
+    def save_progress(offset, results):
+        nonlocal saved
+        checkpoint.offset = offset
+        checkpoint.add_findings(results[saved:])
+        saved = len(results)
+        checkpoint.save()
+        if controller:
+            print(f"{SKY_BLUE}[rate] {controller.describe()}, {offset} lines done{RESET}")
+
+    brute_forcer.on_checkpoint = save_progress
+    print(f"{BOLD}{SKY_BLUE}Brute forcing {brute_forcer.base_url}{brute_forcer.base_path} with {wordlist}{RESET}")
+    try:
+        with Wordlist(wordlist) as words:
+            checkpoint.total = words.line_count
+            checkpoint.status = "running"
+            results = brute_forcer.run(words.lines(checkpoint.offset), start=checkpoint.offset)
+            checkpoint.status = "done"
+            save_progress(checkpoint.total, results)
+    except OSError as e:
+        print(f"{YELLOW}Could not read wordlist: {e}{RESET}")
+        return
+    except KeyboardInterrupt:
+        results = brute_forcer.results
+        save_progress(brute_forcer.completed_offset, results)
+        print(f"{YELLOW}Brute force interrupted. Progress saved at line {checkpoint.offset} of {checkpoint.total}; "
+              f"run the same options again to resume.{RESET}")
+    merge_checkpoint_findings(checkpoint)
+    stats = brute_forcer.stats
+    rate = stats["requests"] / stats["elapsed"] if stats["elapsed"] else 0
+    print(f"{BOLD}{GREENISH}{stats['found']} found, {stats['requests']} requests, {stats['errors']} errors, "
+          f"{stats['connections']} connections, {rate:.0f} req/s.{RESET}")
+    if controller:
+        print(f"{GREENISH}Adaptive limits settled at {controller.describe()}.{RESET}")
+    print(f"{'='*40}\n")
+
+# End of native_dir_brute_menu----------------------------------------------
+
 def select_wordlist():
     """
     Prompts the user to enter a path to a wordlist and validates it.
+    Returns None when no readable wordlist was given.
     """
     print(f"{BOLD}{YELLOW}Enter the path to your wordlist: {RESET}")
     wordlist = input().strip()
     if not wordlist:
-        print(f"{YELLOW}No wordlist provided. Exiting.{RESET}")
-        sys.exit(0)  # Exit with status 0 (success)
+        print(f"{YELLOW}No wordlist provided.{RESET}")
+        return None
+    try:
+        with Wordlist(wordlist) as words:
+            print(f"{GREENISH}Wordlist: {words.line_count} lines ({words.size} bytes).{RESET}")
+    except OSError as e:
+        print(f"{YELLOW}Could not open wordlist: {e}{RESET}")
+        return None
     return wordlist
 
 # End of select_wordlist----------------------------------------------
 
+def wordlist_tools_menu():
+    """
+    Wordlist utilities: line counts and offset indexing, streaming deduplication,
+    and splitting into byte-balanced shards for parallel workers.
+    """
+    wordlist = select_wordlist()
+    if not wordlist:
+        return
+    options = ["Build/refresh line index", "Remove duplicates", "Show shards"]
+
+    while True:
+        print(f"{BOLD}{YELLOW}Wordlist Tools - {wordlist}:{RESET}")
+        for idx, option in enumerate(options, 1):
+            print(f"{idx}. {option}")
+        print(f"0. Exit")
+
+        choice = input(f"{BOLD}{YELLOW}Enter your choice: {RESET}").strip()
+
+        if not choice.isdigit() or not (0 <= int(choice) <= len(options)):
+            print(f"{YELLOW}Invalid choice. Please try again.{RESET}")
+            continue
+
+        if int(choice) == 0:
+            print(f"{BOLD}{YELLOW}Returning to main menu.{RESET}")
+            break
+
+        option = options[int(choice) - 1]
+        with Wordlist(wordlist) as words:
+            if option == "Build/refresh line index":
+                started = time.time()
+                print(f"{GREENISH}{len(words.rebuild_index())} lines indexed in {time.time() - started:.2f}s "
+                      f"(cached at {words.index_path}).{RESET}")
+
+            elif option == "Remove duplicates":
+                default_output = f"{wordlist}.dedup"
+                output_path = input(f"{BOLD}{YELLOW}Enter output path [default: {default_output}]: {RESET}").strip() or default_output
+                replace_source = os.path.exists(output_path) and os.path.samefile(output_path, wordlist)
+                if replace_source:
+                    confirm = input(f"{BOLD}{YELLOW}This overwrites the wordlist itself. Continue? (y/N): {RESET}").strip().lower()
+                    if confirm != "y":
+                        continue
+                try:
+                    total, unique = words.deduplicate(output_path, replace_source)
+                except OSError as e:
+                    print(f"{YELLOW}Could not write {output_path}: {e}{RESET}")
+                    continue
+                print(f"{GREENISH}{total} lines read, {unique} unique lines written to {output_path}.{RESET}")
+
+            elif option == "Show shards":
+                count = input(f"{BOLD}{YELLOW}Number of shards [default: 4]: {RESET}").strip() or "4"
+                if not count.isdigit() or int(count) < 1:
+                    print(f"{YELLOW}Invalid number of shards.{RESET}")
+                    continue
+                for number, (start, stop) in enumerate(words.shards(int(count)), 1):
+                    print(f"{number}. lines {start}-{stop - 1} ({stop - start} lines)")
+
+# End of wordlist_tools_menu----------------------------------------------
+
+def tool_status_menu():
+    """
+    Shows every known tool's path, version and compatibility fixes, optionally re-probing them.
+    """
+    reprobe = input(f"{BOLD}{YELLOW}Re-probe all tools instead of using cached results? (y/n) [default: n]: {RESET}").strip().lower() or "n"
+    if reprobe == "y":
+        TOOLS.forget()
+    print(f"{BOLD}{SKY_BLUE}Installed tools:{RESET}")
+    for name, info in TOOLS.status().items():
+        if info:
+            print(info.describe())
+        else:
+            print(f"{YELLOW}{name:<13} not installed{RESET}")
+    print(f"{'='*40}\n")
+
+# End of tool_status_menu----------------------------------------------
+
+def metrics_menu():
+    """
+    Shows where this session's time went: the tools with the most wall-clock time,
+    their CPU time and peak memory, and the toolkit's own Python-side cost.
+    """
+    start_metrics().write(force=True)
+    snapshot = METRICS.snapshot()
+    hot_spots = METRICS.hot_spots()
+    if hot_spots:
+        print(f"{BOLD}{SKY_BLUE}{'Tool':<13} {'Runs':>5} {'Wall s':>9} {'User s':>8} {'Sys s':>8} {'Peak MB':>8} {'Output':>10}{RESET}")
+        for tool, totals in hot_spots:
+            print(f"{tool:<13} {totals.runs:>5} {totals.wall_time:>9.2f} {totals.user_time:>8.2f} "
+                  f"{totals.system_time:>8.2f} {totals.max_rss_kb / 1024:>8.1f} {totals.output_bytes:>10}")
+    else:
+        print(f"{YELLOW}No commands run yet.{RESET}")
+    python = snapshot["python"]
+    print(f"{GREENISH}Toolkit (Python): {python['user_time']:.2f}s user, {python['system_time']:.2f}s system, "
+          f"peak {python['max_rss_kb'] / 1024:.1f} MB{RESET}")
+    for name, totals in snapshot["actions"].items():
+        print(f"{name:<22} {totals['runs']:>4} runs {totals['wall_time']:>9.2f}s (max {totals['max_wall_time']:.2f}s)")
+    print(f"{GREENISH}Metrics written to {METRICS.json_path} and {METRICS.prom_path}{RESET}")
+    print(f"{'='*40}\n")
+
+# End of metrics_menu----------------------------------------------
+
+def _select_job(prompt):
+    """
+    Asks for a job number (default: the most recent job) and returns the Job, or None.
+    """
+    jobs = JOBS.jobs()
+    if not jobs:
+        print(f"{YELLOW}No jobs yet.{RESET}")
+        return None
+    answer = input(f"{BOLD}{YELLOW}{prompt} [default: {jobs[-1].id}]: {RESET}").strip() or str(jobs[-1].id)
+    job = JOBS.get(int(answer)) if answer.isdigit() else None
+    if job is None:
+        print(f"{YELLOW}No job {answer}.{RESET}")
+    return job
+
+def jobs_menu():
+    """
+    Background job controls: switch background mode on or off, list queued/running/finished
+    jobs with their progress, attach to a job's streaming output, cancel jobs and size the pool.
+    """
+    global BACKGROUND_JOBS
+
+    while True:
+        mode = "on" if BACKGROUND_JOBS else "off"
+        active = len(JOBS.jobs(active_only=True))
+        print(f"\n{BOLD}{YELLOW}Background Jobs - background mode: {mode}, {active} active, "
+              f"{JOBS.max_workers} run at a time{RESET}")
+        print("1. Toggle background mode (DNS, recon and brute force tools run as jobs)")
+        print("2. List jobs")
+        print("3. Attach to a job (Ctrl-C detaches)")
+        print("4. Cancel a job")
+        print("5. Set how many jobs run at a time")
+        print("6. Clear finished jobs")
+        print("0. Exit")
+
+        choice = input(f"{BOLD}{YELLOW}Enter your choice: {RESET}").strip()
+
+        if choice == "0":
+            print(f"{BOLD}{YELLOW}Returning to main menu.{RESET}")
+            break
+        elif choice == "1":
+            BACKGROUND_JOBS = not BACKGROUND_JOBS
+            print(f"{BOLD}{GREENISH}Background mode {'on' if BACKGROUND_JOBS else 'off'}.{RESET}")
+        elif choice == "2":
+            jobs = JOBS.jobs()
+            if not jobs:
+                print(f"{YELLOW}No jobs yet.{RESET}")
+            for job in jobs:
+                print(f"{GREENISH if job.state == 'running' else ''}{job.describe()}{RESET}")
+        elif choice == "3":
+            job = _select_job("Job to attach to")
+            if job:
+                print(f"{BOLD}{SKY_BLUE}Attached to job {job.id} ({job.label}); Ctrl-C detaches.{RESET}")
+                try:
+                    job.follow()
+                    print(f"{GREENISH}{job.describe()}{RESET}")
+                except KeyboardInterrupt:
+                    print(f"\n{YELLOW}Detached; job {job.id} keeps running.{RESET}")
+        elif choice == "4":
+            job = _select_job("Job to cancel")
+            if job:
+                if JOBS.cancel(job.id):
+                    print(f"{GREENISH}Cancelling job {job.id}.{RESET}")
+                else:
+                    print(f"{YELLOW}Job {job.id} has already finished.{RESET}")
+        elif choice == "5":
+            workers = input(f"{BOLD}{YELLOW}Jobs to run at a time [default: {JOBS.max_workers}]: {RESET}").strip()
+            if workers.isdigit() and int(workers) > 0:
+                JOBS.set_max_workers(int(workers))
+                print(f"{BOLD}{GREENISH}Up to {JOBS.max_workers} jobs will run at a time.{RESET}")
+            elif workers:
+                print(f"{YELLOW}Invalid number.{RESET}")
+        elif choice == "6":
+            JOBS.clear_finished()
+        else:
+            print(f"{YELLOW}Invalid choice. Please try again.{RESET}")
+
+# End of jobs_menu----------------------------------------------
+
+def history_menu(domain_or_ip):
+    """
+    Queries the scan history: recent runs, what the last run of a tool added or lost,
+    hosts and paths first seen in the last N hours, and full-text search over every finding.
+    """
+    while True:
+        try:
+            runs, findings = HISTORY.stats()
+            print(f"\n{BOLD}{YELLOW}Scan History ({runs} runs, {findings} findings) - target: {domain_or_ip}{RESET}")
+        except (sqlite3.Error, OSError) as e:
+            print(f"{YELLOW}Scan history unavailable: {e}{RESET}")
+            return
+        print("1. Recent runs")
+        print("2. Changes in the last run of a tool")
+        print("3. New hosts and paths in the last hours")
+        print("4. Search all findings")
+        print("0. Exit")
+
+        choice = input(f"{BOLD}{YELLOW}Enter your choice: {RESET}").strip()
+
+        try:
+            if choice == "0":
+                print(f"{BOLD}{YELLOW}Returning to main menu.{RESET}")
+                break
+            elif choice == "1":
+                scope = input(f"{BOLD}{YELLOW}Target (or 'all') [default: {domain_or_ip}]: {RESET}").strip() or domain_or_ip
+                for run in HISTORY.runs(None if scope == "all" else scope):
+                    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["finished_at"]))
+                    print(f"{when}  {run['tool']:<13} {run['target']:<25} {run['findings']:>6} findings, "
+                          f"{run['new_findings']} new  {run['command']}")
+            elif choice == "2":
+                tool = input(f"{BOLD}{YELLOW}Tool (e.g., amass, gobuster, dig): {RESET}").strip()
+                diff = HISTORY.diff_last_run(domain_or_ip, tool)
+                if diff is None:
+                    print(f"{YELLOW}{tool or 'That tool'} has no recorded runs against {domain_or_ip}.{RESET}")
+                    continue
+                new, gone = diff
+                print(f"{BOLD}{GREENISH}New in the last run ({len(new)}):{RESET}")
+                for row in new:
+                    print(f"+ {describe_row(row)}")
+                print(f"{BOLD}{YELLOW}Seen in the run before but not in the last one ({len(gone)}):{RESET}")
+                for row in gone:
+                    print(f"- {describe_row(row)}")
+            elif choice == "3":
+                hours = input(f"{BOLD}{YELLOW}Hours to look back [default: 24]: {RESET}").strip() or "24"
+                try:
+                    since = time.time() - float(hours) * 3600
+                except ValueError:
+                    print(f"{YELLOW}Invalid number of hours.{RESET}")
+                    continue
+                hosts, paths = HISTORY.new_since(domain_or_ip, since)
+                print(f"{BOLD}{GREENISH}New hosts ({len(hosts)}):{RESET}")
+                for host in hosts:
+                    print(f"  {host}")
+                print(f"{BOLD}{GREENISH}New paths ({len(paths)}):{RESET}")
+                for host, path in paths:
+                    print(f"  {host}{path}")
+            elif choice == "4":
+                query = input(f"{BOLD}{YELLOW}Search (e.g., admin, dev*, \"api v2\"): {RESET}").strip()
+                if not query:
+                    continue
+                scope = input(f"{BOLD}{YELLOW}Target (or 'all') [default: all]: {RESET}").strip() or "all"
+                rows = HISTORY.search(query, None if scope == "all" else scope)
+                for row in rows:
+                    print(f"{row['target']}: {describe_row(row)}")
+                print(f"{GREENISH}{len(rows)} matches.{RESET}")
+            else:
+                print(f"{YELLOW}Invalid choice. Please try again.{RESET}")
+        except (sqlite3.Error, OSError) as e:
+            print(f"{YELLOW}Scan history unavailable: {e}{RESET}")
+
+# End of history_menu----------------------------------------------
+
 def edit_domain_or_ip(current_domain_or_ip):
     """
     Allows the user to edit or re-enter a domain or IP.
@@ -547,6 +1674,7 @@ def main():
     Main function to start the script.
     Displays the main menu and integrates all tool submenus.
     """
+    start_metrics()
     print(f"{BOLD}{YELLOW}Welcome to the Enhanced Reconnaissance Toolkit!{RESET}")
     print(f"{GREENISH}This toolkit allows you to use DNS tools, reconnaissance tools, "
           f"directory brute force tools, and more in a flexible and interactive way.{RESET}")
@@ -567,6 +1695,15 @@ def main():
         print("3. Directory Brute Force Tools")
         print("4. Puredns")
         print("5. Edit Domain or IP")
+        print("6. Result Cache Settings")
+        print("7. Batch Mode (multiple targets)")
+        print("8. Findings Summary")
+        print("9. Subdomain Pipeline (discover -> resolve -> brute force)")
+        print("10. Wordlist Tools")
+        print("11. Installed Tools")
+        print("12. Session Metrics")
+        print("13. Background Jobs")
+        print("14. Scan History (diffs and search)")
         print("0. Exit")
 
         choice = input(f"{BOLD}{YELLOW}Enter your choice: {RESET}").strip()
@@ -578,24 +1715,74 @@ def main():
         choice = int(choice)
 
         if choice == 0:
+            active = JOBS.jobs(active_only=True)
+            if active:
+                answer = input(f"{BOLD}{YELLOW}{len(active)} background jobs are still running or queued. "
+                               f"Cancel them and exit? (y/n) [default: n]: {RESET}").strip().lower() or "n"
+                if answer != "y":
+                    continue
+            JOBS.shutdown()
             print(f"{BOLD}{YELLOW}Exiting. Goodbye!{RESET}")
             sys.exit(0)  # Exit with success status
 
-        if choice == 5:
-            domain_or_ip = edit_domain_or_ip(domain_or_ip)
-            continue
+        # Time every action so slow sessions can be traced back to a menu entry
+        with METRICS.timed_action(MAIN_MENU_ACTIONS.get(choice, "invalid")):
+            if choice == 5:
+                domain_or_ip = edit_domain_or_ip(domain_or_ip)
+                continue
 
-        # Route the user to the appropriate submenu
-        if choice == 1:
-            dns_tools_submenu(domain_or_ip)
-        elif choice == 2:
-            recon_tools_submenu(domain_or_ip)
-        elif choice == 3:
-            directory_brute_force_submenu(domain_or_ip)
-        elif choice == 4:
-            puredns_tool(domain_or_ip)
-        else:
-            print(f"{YELLOW}Invalid choice. Please select a valid option.{RESET}")
+            if choice == 6:
+                cache_settings_menu()
+                continue
+
+            if choice == 7:
+                batch_mode_menu(use_cache=CACHE_MODE == "use")
+                continue
+
+            if choice == 10:
+                wordlist_tools_menu()
+                continue
+
+            if choice == 11:
+                tool_status_menu()
+                continue
+
+            if choice == 12:
+                metrics_menu()
+                continue
+
+            if choice == 13:
+                jobs_menu()
+                continue
+
+            if choice == 14:
+                history_menu(domain_or_ip)
+                continue
+
+            if choice == 9:
+                subdomain_pipeline_menu(domain_or_ip)
+                continue
+
+            if choice == 8:
+                with FINDINGS_LOCK:
+                    summary = FINDINGS.summary() if len(FINDINGS) else None
+                if summary:
+                    print(f"{BOLD}{SKY_BLUE}Findings ({len(FINDINGS)} unique):{RESET}\n{summary}")
+                else:
+                    print(f"{YELLOW}No findings recorded yet.{RESET}")
+                continue
+
+            # Route the user to the appropriate submenu
+            if choice == 1:
+                dns_tools_submenu(domain_or_ip)
+            elif choice == 2:
+                recon_tools_submenu(domain_or_ip)
+            elif choice == 3:
+                directory_brute_force_submenu(domain_or_ip)
+            elif choice == 4:
+                puredns_tool(domain_or_ip)
+            else:
+                print(f"{YELLOW}Invalid choice. Please select a valid option.{RESET}")
 
 
 
@@ -0,0 +1,195 @@
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Output lines kept per job for attaching to it later
+JOB_OUTPUT_LINES = 2000
+# Jobs running at the same time; the rest wait in the queue
+DEFAULT_JOB_WORKERS = 3
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+class Job:
+    """
+    One background run. work(job) does the actual run: it passes every output line to
+    job.emit, may set job.progress to a short text, passes job.cancel_event on to
+    stream_command/run_chunked so cancel() can stop it, and returns a one-line summary.
+    A run that did not succeed sets job.ok to False; whatever it produced (a CommandResult,
+    a Checkpoint) can be left in job.result.
+    """
+
+    def __init__(self, job_id, label, work, target=None, on_done=None):
+        self.id = job_id
+        self.label = label
+        self.target = target
+        self.work = work
+        self.on_done = on_done
+        self.state = "queued"
+        self.ok = True
+        self.progress = None
+        self.summary = None
+        self.result = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.lines = 0
+        self.output = deque(maxlen=JOB_OUTPUT_LINES)
+        self.cancel_event = threading.Event()
+        self.future = None
+        self._changed = threading.Condition()
+
+    def emit(self, line):
+        with self._changed:
+            self.output.append(line)
+            self.lines += 1
+            self._changed.notify_all()
+
+    def _set_state(self, state):
+        with self._changed:
+            self.state = state
+            if state in FINISHED_STATES:
+                self.finished_at = time.time()
+            self._changed.notify_all()
+
+    @property
+    def finished(self):
+        return self.state in FINISHED_STATES
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def describe(self):
+        target = f" ({self.target})" if self.target else ""
+        details = self.summary if self.finished and self.summary else self.progress or f"{self.lines} lines"
+        return f"[{self.id}] {self.state:<9} {self.label}{target}, {self.elapsed:.0f}s: {details}"
+
+    def follow(self, write=print, poll=0.5):
+        """
+        Writes the buffered output, then every new line as it arrives, until the job
+        finishes. Blocks the caller; Ctrl-C (KeyboardInterrupt) detaches without stopping the job.
+        """
+        seen = max(0, self.lines - len(self.output))
+        if seen:
+            write(f"... {seen} earlier lines not kept ...")
+        while True:
+            with self._changed:
+                while self.lines == seen and not self.finished:
+                    self._changed.wait(poll)
+                new = self.lines - seen
+                lines = list(self.output)[-new:] if new else []
+                skipped = new - len(lines)
+                seen = self.lines
+                finished = self.finished
+            if skipped:
+                write(f"... {skipped} lines not kept ...")
+            for line in lines:
+                write(line)
+            if finished and self.lines == seen:
+                return
+
+# End of Job----------------------------------------------
+
+class JobScheduler:
+    """
+    Runs Jobs on a bounded thread pool so menus stay usable while tools run.
+    Jobs beyond max_workers wait in submission order. on_finish(job) is called from
+    the worker thread whenever a job ends, however it ends.
+    """
+
+    def __init__(self, max_workers=DEFAULT_JOB_WORKERS, on_finish=None):
+        self.max_workers = max(1, max_workers)
+        self.on_finish = on_finish
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, label, work, target=None, on_done=None):
+        """
+        Queues work(job) and returns the Job. on_done(job) runs after it ends, e.g. to release resources.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scr-job")
+            job = Job(next(self._ids), label, work, target, on_done)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        if job.cancel_event.is_set():
+            job.summary = "cancelled before it started"
+            self._finish(job, "cancelled")
+            return
+        job.started_at = time.time()
+        job._set_state("running")
+        try:
+            job.summary = job.work(job)
+            state = "cancelled" if job.cancel_event.is_set() else "done" if job.ok else "failed"
+        except Exception as e:
+            job.ok = False
+            job.summary = f"error: {e}"
+            state = "failed"
+        self._finish(job, state)
+
+    def _finish(self, job, state):
+        job._set_state(state)
+        for callback in (job.on_done, self.on_finish):
+            if callback:
+                try:
+                    callback(job)
+                except Exception:
+                    pass
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self, active_only=False):
+        jobs = list(self._jobs.values())
+        return [job for job in jobs if not job.finished] if active_only else jobs
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued job or stops a running one. Returns False if there is no such unfinished job.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        if job.future.cancel():
+            job.summary = "cancelled before it started"
+            self._finish(job, "cancelled")
+        return True
+
+    def set_max_workers(self, max_workers):
+        """
+        Changes the pool size for jobs submitted from now on; queued jobs keep their old pool.
+        """
+        with self._lock:
+            self.max_workers = max(1, max_workers)
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def clear_finished(self):
+        with self._lock:
+            for job_id in [job.id for job in self._jobs.values() if job.finished]:
+                del self._jobs[job_id]
+
+    def shutdown(self, cancel=True):
+        """
+        Stops accepting jobs and waits for the pool, cancelling every unfinished job first unless cancel is False.
+        """
+        if cancel:
+            for job in self.jobs(active_only=True):
+                self.cancel(job.id)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+# End of JobScheduler----------------------------------------------
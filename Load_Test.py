@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import Counter
+
+from Http_Executor import HttpExecutor
+
+DEFAULT_LOAD_REQUESTS = 1000
+DEFAULT_LOAD_CONCURRENCY = 10
+# Significant bits kept per latency: 64 buckets per power of two, so within 1/64 (about 1.6%)
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS = SUB_BUCKETS // 2
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram: counts in log-linear buckets of microseconds instead of
+    every sample, so memory stays a few hundred counters whatever the run length.
+    Values below SUB_BUCKETS microseconds are exact; larger ones keep SUB_BUCKET_BITS
+    significant bits.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket_index(micros):
+        if micros < SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - SUB_BUCKET_BITS
+        return shift * HALF_BUCKETS + (micros >> shift)
+
+    @staticmethod
+    def bucket_range(index):
+        """
+        Returns the (lowest, highest) microsecond value counted in a bucket.
+        """
+        if index < SUB_BUCKETS:
+            return index, index
+        shift = (index - SUB_BUCKETS) // HALF_BUCKETS + 1
+        mantissa = index - shift * HALF_BUCKETS
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds):
+        micros = max(0, int(seconds * 1_000_000))
+        self.counts[self.bucket_index(micros)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def value_at(self, fraction):
+        """
+        Latency in seconds at or below which fraction of the samples fall (the upper
+        edge of the bucket holding that rank, capped at the largest sample).
+        """
+        if not self.count:
+            return None
+        rank = max(1, round(self.count * fraction))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.bucket_range(index)[1] / 1_000_000, self.max)
+        return self.max
+
+    def percentiles(self, fractions=(0.5, 0.9, 0.95, 0.99, 0.999)):
+        return {fraction: self.value_at(fraction) for fraction in fractions}
+
+    def distribution(self):
+        """
+        Returns (upper bound in seconds, count) rows with one row per power of two of
+        microseconds, for a compact printed distribution.
+        """
+        rows = Counter()
+        for index, count in self.counts.items():
+            highest = self.bucket_range(index)[1]
+            rows[1 << highest.bit_length()] += count
+        return [(bound / 1_000_000, rows[bound]) for bound in sorted(rows)]
+
+# End of LatencyHistogram----------------------------------------------
+
+class LoadTestStats:
+    """
+    What a load test measured: a latency histogram of every completed response, status
+    code counts, transport errors by exception type, bytes received and timing.
+    """
+
+    def __init__(self, concurrency, keep_alive):
+        self.concurrency = concurrency
+        self.keep_alive = keep_alive
+        self.histogram = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.bytes = 0
+        self.reused_connections = 0
+        self.completed = 0
+        self.failed = 0
+        self.interrupted = False
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def merge(self, other):
+        self.histogram.merge(other.histogram)
+        self.statuses.update(other.statuses)
+        self.errors.update(other.errors)
+        self.bytes += other.bytes
+        self.reused_connections += other.reused_connections
+        self.completed += other.completed
+        self.failed += other.failed
+
+    def add(self, result):
+        self.completed += 1
+        if result.ok:
+            self.histogram.record(result.elapsed)
+            self.statuses[result.status] += 1
+            self.bytes += result.size
+            if result.reused:
+                self.reused_connections += 1
+        else:
+            self.failed += 1
+            self.errors[result.error_type or "error"] += 1
+
+    def describe(self):
+        """
+        A multi-line report: throughput, latency percentiles, distribution and error breakdown.
+        """
+        elapsed = self.elapsed or time.perf_counter() - self.started
+        rate = self.completed / elapsed if elapsed else 0.0
+        histogram = self.histogram
+        lines = [
+            f"{'Stopped early: ' if self.interrupted else ''}{self.completed} requests in {elapsed:.2f}s with concurrency {self.concurrency} "
+            f"(keep-alive {'on' if self.keep_alive else 'off'}): {rate:.1f} requests/s, "
+            f"{self.bytes / elapsed / 1024 if elapsed else 0.0:.1f} KiB/s, {self.reused_connections} on reused connections"
+        ]
+        if histogram.count:
+            lines.append(f"Latency: min {histogram.min * 1000:.2f} ms, mean {histogram.mean * 1000:.2f} ms, "
+                         f"max {histogram.max * 1000:.2f} ms")
+            lines.append("  ".join(f"p{fraction * 100:g} {value * 1000:.2f} ms"
+                                   for fraction, value in histogram.percentiles().items()))
+            widest = max(count for _, count in histogram.distribution())
+            for bound, count in histogram.distribution():
+                lines.append(f"  < {bound * 1000:9.3f} ms {count:>8} {'#' * max(1, round(40 * count / widest))}")
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        lines.append(f"Status codes: {statuses or 'none'}")
+        if self.errors:
+            lines.append("Errors: " + ", ".join(f"{kind}: {count}" for kind, count in self.errors.most_common()))
+        return "\n".join(lines)
+
+# End of LoadTestStats----------------------------------------------
+
+def load_test(request, total=DEFAULT_LOAD_REQUESTS, duration=None, concurrency=DEFAULT_LOAD_CONCURRENCY,
+              keep_alive=True, on_progress=None, progress_interval=1.0, cancel=None):
+    """
+    Sends request (a Curl_Builder request model) from concurrency threads sharing one
+    pooled session until total requests were sent, or for duration seconds when
+    duration is given. Without keep_alive every request closes its connection, so each
+    one pays for a new connection. Each thread records into its own
+    stats, merged at the end. on_progress(completed, errors, elapsed) is called every
+    progress_interval seconds. Setting the cancel event or Ctrl-C stops the test early
+    (the latter sets interrupted); either way the LoadTestStats so far are returned.
+    """
+    concurrency = max(1, concurrency)
+    request = dict(request, output_file="")
+    executor = HttpExecutor(pool_size=concurrency)
+    stats = LoadTestStats(concurrency, keep_alive)
+    worker_stats = [LoadTestStats(concurrency, keep_alive) for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration if duration else None
+    remaining = [total]
+    running = [concurrency]
+    lock = threading.Lock()
+    finished = threading.Event()
+
+    def claim():
+        if finished.is_set() or (cancel is not None and cancel.is_set()):
+            return False
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(own):
+        try:
+            while claim():
+                own.add(executor.execute(request, keep_body=0, keep_alive=keep_alive))
+        finally:
+            with lock:
+                running[0] -= 1
+                if not running[0]:
+                    finished.set()
+
+    threads = [threading.Thread(target=worker, args=(own,), name=f"scr-load-{number}", daemon=True)
+               for number, own in enumerate(worker_stats)]
+    try:
+        for thread in threads:
+            thread.start()
+        while not finished.wait(progress_interval):
+            if on_progress:
+                on_progress(sum(own.completed for own in worker_stats), sum(own.failed for own in worker_stats),
+                            time.perf_counter() - stats.started)
+    except KeyboardInterrupt:
+        stats.interrupted = True
+    finally:
+        finished.set()
+        for thread in threads:
+            thread.join()
+        executor.close()
+    stats.elapsed = time.perf_counter() - stats.started
+    for own in worker_stats:
+        stats.merge(own)
+    return stats
+
+# End of load_test----------------------------------------------
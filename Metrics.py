@@ -0,0 +1,195 @@
+import contextlib
+import json
+import os
+import resource
+import threading
+import time
+
+from Result_Cache import CACHE_DIR, normalize_arguments
+
+# Where metrics are written; point SCR_METRICS_DIR at node_exporter's textfile directory to scrape them
+METRICS_DIR = os.environ.get("SCR_METRICS_DIR", CACHE_DIR)
+METRICS_JSON = os.path.join(METRICS_DIR, "metrics.json")
+METRICS_PROM = os.path.join(METRICS_DIR, "scr.prom")
+# Seconds between metric file writes while commands are running
+WRITE_INTERVAL = 10
+
+class UsageTotals:
+    """
+    Aggregated resource usage of every run of one tool (or one menu action).
+    """
+    __slots__ = ("runs", "failures", "timeouts", "wall_time", "max_wall_time", "user_time", "system_time",
+                 "max_rss_kb", "output_bytes", "line_count")
+
+    def __init__(self):
+        for slot in self.__slots__:
+            setattr(self, slot, 0)
+
+    def add(self, usage):
+        self.runs += 1
+        if usage.get("timed_out"):
+            self.timeouts += 1
+        elif usage.get("returncode") not in (0, None) or usage.get("interrupted"):
+            self.failures += 1
+        wall_time = usage.get("wall_time") or 0.0
+        self.wall_time += wall_time
+        self.max_wall_time = max(self.max_wall_time, wall_time)
+        self.user_time += usage.get("user_time") or 0.0
+        self.system_time += usage.get("system_time") or 0.0
+        self.max_rss_kb = max(self.max_rss_kb, usage.get("max_rss_kb") or 0)
+        self.output_bytes += usage.get("output_bytes") or 0
+        self.line_count += usage.get("line_count") or 0
+
+    def as_dict(self):
+        totals = {slot: getattr(self, slot) for slot in self.__slots__}
+        for name in ("wall_time", "max_wall_time", "user_time", "system_time"):
+            totals[name] = round(totals[name], 6)
+        return totals
+
+# End of UsageTotals----------------------------------------------
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# (metric name, type, help, UsageTotals field, multiplier) for per-tool command metrics
+COMMAND_SERIES = (
+    ("scr_command_runs_total", "counter", "Commands run", "runs", 1),
+    ("scr_command_failures_total", "counter", "Commands that exited non-zero or were interrupted", "failures", 1),
+    ("scr_command_timeouts_total", "counter", "Commands killed after their timeout", "timeouts", 1),
+    ("scr_command_wall_seconds_total", "counter", "Wall-clock time spent in commands", "wall_time", 1),
+    ("scr_command_wall_seconds_max", "gauge", "Slowest single command", "max_wall_time", 1),
+    ("scr_command_user_cpu_seconds_total", "counter", "User CPU time of commands and their children", "user_time", 1),
+    ("scr_command_system_cpu_seconds_total", "counter", "System CPU time of commands and their children",
+     "system_time", 1),
+    ("scr_command_max_rss_bytes", "gauge", "Largest peak resident set size of a command", "max_rss_kb", 1024),
+    ("scr_command_output_bytes_total", "counter", "Bytes of stdout produced by commands", "output_bytes", 1),
+)
+ACTION_SERIES = (
+    ("scr_action_runs_total", "counter", "Menu actions run", "runs", 1),
+    ("scr_action_seconds_total", "counter", "Wall-clock time spent in menu actions", "wall_time", 1),
+    ("scr_action_seconds_max", "gauge", "Slowest single menu action", "max_wall_time", 1),
+)
+
+class MetricsRecorder:
+    """
+    Collects per-command resource usage (from Process_Runner observers) and Python-side
+    timings of menu actions, aggregated per tool and per action, and writes them as JSON
+    and as a Prometheus textfile. Files are rewritten atomically, at most every
+    WRITE_INTERVAL seconds while commands run and after every action.
+    """
+
+    def __init__(self, json_path=METRICS_JSON, prom_path=METRICS_PROM, write_interval=WRITE_INTERVAL):
+        self.json_path = json_path
+        self.prom_path = prom_path
+        self.write_interval = write_interval
+        self.started_at = time.time()
+        self.commands = {}
+        self.actions = {}
+        self._dirty = False
+        self._written_at = 0.0
+        self._lock = threading.Lock()
+
+    def record_command(self, result):
+        """
+        Adds one finished CommandResult. Usable directly as a Process_Runner observer.
+        """
+        tool = normalize_arguments(result.command)[0] or "unknown"
+        with self._lock:
+            self.commands.setdefault(tool, UsageTotals()).add(result.usage())
+            self._dirty = True
+            due = time.monotonic() - self._written_at >= self.write_interval
+        if due:
+            self.write()
+
+    def record_action(self, name, seconds, failed=False):
+        with self._lock:
+            self.actions.setdefault(name, UsageTotals()).add(
+                {"wall_time": seconds, "returncode": 1 if failed else 0})
+            self._dirty = True
+        self.write()
+
+    @contextlib.contextmanager
+    def timed_action(self, name):
+        """
+        Times the enclosed block as one run of the named action; an exception counts as a failure.
+        """
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.record_action(name, time.perf_counter() - started, failed)
+
+    def snapshot(self):
+        """
+        Returns every aggregate plus this process's own CPU time and peak RSS as a dict.
+        """
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "updated_at": time.time(),
+                "python": {"user_time": round(own.ru_utime, 6), "system_time": round(own.ru_stime, 6),
+                           "max_rss_kb": own.ru_maxrss},
+                "commands": {tool: totals.as_dict() for tool, totals in sorted(self.commands.items())},
+                "actions": {name: totals.as_dict() for name, totals in sorted(self.actions.items())},
+            }
+
+    def prometheus(self, snapshot=None):
+        """
+        Renders a snapshot in the Prometheus text exposition format.
+        """
+        snapshot = snapshot or self.snapshot()
+        lines = []
+        for series, group, label in ((COMMAND_SERIES, "commands", "tool"), (ACTION_SERIES, "actions", "action")):
+            for metric, kind, help_text, field, multiplier in series:
+                lines.append(f"# HELP {metric} {help_text}.")
+                lines.append(f"# TYPE {metric} {kind}")
+                for name, totals in snapshot[group].items():
+                    lines.append(f'{metric}{{{label}="{_label(name)}"}} {totals[field] * multiplier}')
+        python = snapshot["python"]
+        lines += [
+            "# HELP scr_python_cpu_seconds_total CPU time of the toolkit's own Python process.",
+            "# TYPE scr_python_cpu_seconds_total counter",
+            f'scr_python_cpu_seconds_total{{mode="user"}} {python["user_time"]}',
+            f'scr_python_cpu_seconds_total{{mode="system"}} {python["system_time"]}',
+            "# HELP scr_python_max_rss_bytes Peak resident set size of the toolkit's own Python process.",
+            "# TYPE scr_python_max_rss_bytes gauge",
+            f"scr_python_max_rss_bytes {python['max_rss_kb'] * 1024}",
+            "# HELP scr_session_start_time_seconds When this session started.",
+            "# TYPE scr_session_start_time_seconds gauge",
+            f"scr_session_start_time_seconds {snapshot['started_at']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, force=False):
+        """
+        Writes the JSON and Prometheus files if anything was recorded since the last write.
+        Metrics are best effort: I/O errors are ignored.
+        """
+        with self._lock:
+            if not self._dirty and not force:
+                return
+            self._dirty = False
+            self._written_at = time.monotonic()
+        snapshot = self.snapshot()
+        for path, text in ((self.json_path, json.dumps(snapshot, indent=1)), (self.prom_path, self.prometheus(snapshot))):
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "w") as metrics_file:
+                    metrics_file.write(text)
+                os.replace(temp_path, path)
+            except OSError:
+                pass
+
+    def hot_spots(self, limit=10):
+        """
+        Returns (tool, UsageTotals) pairs for the tools that took the most wall-clock time.
+        """
+        with self._lock:
+            ranked = sorted(self.commands.items(), key=lambda item: item[1].wall_time, reverse=True)
+        return ranked[:limit]
+
+# End of MetricsRecorder----------------------------------------------
@@ -0,0 +1,299 @@
+import os
+import signal
+import selectors
+import subprocess
+import tempfile
+import time
+from collections import deque
+
+# Output kept in memory before it is spilled to a temp file
+DEFAULT_MAX_MEMORY = 1024 * 1024
+# Lines kept from the end of stdout/stderr for summaries and error messages
+TAIL_LINES = 200
+# Longest partial line buffered before it is emitted as-is
+MAX_LINE_BYTES = 64 * 1024
+# Grace period between SIGTERM and SIGKILL when a process group is stopped
+KILL_GRACE = 2
+# Longest a cancellable stream_command goes without checking its cancel event
+CANCEL_POLL = 0.2
+
+class CommandResult:
+    """
+    Outcome of a command run through stream_command.
+    Holds at most max_memory bytes of stdout; anything beyond that lives in spill_path.
+    """
+
+    def __init__(self, command, max_memory=DEFAULT_MAX_MEMORY):
+        self.command = command
+        self.max_memory = max_memory
+        self.returncode = None
+        self.timed_out = False
+        self.interrupted = False
+        self.output_bytes = 0
+        self.line_count = 0
+        self.spill_path = None
+        self.wall_time = None
+        self.user_time = None
+        self.system_time = None
+        self.max_rss_kb = None
+        self.stdout_tail = deque(maxlen=TAIL_LINES)
+        self.stderr_tail = deque(maxlen=TAIL_LINES)
+        self._lines = []
+        self._spill = None
+
+    @classmethod
+    def from_output(cls, command, output, returncode=0):
+        """
+        Builds a finished result from already captured output (e.g. a cache hit).
+        """
+        result = cls(command)
+        for line in output.splitlines():
+            result.add_stdout(line)
+        result.returncode = returncode
+        result.close()
+        return result
+
+    @classmethod
+    def from_usage(cls, command, usage):
+        """
+        Builds a result that only carries usage() figures, e.g. reported back by a batch worker.
+        """
+        result = cls(command)
+        for name, value in usage.items():
+            setattr(result, name, value)
+        return result
+
+    def record_usage(self, wall_time, rusage=None):
+        """
+        Stores the wall time and, when the child was reaped with os.wait4, its CPU time and peak RSS.
+        On Linux these include every descendant the child waited for (the tool behind sh -c).
+        """
+        self.wall_time = wall_time
+        if rusage is not None:
+            self.user_time = rusage.ru_utime
+            self.system_time = rusage.ru_stime
+            self.max_rss_kb = rusage.ru_maxrss
+
+    def usage(self):
+        """
+        Resource figures of the run as a JSON-friendly dict.
+        """
+        return {"returncode": self.returncode, "timed_out": self.timed_out, "interrupted": self.interrupted,
+                "wall_time": self.wall_time, "user_time": self.user_time, "system_time": self.system_time,
+                "max_rss_kb": self.max_rss_kb, "output_bytes": self.output_bytes, "line_count": self.line_count}
+
+    def add_stdout(self, line):
+        """
+        Records one stdout line, spilling to a temp file once max_memory is exceeded.
+        """
+        self.output_bytes += len(line) + 1
+        self.line_count += 1
+        self.stdout_tail.append(line)
+        if self._spill is None and self.output_bytes > self.max_memory:
+            self._spill = tempfile.NamedTemporaryFile(
+                "w", prefix="scr-output-", suffix=".log", delete=False, encoding="utf-8"
+            )
+            self.spill_path = self._spill.name
+            self._spill.writelines(f"{buffered}\n" for buffered in self._lines)
+            self._lines = []
+        if self._spill is not None:
+            self._spill.write(f"{line}\n")
+        else:
+            self._lines.append(line)
+
+    def close(self):
+        """
+        Flushes and closes the spill file, if any.
+        """
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.timed_out and not self.interrupted
+
+    def iter_lines(self):
+        """
+        Yields every stdout line, reading from the spill file when output overflowed memory.
+        """
+        if self.spill_path:
+            with open(self.spill_path, encoding="utf-8", errors="replace") as spill:
+                for line in spill:
+                    yield line.rstrip("\n")
+        else:
+            yield from self._lines
+
+    def text(self):
+        """
+        Returns stdout as a string. Spilled output is summarised by its tail
+        instead of being read back into memory.
+        """
+        if self.spill_path:
+            return (f"[{self.output_bytes} bytes, {self.line_count} lines; full output saved to "
+                    f"{self.spill_path}; last {len(self.stdout_tail)} lines follow]\n"
+                    + "\n".join(self.stdout_tail)).strip()
+        return "\n".join(self._lines).strip()
+
+    def stderr_text(self):
+        return "\n".join(self.stderr_tail).strip()
+
+# End of CommandResult----------------------------------------------
+
+def reap(process, timeout=None):
+    """
+    Waits for a Popen child with os.wait4 so its resource usage is not lost, and sets
+    process.returncode. Returns the child's rusage, or None if it is still running after
+    timeout seconds (or was already reaped elsewhere).
+    """
+    if process.returncode is not None:
+        return None
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        try:
+            pid, status, rusage = os.wait4(process.pid, 0 if deadline is None else os.WNOHANG)
+        except ChildProcessError:
+            process.poll()
+            return None
+        if pid:
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return rusage
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+def kill_process_group(process):
+    """
+    Terminates the whole process group of a child started by stream_command,
+    escalating to SIGKILL if it does not exit within KILL_GRACE seconds.
+    Returns the child's rusage when it was reaped here.
+    """
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            return reap(process, KILL_GRACE)
+        rusage = reap(process, KILL_GRACE)
+        if process.returncode is not None:
+            return rusage
+    return None
+
+# Called with every finished CommandResult, e.g. to aggregate metrics
+_observers = []
+
+def add_observer(callback):
+    """
+    Registers callback(result), called after every stream_command run.
+    """
+    if callback not in _observers:
+        _observers.append(callback)
+
+def remove_observer(callback):
+    if callback in _observers:
+        _observers.remove(callback)
+
+def clear_observers():
+    del _observers[:]
+
+def notify_observers(result):
+    """
+    Hands a finished result to every observer. Observers must not break a scan,
+    so their errors are ignored.
+    """
+    for callback in list(_observers):
+        try:
+            callback(result)
+        except Exception:
+            pass
+
+def stream_command(command, timeout=None, on_line=None, on_stderr=None, max_memory=DEFAULT_MAX_MEMORY,
+                   cancel=None):
+    """
+    Executes a shell command in its own process group and reads its output as it arrives.
+    on_line/on_stderr are called with every decoded line. On timeout or Ctrl-C the whole
+    process group is killed, so no grandchildren are left behind. The child is reaped
+    with os.wait4, so the result also carries its CPU time and peak RSS.
+    Setting the optional cancel event (a threading.Event) from another thread stops the
+    command the same way, with result.interrupted set.
+    Returns a CommandResult.
+    """
+    result = CommandResult(command, max_memory=max_memory)
+    started = time.monotonic()
+    process = subprocess.Popen(
+        command, shell=True, stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True
+    )
+    deadline = time.monotonic() + timeout if timeout else None
+    rusage = None
+
+    def emit(is_stdout, raw):
+        line = raw.decode("utf-8", errors="replace").rstrip("\r")
+        if is_stdout:
+            result.add_stdout(line)
+            if on_line:
+                on_line(line)
+        else:
+            result.stderr_tail.append(line)
+            if on_stderr:
+                on_stderr(line)
+
+    selector = selectors.DefaultSelector()
+    pending = {}
+    for stream, is_stdout in ((process.stdout, True), (process.stderr, False)):
+        os.set_blocking(stream.fileno(), False)
+        selector.register(stream, selectors.EVENT_READ, is_stdout)
+        pending[is_stdout] = b""
+
+    try:
+        while selector.get_map():
+            if cancel is not None and cancel.is_set():
+                result.interrupted = True
+                break
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    result.timed_out = True
+                    break
+            if cancel is not None:
+                remaining = CANCEL_POLL if remaining is None else min(remaining, CANCEL_POLL)
+            for key, _ in selector.select(remaining):
+                is_stdout = key.data
+                chunk = os.read(key.fileobj.fileno(), 65536)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    if pending[is_stdout]:
+                        emit(is_stdout, pending[is_stdout])
+                        pending[is_stdout] = b""
+                    continue
+                *lines, pending[is_stdout] = (pending[is_stdout] + chunk).split(b"\n")
+                for raw in lines:
+                    emit(is_stdout, raw)
+                if len(pending[is_stdout]) > MAX_LINE_BYTES:
+                    emit(is_stdout, pending[is_stdout])
+                    pending[is_stdout] = b""
+
+        if not result.timed_out and not result.interrupted:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            rusage = reap(process, remaining)
+            if process.returncode is None:
+                result.timed_out = True
+    except KeyboardInterrupt:
+        result.interrupted = True
+        raise
+    finally:
+        selector.close()
+        if process.returncode is None:
+            rusage = kill_process_group(process)
+        process.stdout.close()
+        process.stderr.close()
+        result.returncode = process.returncode
+        result.record_usage(time.monotonic() - started, rusage)
+        result.close()
+        notify_observers(result)
+
+    return result
+
+# End of stream_command----------------------------------------------
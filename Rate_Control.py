@@ -0,0 +1,182 @@
+import re
+import statistics
+import threading
+import time
+
+# Placeholder replaced with the controller's current thread/rate flags in command templates
+RATE_OPTIONS_PLACEHOLDER = "{rate_options}"
+# Responses that mean the target (or something in front of it) is pushing back
+THROTTLE_STATUSES = (429, 502, 503, 504)
+ERROR_LINE_RE = re.compile(r"(?i)\b(error|timeout|timed out|connection refused|reset by peer|too many requests)\b")
+STATUS_RE = re.compile(r"\(Status: (\d{3})\)|^(\d{3})\s")
+
+class AimdController:
+    """
+    Additive-increase/multiplicative-decrease controller for brute-force stages.
+    Samples (latency, status, error) are grouped into windows. A window with too many
+    timeouts/errors/throttling responses, or with a median latency well above the best
+    seen so far, halves the concurrency; a healthy window adds one worker. Once the
+    concurrency is at its minimum and the target still struggles, a request-rate cap is
+    applied and managed the same way, and lifted again when it stops being the limit.
+    """
+
+    def __init__(self, initial=10, minimum=1, maximum=200, increase=1, decrease=0.5, rate_step=10.0,
+                 error_threshold=0.05, latency_factor=2.0, interval=1.0, min_samples=20, on_change=None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.concurrency = min(max(initial, self.minimum), self.maximum)
+        self.rate = None
+        self.increase = increase
+        self.decrease = decrease
+        self.rate_step = rate_step
+        self.error_threshold = error_threshold
+        self.latency_factor = latency_factor
+        self.interval = interval
+        self.min_samples = min_samples
+        self.on_change = on_change
+        self.live_rate = 0.0
+        self.baseline_latency = None
+        self.totals = {"requests": 0, "errors": 0, "throttled": 0, "decreases": 0, "increases": 0}
+        self._latencies = []
+        self._requests = 0
+        self._errors = 0
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, latency=None, status=None, error=False):
+        """
+        Records one request. error is a timeout or connection failure.
+        """
+        with self._lock:
+            self._requests += 1
+            if error or status in THROTTLE_STATUSES:
+                self._errors += 1
+                self.totals["throttled" if status in THROTTLE_STATUSES else "errors"] += 1
+            if latency is not None:
+                self._latencies.append(latency)
+        return self.update()
+
+    def observe(self, requests, errors=0, latency=None, elapsed=None):
+        """
+        Records a batch of requests at once, e.g. one chunk of an external tool's run,
+        and closes the window immediately. latency is the average per request.
+        """
+        with self._lock:
+            self._requests += requests
+            self._errors += errors
+            self.totals["errors"] += errors
+            if latency is not None:
+                self._latencies.append(latency)
+            if elapsed:
+                self._window_start = time.monotonic() - elapsed
+        return self.update(force=True)
+
+    def update(self, force=False):
+        """
+        Closes the current window if it is old and large enough and adjusts the limits.
+        Returns True when the concurrency or rate changed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if not self._requests or (not force and (elapsed < self.interval or self._requests < self.min_samples)):
+                return False
+            window_rate = self._requests / elapsed if elapsed > 0 else 0.0
+            self.live_rate = window_rate if not self.live_rate else 0.5 * self.live_rate + 0.5 * window_rate
+            error_ratio = self._errors / self._requests
+            latency = statistics.median(self._latencies) if self._latencies else None
+            self.totals["requests"] += self._requests
+            self._requests = self._errors = 0
+            self._latencies = []
+            self._window_start = now
+
+            congested = error_ratio > self.error_threshold
+            if latency is not None:
+                if self.baseline_latency is not None and latency > self.baseline_latency * self.latency_factor:
+                    congested = True
+                # The baseline follows the best latency seen, drifting up slowly so a
+                # permanently slower target is not treated as congested forever
+                self.baseline_latency = latency if self.baseline_latency is None else min(
+                    latency, self.baseline_latency * 1.05)
+
+            before = (self.concurrency, self.rate)
+            if congested:
+                self.totals["decreases"] += 1
+                if self.concurrency > self.minimum:
+                    self.concurrency = max(self.minimum, int(self.concurrency * self.decrease))
+                else:
+                    current = self.rate or self.live_rate or self.rate_step
+                    self.rate = max(1.0, current * self.decrease)
+            else:
+                self.totals["increases"] += 1
+                if self.rate is not None:
+                    self.rate += self.rate_step
+                    # Lift the cap once the target keeps up with more than it is allowed
+                    if self.rate > 2 * max(self.live_rate, 1.0):
+                        self.rate = None
+                elif self.concurrency < self.maximum:
+                    self.concurrency = min(self.maximum, self.concurrency + self.increase)
+            changed = (self.concurrency, self.rate) != before
+        if changed and self.on_change:
+            self.on_change(self)
+        return changed
+
+    def snapshot(self):
+        return {"concurrency": self.concurrency, "rate": round(self.rate, 1) if self.rate else None,
+                "live_rate": round(self.live_rate, 1), "baseline_latency": self.baseline_latency,
+                **self.totals}
+
+    def describe(self):
+        cap = f", capped at {self.rate:.0f}/s" if self.rate else ""
+        return f"{self.concurrency} workers, {self.live_rate:.0f} req/s{cap}"
+
+# End of AimdController----------------------------------------------
+
+def rate_options(tool, controller):
+    """
+    Turns the controller's limits into command line flags for an external tool.
+    gobuster only knows a per-thread delay, so a rate cap becomes threads / rate seconds.
+    puredns has no thread flag; its massdns backend is limited by rate only.
+    """
+    if tool == "gobuster":
+        options = f"-t {controller.concurrency}"
+        if controller.rate:
+            options += f" --delay {round(controller.concurrency * 1000 / controller.rate)}ms"
+        return options
+    if tool == "feroxbuster":
+        options = f"-t {controller.concurrency}"
+        if controller.rate:
+            options += f" --rate-limit {max(1, round(controller.rate))}"
+        return options
+    if tool == "puredns":
+        return f"--rate-limit {max(1, round(controller.rate))}" if controller.rate else ""
+    return ""
+
+def apply_rate_options(tool, command, controller):
+    return command.replace(RATE_OPTIONS_PLACEHOLDER, rate_options(tool, controller)).rstrip()
+
+def count_errors(lines):
+    """
+    Counts error lines and throttling responses in an external tool's output.
+    """
+    errors = 0
+    for line in lines:
+        match = STATUS_RE.search(line)
+        if match and int(match.group(1) or match.group(2)) in THROTTLE_STATUSES:
+            errors += 1
+        elif ERROR_LINE_RE.search(line):
+            errors += 1
+    return errors
+
+def observe_tool_run(controller, requests, result, elapsed):
+    """
+    Feeds one finished external tool run (a wordlist chunk) into the controller.
+    The per-request latency is estimated from the run time and the worker count.
+    """
+    if result.timed_out:
+        return controller.observe(requests, errors=requests, elapsed=elapsed)
+    errors = count_errors(result.iter_lines()) + count_errors(result.stderr_tail)
+    latency = elapsed * controller.concurrency / requests if requests else None
+    return controller.observe(requests, errors=min(errors, requests), latency=latency, elapsed=elapsed)
+
+# End of rate helpers----------------------------------------------
@@ -0,0 +1,246 @@
+import re
+import time
+
+from Http_Executor import DEFAULT_POOL_SIZE, HttpExecutor
+from Request_Replay import run_bounded
+
+DEFAULT_FUZZ_WORKERS = 40
+# Statuses shown by default, as in ffuf
+DEFAULT_MATCH_STATUS = "200-299,301,302,307,401,403,405,500"
+# FUZZ, then FUZ2Z, FUZ3Z, ... for further independent positions
+KEYWORD_PATTERN = re.compile(r"FUZ(?:\d+)?Z")
+FUZZ_MODES = ("clusterbomb", "pitchfork")
+
+def find_keywords(request):
+    """
+    Returns the fuzz keywords used anywhere in a request model (method, URL, headers,
+    data, flags): FUZZ first, then FUZ2Z, FUZ3Z, ... by number.
+    """
+    texts = [request["method"], request["url"], *request["headers"], request["data"], *request["flags"]]
+    keywords = []
+    for text in texts:
+        for keyword in KEYWORD_PATTERN.findall(text or ""):
+            if keyword not in keywords:
+                keywords.append(keyword)
+    return sorted(keywords, key=lambda keyword: int(keyword[3:-1] or 1))
+
+def render(request, values):
+    """
+    Returns a copy of the request model with every keyword replaced by its value from
+    the values dict. One pass per string, so values that contain a keyword stay as they are.
+    """
+    def substitute(text):
+        if not text:
+            return text
+        return KEYWORD_PATTERN.sub(lambda match: values.get(match.group(0), match.group(0)), text)
+
+    return dict(
+        request,
+        method=substitute(request["method"]),
+        url=substitute(request["url"]),
+        headers=[substitute(header) for header in request["headers"]],
+        data=substitute(request["data"]),
+        flags=[substitute(flag) for flag in request["flags"]],
+    )
+
+def iter_wordlist(path):
+    """
+    Yields the words of a wordlist one line at a time, skipping blank lines and # comments.
+    """
+    with open(path, errors="replace") as wordlist:
+        for line in wordlist:
+            word = line.rstrip("\r\n")
+            if word and not word.startswith("#"):
+                yield word
+
+def count_words(path):
+    return sum(1 for _ in iter_wordlist(path))
+
+def iter_payloads(keywords, wordlists, mode="clusterbomb"):
+    """
+    Lazily yields {keyword: word} dicts. clusterbomb tries every combination (the
+    first keyword's list is the outer loop; inner lists are re-read from disk for each
+    outer word rather than kept in memory); pitchfork walks all lists in step and stops
+    at the shortest.
+    """
+    if mode == "pitchfork":
+        for words in zip(*(iter_wordlist(wordlists[keyword]) for keyword in keywords)):
+            yield dict(zip(keywords, words))
+        return
+
+    def combinations(index, chosen):
+        if index == len(keywords):
+            yield dict(chosen)
+            return
+        for word in iter_wordlist(wordlists[keywords[index]]):
+            chosen[keywords[index]] = word
+            yield from combinations(index + 1, chosen)
+
+    yield from combinations(0, {})
+
+def count_payloads(keywords, wordlists, mode="clusterbomb"):
+    counts = [count_words(wordlists[keyword]) for keyword in keywords]
+    if mode == "pitchfork":
+        return min(counts, default=0)
+    total = 1
+    for count in counts:
+        total *= count
+    return total
+
+def parse_numbers(text):
+    """
+    Parses "200,301-399" style lists into a matcher: a list of (low, high) ranges.
+    An empty string gives an empty list.
+    """
+    ranges = []
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        ranges.append((int(low), int(high or low)))
+    return ranges
+
+def _matches(value, ranges):
+    return any(low <= value <= high for low, high in ranges)
+
+class ResponseFilter:
+    """
+    Decides which responses are shown. A response is shown when its status is in
+    match_status (all statuses if empty) and neither its status, size, word count
+    nor line count is in the corresponding filter_* lists. Lists use parse_numbers syntax.
+    """
+
+    def __init__(self, match_status=DEFAULT_MATCH_STATUS, filter_status="", filter_size="", filter_words="",
+                 filter_lines=""):
+        self.match_status = parse_numbers(match_status)
+        self.filter_status = parse_numbers(filter_status)
+        self.filter_size = parse_numbers(filter_size)
+        self.filter_words = parse_numbers(filter_words)
+        self.filter_lines = parse_numbers(filter_lines)
+
+    def shows(self, hit):
+        if not hit.result.ok:
+            return False
+        if self.match_status and not _matches(hit.result.status, self.match_status):
+            return False
+        return not (_matches(hit.result.status, self.filter_status) or _matches(hit.result.size, self.filter_size)
+                    or _matches(hit.words, self.filter_words) or _matches(hit.lines, self.filter_lines))
+
+# End of ResponseFilter----------------------------------------------
+
+class BodyCounter:
+    """
+    Counts the words and lines of a response body chunk by chunk, so the counts cover
+    the whole body without keeping it in memory.
+    """
+    __slots__ = ("words", "newlines", "size", "_in_word")
+
+    def __init__(self):
+        self.words = 0
+        self.newlines = 0
+        self.size = 0
+        self._in_word = False
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self.words += len(chunk.split())
+        # A word cut in two by the chunk boundary was counted twice
+        if self._in_word and not chunk[:1].isspace():
+            self.words -= 1
+        self._in_word = not chunk[-1:].isspace()
+        self.newlines += chunk.count(b"\n")
+        self.size += len(chunk)
+
+    @property
+    def lines(self):
+        return self.newlines + 1 if self.size else 0
+
+# End of BodyCounter----------------------------------------------
+
+class FuzzHit:
+    __slots__ = ("values", "result", "words", "lines")
+
+    def __init__(self, values, result, counter):
+        self.values = values
+        self.result = result
+        self.words = counter.words
+        self.lines = counter.lines
+
+    def describe(self):
+        values = ", ".join(f"{keyword}={value}" for keyword, value in self.values.items())
+        if not self.result.ok:
+            return f"{values}  error: {self.result.error}"
+        return (f"{values}  [Status: {self.result.status}, Size: {self.result.size}, Words: {self.words}, "
+                f"Lines: {self.lines}, {self.result.elapsed * 1000:.0f} ms]")
+
+# End of FuzzHit----------------------------------------------
+
+class FuzzStats:
+    __slots__ = ("total", "sent", "shown", "errors", "started")
+
+    def __init__(self, total):
+        self.total = total
+        self.sent = 0
+        self.shown = 0
+        self.errors = 0
+        self.started = time.monotonic()
+
+    def describe(self):
+        elapsed = time.monotonic() - self.started
+        rate = self.sent / elapsed if elapsed else 0.0
+        return f"{self.sent}/{self.total} requests, {self.shown} shown, {self.errors} errors, {rate:.0f} requests/s"
+
+# End of FuzzStats----------------------------------------------
+
+def fuzz(request, wordlists, mode="clusterbomb", response_filter=None, workers=DEFAULT_FUZZ_WORKERS,
+         executor=None, on_hit=None, on_progress=None, progress_interval=5.0, cancel=None):
+    """
+    Sends the request once per payload: every keyword of find_keywords(request) is
+    replaced with words from wordlists ({keyword: path}), combined per mode. Requests
+    are expanded lazily and sent with at most workers in flight on one pooled
+    HttpExecutor. on_hit(FuzzHit) is called for every response the filter shows,
+    on_progress(FuzzStats) every progress_interval seconds. Returns the FuzzStats.
+    """
+    keywords = find_keywords(request)
+    missing = [keyword for keyword in keywords if keyword not in wordlists]
+    if not keywords:
+        raise ValueError("The request has no FUZZ keyword")
+    if missing:
+        raise ValueError(f"No wordlist for {', '.join(missing)}")
+    if mode not in FUZZ_MODES:
+        raise ValueError(f"Unknown mode {mode!r}; use one of {', '.join(FUZZ_MODES)}")
+    response_filter = response_filter or ResponseFilter()
+    workers = max(1, workers)
+    own_executor = executor is None
+    if own_executor:
+        executor = HttpExecutor(pool_size=max(workers, DEFAULT_POOL_SIZE))
+    stats = FuzzStats(count_payloads(keywords, wordlists, mode))
+    last_progress = [time.monotonic()]
+
+    def send(values):
+        # Words and lines are counted while streaming; the body itself is not kept
+        counter = BodyCounter()
+        result = executor.execute(render(request, values), keep_body=0, output_file="", on_chunk=counter.feed)
+        return FuzzHit(values, result, counter)
+
+    def collect(hit):
+        stats.sent += 1
+        if not hit.result.ok:
+            stats.errors += 1
+        elif response_filter.shows(hit):
+            stats.shown += 1
+            if on_hit:
+                on_hit(hit)
+        if on_progress and time.monotonic() - last_progress[0] >= progress_interval:
+            last_progress[0] = time.monotonic()
+            on_progress(stats)
+
+    try:
+        run_bounded(iter_payloads(keywords, wordlists, mode), send, workers, collect, cancel)
+    finally:
+        if own_executor:
+            executor.close()
+    return stats
+
+# End of fuzz----------------------------------------------
@@ -0,0 +1,192 @@
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from Http_Executor import DEFAULT_POOL_SIZE, HttpExecutor
+
+DEFAULT_SPEC_FILE = "requests.jsonl"
+DEFAULT_REPLAY_WORKERS = 10
+# Fields of the request model (see Curl_Builder.new_request) with their defaults
+REQUEST_FIELDS = {"url": "", "method": "", "headers": [], "data": "", "flags": [], "output_file": ""}
+
+def spec_to_request(spec):
+    """
+    Builds a request model from a saved spec, filling in missing fields. A spec is the
+    request model plus an optional "name" and an optional expected status ("expect").
+    """
+    if not isinstance(spec, dict) or not spec.get("url"):
+        raise ValueError(f"Request spec without a url: {spec!r}")
+    request = {}
+    for field, default in REQUEST_FIELDS.items():
+        value = spec.get(field, default)
+        request[field] = list(value) if isinstance(default, list) else value
+    return request
+
+def save_spec(request, path=DEFAULT_SPEC_FILE, name="", expect=None):
+    """
+    Appends a request model to a spec file as one JSON line.
+    """
+    spec = {field: request[field] for field in REQUEST_FIELDS}
+    if name:
+        spec["name"] = name
+    if expect is not None:
+        spec["expect"] = expect
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as spec_file:
+        spec_file.write(json.dumps(spec) + "\n")
+
+def load_specs(path):
+    """
+    Reads specs from a JSON lines file (one spec per line) or a JSON array.
+    Blank lines and lines starting with # are skipped. Raises ValueError on a bad spec.
+    """
+    with open(path) as spec_file:
+        text = spec_file.read()
+    if text.lstrip().startswith("["):
+        specs = json.loads(text)
+    else:
+        specs = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                specs.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: {e}")
+    for spec in specs:
+        spec_to_request(spec)
+    return specs
+
+def percentile(ordered, fraction):
+    """
+    Nearest-rank percentile of an already sorted list; None when it is empty.
+    """
+    if not ordered:
+        return None
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+class ReplayOutcome:
+    __slots__ = ("index", "name", "expect", "result")
+
+    def __init__(self, index, name, expect, result):
+        self.index = index
+        self.name = name
+        self.expect = expect
+        self.result = result
+
+    @property
+    def passed(self):
+        if not self.result.ok:
+            return False
+        if self.expect is not None:
+            return self.result.status == self.expect
+        return self.result.status < 400
+
+    def describe(self):
+        label = self.name or f"{self.result.method} {self.result.url}"
+        if not self.result.ok:
+            return f"#{self.index + 1} FAIL {label}: {self.result.error}"
+        expected = f" (expected {self.expect})" if self.expect is not None and not self.passed else ""
+        return (f"#{self.index + 1} {'ok  ' if self.passed else 'FAIL'} {self.result.status}{expected} {label}"
+                f"  {self.result.elapsed * 1000:.1f} ms  {self.result.size} bytes")
+
+# End of ReplayOutcome----------------------------------------------
+
+class ReplaySummary:
+    def __init__(self, outcomes, elapsed):
+        self.outcomes = sorted(outcomes, key=lambda outcome: outcome.index)
+        self.elapsed = elapsed
+        self.latencies = sorted(outcome.result.elapsed for outcome in self.outcomes)
+        self.passed = sum(1 for outcome in self.outcomes if outcome.passed)
+        self.errors = sum(1 for outcome in self.outcomes if not outcome.result.ok)
+
+    def percentiles(self):
+        """
+        Returns {"p50": seconds, "p95": seconds, "p99": seconds}.
+        """
+        return {name: percentile(self.latencies, fraction)
+                for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))}
+
+    def describe(self):
+        total = len(self.outcomes)
+        rate = total / self.elapsed if self.elapsed else 0.0
+        latency = ", ".join(f"{name} {value * 1000:.1f} ms" for name, value in self.percentiles().items()
+                            if value is not None)
+        return (f"{total} requests in {self.elapsed:.2f}s ({rate:.0f}/s): {self.passed} passed, "
+                f"{total - self.passed - self.errors} failed, {self.errors} errors. {latency}")
+
+# End of ReplaySummary----------------------------------------------
+
+_END = object()
+
+def run_bounded(items, send, workers, on_result=None, cancel=None):
+    """
+    Calls send(item) for every item on a pool of workers threads, with at most workers
+    calls in flight. Items are taken from the iterable lazily as workers free up, so a
+    generator of millions of items is never held in memory. on_result is called with
+    each return value, in completion order, from the calling thread; setting the
+    cancel event stops taking new items, and an exception (e.g. Ctrl-C) sets it too.
+    Returns the number of items sent.
+    """
+    items = iter(items)
+    in_flight = set()
+    sent = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scr-http") as pool:
+        try:
+            while True:
+                while len(in_flight) < workers and not (cancel is not None and cancel.is_set()):
+                    item = next(items, _END)
+                    if item is _END:
+                        break
+                    in_flight.add(pool.submit(send, item))
+                    sent += 1
+                if not in_flight:
+                    return sent
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if on_result:
+                        on_result(result)
+        except BaseException:
+            # Ctrl-C: tell the calls still running to stop before the pool waits for them
+            if cancel is not None:
+                cancel.set()
+            raise
+
+def replay(specs, workers=DEFAULT_REPLAY_WORKERS, executor=None, on_outcome=None, cancel=None):
+    """
+    Sends every spec with at most workers requests in flight, all on one pooled
+    HttpExecutor (a new one sized to workers unless given). Specs are consumed lazily
+    as workers free up. on_outcome(ReplayOutcome) is called as each request completes;
+    setting the cancel event stops sending new ones. Returns a ReplaySummary.
+    """
+    workers = max(1, workers)
+    own_executor = executor is None
+    if own_executor:
+        executor = HttpExecutor(pool_size=max(workers, DEFAULT_POOL_SIZE))
+    outcomes = []
+    started = time.perf_counter()
+
+    def send(item):
+        index, spec = item
+        result = executor.execute(spec_to_request(spec), keep_body=0)
+        return ReplayOutcome(index, spec.get("name", ""), spec.get("expect"), result)
+
+    def collect(outcome):
+        outcomes.append(outcome)
+        if on_outcome:
+            on_outcome(outcome)
+
+    try:
+        run_bounded(enumerate(specs), send, workers, collect, cancel)
+    finally:
+        if own_executor:
+            executor.close()
+    return ReplaySummary(outcomes, time.perf_counter() - started)
+
+# End of replay----------------------------------------------
@@ -0,0 +1,250 @@
+import asyncio
+import ipaddress
+import json
+import os
+import re
+import statistics
+import time
+
+from Dns_Client import DnsClient
+from Result_Cache import CACHE_DIR
+from Wildcard_Dns import random_label
+
+SCORE_FILE = os.path.join(CACHE_DIR, "resolver_scores.json")
+# Where pruned resolver lists are written
+PRUNED_DIR = os.path.join(CACHE_DIR, "resolvers")
+# Benchmark results are reused for this long before a resolver is measured again
+SCORE_TTL = 6 * 60 * 60
+# Names whose addresses are fixed and well known; any other answer means the resolver lies
+KNOWN_ANSWERS = {
+    "one.one.one.one": {"1.1.1.1", "1.0.0.1"},
+    "dns.google": {"8.8.8.8", "8.8.4.4"},
+}
+# Parent of the random names that must come back NXDOMAIN
+NXDOMAIN_PROBE_DOMAIN = "example.com"
+# Fraction of benchmark queries a resolver has to answer to be kept
+MIN_SUCCESS_RATIO = 0.8
+HOSTNAME = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?)*\.?$")
+
+def read_resolvers(path, on_invalid=None):
+    """
+    Reads one resolver per line ("1.2.3.4" or "1.2.3.4:5353"), skipping blanks,
+    comments and duplicates. Lines that split_address rejects are skipped too, after
+    calling on_invalid(line number, line, error). Returns a list of addresses in file order.
+    """
+    resolvers = {}
+    with open(path) as resolver_file:
+        for number, line in enumerate(resolver_file, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                split_address(line)
+            except ValueError as e:
+                if on_invalid:
+                    on_invalid(number, line, e)
+                continue
+            resolvers[line] = None
+    return list(resolvers)
+
+def split_address(resolver):
+    """
+    Splits "host:port" into (host, port); IPv6 addresses need brackets for a port.
+    Raises ValueError unless host is an IP address or hostname and port is 1-65535.
+    """
+    if resolver.startswith("["):
+        host, _, port = resolver[1:].partition("]")
+        port = port[1:] if port.startswith(":") else port or "53"
+    elif resolver.count(":") == 1:
+        host, port = resolver.split(":")
+    else:
+        host, port = resolver, "53"
+    if not (port.isdigit() and 0 < int(port) < 65536):
+        raise ValueError(f"Invalid port in resolver {resolver!r}")
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        if ":" in host or not HOSTNAME.match(host):
+            raise ValueError(f"Invalid resolver address {resolver!r}")
+    return host, int(port)
+
+class ResolverScore:
+    """
+    Benchmark result for one resolver: how many queries it answered, how many
+    known-answer checks it got wrong, whether it rewrote NXDOMAIN, and its median latency.
+    """
+    __slots__ = ("resolver", "queries", "answered", "wrong", "hijacked", "latency_ms", "checked_at")
+
+    def __init__(self, resolver, queries=0, answered=0, wrong=0, hijacked=False, latency_ms=None, checked_at=None):
+        self.resolver = resolver
+        self.queries = queries
+        self.answered = answered
+        self.wrong = wrong
+        self.hijacked = hijacked
+        self.latency_ms = latency_ms
+        self.checked_at = checked_at
+
+    @property
+    def success_ratio(self):
+        return self.answered / self.queries if self.queries else 0.0
+
+    @property
+    def healthy(self):
+        return self.success_ratio >= MIN_SUCCESS_RATIO and not self.wrong and not self.hijacked
+
+    def sort_key(self):
+        return (not self.healthy, self.latency_ms if self.latency_ms is not None else float("inf"), -self.success_ratio)
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def describe(self):
+        if self.hijacked:
+            verdict = "hijacks NXDOMAIN"
+        elif self.wrong:
+            verdict = f"{self.wrong} wrong answers"
+        elif not self.healthy:
+            verdict = "unreliable"
+        else:
+            verdict = "ok"
+        latency = f"{self.latency_ms:.1f} ms" if self.latency_ms is not None else "no answer"
+        return f"{self.resolver:<22} {latency:>10}  {self.answered}/{self.queries} answered  {verdict}"
+
+# End of ResolverScore----------------------------------------------
+
+class ResolverScoreCache:
+    """
+    Resolver scores kept in a JSON file and reused until they are ttl seconds old.
+    """
+
+    def __init__(self, path=SCORE_FILE, ttl=SCORE_TTL):
+        self.path = path
+        self.ttl = ttl
+        try:
+            with open(path) as score_file:
+                self.scores = json.load(score_file)
+        except (OSError, ValueError):
+            self.scores = {}
+
+    def get(self, resolver):
+        entry = self.scores.get(resolver)
+        if entry and time.time() - entry.get("checked_at", 0) < self.ttl:
+            return ResolverScore(**entry)
+        return None
+
+    def put(self, score):
+        self.scores[score.resolver] = score.as_dict()
+
+    def save(self):
+        now = time.time()
+        self.scores = {resolver: entry for resolver, entry in self.scores.items()
+                       if now - entry.get("checked_at", 0) < self.ttl}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as score_file:
+            json.dump(self.scores, score_file)
+        os.replace(temp_path, self.path)
+
+# End of ResolverScoreCache----------------------------------------------
+
+async def _timed_query(client, name, rtype="A"):
+    started = time.monotonic()
+    result = await client.query(name, rtype)
+    return result, (time.monotonic() - started) * 1000
+
+async def benchmark_resolver(resolver, rounds=3, timeout=2.0):
+    """
+    Measures one resolver: rounds x every KNOWN_ANSWERS name, plus one random
+    name under NXDOMAIN_PROBE_DOMAIN per round. Queries are not retried, so
+    packet loss shows up in the success ratio. A resolver that answers nothing in
+    the first round is not tried again.
+    """
+    host, port = split_address(resolver)
+    score = ResolverScore(resolver, checked_at=time.time())
+    latencies = []
+    try:
+        async with DnsClient(host, port, timeout=timeout, retries=0, concurrency=len(KNOWN_ANSWERS) + 1) as client:
+            for _ in range(rounds):
+                queries = [_timed_query(client, name) for name in KNOWN_ANSWERS]
+                queries.append(_timed_query(client, f"{random_label()}.{NXDOMAIN_PROBE_DOMAIN}"))
+                *checks, (probe, probe_latency) = await asyncio.gather(*queries)
+                for (result, latency), expected in zip(checks, KNOWN_ANSWERS.values()):
+                    score.queries += 1
+                    if not result.ok:
+                        continue
+                    score.answered += 1
+                    latencies.append(latency)
+                    addresses = {record.value for record in result.records if record.rtype == "A"}
+                    if not addresses or not addresses <= expected:
+                        score.wrong += 1
+                score.queries += 1
+                if probe.error is None:
+                    score.answered += 1
+                    latencies.append(probe_latency)
+                    if probe.rcode != "NXDOMAIN" and probe.records:
+                        score.hijacked = True
+                if not score.answered:
+                    # Dead resolvers are not worth waiting out every round for
+                    break
+    except OSError:
+        pass
+    if latencies:
+        score.latency_ms = round(statistics.median(latencies), 2)
+    return score
+
+async def benchmark_resolvers_async(resolvers, rounds=3, timeout=2.0, concurrency=100, on_score=None):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(resolver):
+        async with semaphore:
+            score = await benchmark_resolver(resolver, rounds, timeout)
+        if on_score:
+            on_score(score)
+        return score
+
+    return await asyncio.gather(*(run(resolver) for resolver in resolvers))
+
+def benchmark_resolvers(resolvers, rounds=3, timeout=2.0, concurrency=100, cache=None, on_score=None):
+    """
+    Benchmarks resolvers concurrently and returns every ResolverScore, best first:
+    healthy resolvers ordered by median latency, then the rest. Scores still fresh
+    in the cache are reused instead of measured again.
+    """
+    cache = cache if cache is not None else ResolverScoreCache()
+    scores, pending = [], []
+    for resolver in resolvers:
+        score = cache.get(resolver)
+        if score:
+            scores.append(score)
+        else:
+            pending.append(resolver)
+    if pending:
+        fresh = asyncio.run(benchmark_resolvers_async(pending, rounds, timeout, concurrency, on_score))
+        for score in fresh:
+            cache.put(score)
+        scores.extend(fresh)
+        try:
+            cache.save()
+        except OSError:
+            pass
+    return sorted(scores, key=ResolverScore.sort_key)
+
+def pruned_path(path):
+    """
+    Location of the pruned copy of a resolver list.
+    """
+    name, extension = os.path.splitext(os.path.basename(path))
+    return os.path.join(PRUNED_DIR, f"{name}.pruned{extension or '.txt'}")
+
+def write_resolvers(path, scores, limit=None):
+    """
+    Writes the healthy resolvers, fastest first, one per line. Returns how many were written.
+    """
+    healthy = [score.resolver for score in scores if score.healthy][:limit]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as resolver_file:
+        for resolver in healthy:
+            resolver_file.write(resolver + "\n")
+    return len(healthy)
+
+# End of benchmark_resolvers----------------------------------------------
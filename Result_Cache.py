@@ -0,0 +1,189 @@
+import hashlib
+import os
+import shlex
+import sqlite3
+import threading
+import time
+
+# Location of the on-disk cache; override with SCR_CACHE_DIR
+CACHE_DIR = os.environ.get("SCR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "scr"))
+CACHE_FILE = os.path.join(CACHE_DIR, "results.sqlite")
+
+# Seconds a cached result stays valid, per tool
+TOOL_TTLS = {
+    "dig": 300,
+    "nslookup": 300,
+    "host": 300,
+    "dnsenum": 3600,
+    "fierce": 3600,
+    "dnsrecon": 3600,
+    "theHarvester": 86400,
+    "amass": 86400,
+    "assetfinder": 86400,
+    "puredns": 3600,
+    "gobuster": 3600,
+    "feroxbuster": 3600,
+}
+DEFAULT_TTL = 600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def normalize_arguments(command):
+    """
+    Splits a shell command into (tool, normalized argument string).
+    Quoting and whitespace differences do not produce different keys.
+    """
+    try:
+        parts = shlex.split(command)
+    except ValueError:
+        parts = command.split()
+    if not parts:
+        return "", ""
+    return os.path.basename(parts[0]), " ".join(shlex.quote(part) for part in parts[1:])
+
+# Options with which tools write their own output file (-o file, --output file, nmap's -oN/-oX/-oA ...)
+OUTPUT_FILE_OPTIONS = ("-o", "--output", "-oN", "-oX", "-oG", "-oA", "-oJ")
+
+def writes_output_file(command):
+    """
+    Whether the command writes its results to a file of its own. Replaying such a
+    command from the cache would skip writing that file, so it is never cached.
+    """
+    try:
+        parts = shlex.split(command)
+    except ValueError:
+        parts = command.split()
+    return any(part in OUTPUT_FILE_OPTIONS or part.startswith("--output=") for part in parts[1:])
+
+def cached_result(cache, target, command, mode="use"):
+    """
+    Looks a command up in cache under the shared caching policy: only in mode "use"
+    (not "refresh" or "off"), only with a target, and never for commands that write
+    their own output file. Returns (output, stored_at) or None; cache errors propagate.
+    """
+    if not target or mode != "use" or writes_output_file(command):
+        return None
+    return cache.get(target, command)
+
+def store_result(cache, target, command, result, mode="use"):
+    """
+    Stores a finished CommandResult under the shared caching policy: unless mode is
+    "off", and only successful, fully in-memory results of commands that do not write
+    their own output file. Returns True when stored; cache errors propagate.
+    """
+    if not target or mode == "off" or not result.ok or result.spill_path or writes_output_file(command):
+        return False
+    cache.put(target, command, result.text())
+    return True
+
+class ResultCache:
+    """
+    SQLite-backed cache of tool output keyed by tool, target and normalized arguments.
+    Entries expire after the tool's TTL; the least recently used entries are evicted
+    once the stored output exceeds max_bytes.
+    """
+
+    def __init__(self, path=CACHE_FILE, max_bytes=DEFAULT_MAX_BYTES, ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(TOOL_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connection(self):
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, tool TEXT, target TEXT, arguments TEXT,"
+                " output TEXT, size INTEGER, stored_at REAL, accessed_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+        return self._db
+
+    @staticmethod
+    def make_key(tool, target, arguments):
+        return hashlib.sha256(f"{tool}\0{target}\0{arguments}".encode()).hexdigest()
+
+    def ttl_for(self, tool):
+        return self.ttls.get(tool, DEFAULT_TTL)
+
+    def get(self, target, command):
+        """
+        Returns (output, stored_at) for a fresh entry, or None.
+        """
+        tool, arguments = normalize_arguments(command)
+        key = self.make_key(tool, target, arguments)
+        now = time.time()
+        with self._lock:
+            db = self._connection()
+            row = db.execute("SELECT output, stored_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_for(tool):
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                db.commit()
+                return None
+            db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+            return row[0], row[1]
+
+    def put(self, target, command, output):
+        """
+        Stores output for the command, then evicts old entries if the cache is over size.
+        """
+        tool, arguments = normalize_arguments(command)
+        key = self.make_key(tool, target, arguments)
+        now = time.time()
+        size = len(output.encode("utf-8", errors="replace"))
+        with self._lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, tool, target, arguments, output, size, now, now),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall():
+            db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def invalidate(self, tool=None, target=None):
+        """
+        Removes entries matching tool and/or target (all entries if neither is given).
+        Returns the number of removed entries.
+        """
+        clauses, params = [], []
+        if tool:
+            clauses.append("tool = ?")
+            params.append(tool)
+        if target:
+            clauses.append("target = ?")
+            params.append(target)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            db = self._connection()
+            removed = db.execute(f"DELETE FROM results{where}", params).rowcount
+            db.commit()
+        return removed
+
+    def stats(self):
+        """
+        Returns (entry count, total stored bytes).
+        """
+        with self._lock:
+            return tuple(self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone())
+
+# End of ResultCache----------------------------------------------
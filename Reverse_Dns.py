@@ -0,0 +1,141 @@
+import asyncio
+import ipaddress
+import time
+
+from Dns_Client import DnsClient, reverse_name
+from Findings import Finding, normalize_host
+
+# PTR queries kept in flight at once
+DEFAULT_WINDOW = 500
+# Sweeps with more addresses than this (a /12) ask for confirmation first
+MAX_ADDRESSES = 1 << 20
+
+def parse_range(spec):
+    """
+    Parses one range into (first, last) ipaddress objects. Accepts a CIDR ("10.0.0.0/16"),
+    a start-end range ("10.0.0.1-10.0.3.255"), a last-octet shorthand ("10.0.0.1-50")
+    or a single address. Network and broadcast addresses of IPv4 networks larger than
+    a /31 are left out, like ipaddress's hosts().
+    """
+    spec = spec.strip()
+    if "/" in spec:
+        network = ipaddress.ip_network(spec, strict=False)
+        first, last = network.network_address, network.broadcast_address
+        if network.version == 4 and network.prefixlen < 31:
+            first, last = first + 1, last - 1
+        return first, last
+    if "-" in spec:
+        start, end = (part.strip() for part in spec.split("-", 1))
+        first = ipaddress.ip_address(start)
+        if end.isdigit() and first.version == 4:
+            end = start.rsplit(".", 1)[0] + "." + end
+        last = ipaddress.ip_address(end)
+        if last.version != first.version or last < first:
+            raise ValueError(f"Invalid range: {spec}")
+        return first, last
+    address = ipaddress.ip_address(spec)
+    return address, address
+
+def parse_ranges(text):
+    """
+    Parses comma or whitespace separated ranges (see parse_range). Returns a list of (first, last).
+    """
+    return [parse_range(spec) for spec in text.replace(",", " ").split()]
+
+def count_addresses(ranges):
+    return sum(int(last) - int(first) + 1 for first, last in ranges)
+
+def iter_addresses(ranges):
+    """
+    Yields every address of the ranges in order, one at a time, so even a /8 is never held in memory.
+    """
+    for first, last in ranges:
+        start = int(first)
+        for offset in range(int(last) - start + 1):
+            yield first + offset
+
+class SweepStats:
+    __slots__ = ("total", "queried", "found", "names", "errors", "started")
+
+    def __init__(self, total):
+        self.total = total
+        self.queried = 0
+        self.found = 0
+        self.names = 0
+        self.errors = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def describe(self):
+        rate = self.queried / self.elapsed if self.elapsed else 0.0
+        return (f"{self.queried}/{self.total} addresses queried, {self.found} with PTR records, "
+                f"{self.errors} errors, {rate:.0f} queries/s")
+
+# End of SweepStats----------------------------------------------
+
+async def sweep_async(ranges, client, window=DEFAULT_WINDOW, on_result=None, on_progress=None,
+                      progress_interval=5.0, cancel=None):
+    """
+    Sends PTR queries for every address in ranges with at most window queries in flight.
+    Addresses are taken from the ranges lazily, as slots free up. on_result(ip, hostnames)
+    is called for every address with a PTR answer; on_progress(stats) every
+    progress_interval seconds. Setting the cancel event (a threading.Event) stops
+    feeding new queries. Returns the SweepStats.
+    """
+    stats = SweepStats(count_addresses(ranges))
+    addresses = iter_addresses(ranges)
+    in_flight = {}
+    last_progress = time.monotonic()
+
+    async def lookup(ip):
+        return ip, await client.query(reverse_name(ip), "PTR")
+
+    while True:
+        while len(in_flight) < window and not (cancel is not None and cancel.is_set()):
+            ip = next(addresses, None)
+            if ip is None:
+                break
+            task = asyncio.ensure_future(lookup(ip))
+            in_flight[task] = ip
+        if not in_flight:
+            break
+        done, _ = await asyncio.wait(in_flight, timeout=progress_interval, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            del in_flight[task]
+            ip, result = task.result()
+            stats.queried += 1
+            if result.error is not None:
+                stats.errors += 1
+                continue
+            hostnames = [normalize_host(record.value) for record in result.records if record.rtype == "PTR"]
+            if hostnames:
+                stats.found += 1
+                stats.names += len(hostnames)
+                if on_result:
+                    on_result(ip, hostnames)
+        if on_progress and time.monotonic() - last_progress >= progress_interval:
+            last_progress = time.monotonic()
+            on_progress(stats)
+    return stats
+
+def reverse_sweep(ranges, server=None, port=53, window=DEFAULT_WINDOW, timeout=2.0, retries=1,
+                  on_result=None, on_progress=None, cancel=None):
+    """
+    Blocking wrapper around sweep_async with its own DnsClient sized to the window.
+    ranges is a list of (first, last) from parse_ranges. Returns the SweepStats.
+    """
+    async def run():
+        async with DnsClient(server, port, timeout=timeout, retries=retries, concurrency=window) as client:
+            return await sweep_async(ranges, client, window, on_result, on_progress, cancel=cancel)
+    return asyncio.run(run())
+
+def ptr_findings(ip, hostnames, source="reverse-sweep"):
+    """
+    Turns one PTR answer into Findings keyed by hostname, with the address it points back from.
+    """
+    return [Finding(hostname, "PTR", ip=str(ip), source=source) for hostname in hostnames]
+
+# End of reverse_sweep----------------------------------------------
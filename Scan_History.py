@@ -0,0 +1,233 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from Result_Cache import CACHE_DIR
+
+HISTORY_FILE = os.path.join(CACHE_DIR, "history.sqlite")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    " id INTEGER PRIMARY KEY, target TEXT, tool TEXT, command TEXT,"
+    " started_at REAL, finished_at REAL, returncode INTEGER, findings INTEGER, new_findings INTEGER)",
+    "CREATE INDEX IF NOT EXISTS runs_target_tool ON runs (target, tool, id)",
+    # One row per distinct observation; repeated sightings only move last_seen/last_run
+    "CREATE TABLE IF NOT EXISTS findings ("
+    " id INTEGER PRIMARY KEY, target TEXT NOT NULL, tool TEXT NOT NULL, host TEXT NOT NULL,"
+    " path TEXT NOT NULL DEFAULT '', kind TEXT NOT NULL DEFAULT '', ip TEXT NOT NULL DEFAULT '',"
+    " value TEXT NOT NULL DEFAULT '', status INTEGER, size INTEGER,"
+    " first_seen REAL, last_seen REAL, first_run INTEGER, last_run INTEGER,"
+    " UNIQUE (target, tool, host, path, kind, ip, value))",
+    "CREATE INDEX IF NOT EXISTS findings_first_run ON findings (first_run)",
+    "CREATE INDEX IF NOT EXISTS findings_last_run ON findings (last_run)",
+    "CREATE INDEX IF NOT EXISTS findings_target_seen ON findings (target, first_seen)",
+)
+# Full-text index over the columns that never change after a row is inserted
+FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS findings_fts USING fts5("
+    " host, path, value, ip, tool, target, content='findings', content_rowid='id',"
+    " tokenize=\"unicode61 tokenchars '-_'\")",
+    "CREATE TRIGGER IF NOT EXISTS findings_fts_insert AFTER INSERT ON findings BEGIN"
+    " INSERT INTO findings_fts (rowid, host, path, value, ip, tool, target)"
+    " VALUES (new.id, new.host, new.path, new.value, new.ip, new.tool, new.target); END",
+    "CREATE TRIGGER IF NOT EXISTS findings_fts_delete AFTER DELETE ON findings BEGIN"
+    " INSERT INTO findings_fts (findings_fts, rowid, host, path, value, ip, tool, target)"
+    " VALUES ('delete', old.id, old.host, old.path, old.value, old.ip, old.tool, old.target); END",
+)
+FINDING_COLUMNS = "target, tool, host, path, kind, ip, value, status, size, first_seen, last_seen, first_run, last_run"
+
+def _observations(findings):
+    """
+    Flattens Findings (or IndexedFindings from a FindingsIndex) into
+    (host, path, kind, ip, value, status, size) rows.
+    """
+    for finding in findings:
+        if hasattr(finding, "records"):
+            rows = [("", ip, "") for ip in finding.ips]
+            rows += [(kind, "", value) for kind, _, value in (record.partition(" ") for record in finding.records)]
+            for kind, ip, value in rows or [("", "", "")]:
+                yield finding.host, finding.path or "", kind, ip, value, finding.status, finding.size
+        else:
+            yield (finding.host, finding.path or "", finding.rtype or "", finding.ip or "", finding.value or "",
+                   finding.status, finding.size)
+
+class ScanHistory:
+    """
+    Every finding from every run, kept in SQLite with the target, tool and when it was
+    first and last seen. Answers "what is new since the last run / since a time" from
+    indexes, and full-text queries through an FTS5 index (LIKE when FTS5 is missing).
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self.fts = False
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connection(self):
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                self._db.execute(statement)
+            try:
+                for statement in FTS_SCHEMA:
+                    self._db.execute(statement)
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False
+            self._db.commit()
+        return self._db
+
+    def record_run(self, target, tool, command, findings, returncode=None, started_at=None):
+        """
+        Stores one run and its findings in a single transaction. Returns (run id, number of
+        findings never seen before for this target and tool).
+        """
+        now = time.time()
+        rows = list(dict.fromkeys(_observations(findings)))
+        with self._lock:
+            db = self._connection()
+            with db:
+                run_id = db.execute(
+                    "INSERT INTO runs (target, tool, command, started_at, finished_at, returncode, findings)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (target, tool, command, started_at or now, now, returncode, len(rows)),
+                ).lastrowid
+                db.executemany(
+                    f"INSERT INTO findings ({FINDING_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (target, tool, host, path, kind, ip, value) DO UPDATE SET"
+                    " last_seen = excluded.last_seen, last_run = excluded.last_run,"
+                    " status = COALESCE(excluded.status, status), size = COALESCE(excluded.size, size)",
+                    [(target, tool, *row, now, now, run_id, run_id) for row in rows],
+                )
+                new = db.execute("SELECT COUNT(*) FROM findings WHERE first_run = ?", (run_id,)).fetchone()[0]
+                db.execute("UPDATE runs SET new_findings = ? WHERE id = ?", (new, run_id))
+        return run_id, new
+
+    def runs(self, target=None, tool=None, limit=20):
+        """
+        Returns the most recent runs, newest first, optionally for one target and/or tool.
+        """
+        clauses, params = [], []
+        if target:
+            clauses.append("target = ?")
+            params.append(target)
+        if tool:
+            clauses.append("tool = ?")
+            params.append(tool)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._connection().execute(
+                f"SELECT * FROM runs{where} ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+
+    def diff_last_run(self, target, tool):
+        """
+        Compares the latest run of a tool against the one before it.
+        Returns (new rows first seen in the latest run, rows seen before but not in it),
+        or None if the tool has never run against the target.
+        """
+        runs = self.runs(target, tool, limit=2)
+        if not runs:
+            return None
+        latest = runs[0]["id"]
+        with self._lock:
+            db = self._connection()
+            new = db.execute(
+                f"SELECT {FINDING_COLUMNS} FROM findings WHERE first_run = ? ORDER BY host, path", (latest,)
+            ).fetchall()
+            gone = []
+            if len(runs) > 1:
+                gone = db.execute(
+                    f"SELECT {FINDING_COLUMNS} FROM findings WHERE last_run = ? ORDER BY host, path", (runs[1]["id"],)
+                ).fetchall()
+        return new, gone
+
+    def new_since(self, target, since):
+        """
+        Returns (hosts, paths) of the target first seen by any tool at or after since
+        (a Unix time), as sorted lists of host and (host, path) pairs.
+        """
+        with self._lock:
+            db = self._connection()
+            hosts = db.execute(
+                "SELECT host FROM findings WHERE target = ? GROUP BY host HAVING MIN(first_seen) >= ? ORDER BY host",
+                (target, since),
+            ).fetchall()
+            paths = db.execute(
+                "SELECT host, path FROM findings WHERE target = ? AND path != '' GROUP BY host, path"
+                " HAVING MIN(first_seen) >= ? ORDER BY host, path",
+                (target, since),
+            ).fetchall()
+        return [row["host"] for row in hosts], [(row["host"], row["path"]) for row in paths]
+
+    def search(self, query, target=None, limit=50):
+        """
+        Full-text search over hosts, paths, record values, IPs, tools and targets.
+        With FTS5 the query uses its syntax (prefix*, "phrases", AND/OR/NOT) and results
+        are ranked; otherwise every word must appear as a substring.
+        """
+        with self._lock:
+            db = self._connection()
+            if not self.fts:
+                return self._like_search(db, query.split(), target, limit)
+            try:
+                return self._fts_search(db, query, target, limit)
+            except sqlite3.OperationalError:
+                # Not valid FTS syntax (e.g. a bare URL); search for its words as phrases instead
+                words = re.findall(r"[\w.-]+", query)
+                if not words:
+                    return []
+                return self._fts_search(db, " AND ".join(f'"{word}"' for word in words), target, limit)
+
+    @staticmethod
+    def _fts_search(db, match, target, limit):
+        columns = ", ".join(f"findings.{column}" for column in FINDING_COLUMNS.split(", "))
+        target_clause = " AND findings.target = ?" if target else ""
+        return db.execute(
+            f"SELECT {columns} FROM findings_fts JOIN findings ON findings.id = findings_fts.rowid"
+            f" WHERE findings_fts MATCH ?{target_clause} ORDER BY rank LIMIT ?",
+            (match, *([target] if target else []), limit),
+        ).fetchall()
+
+    @staticmethod
+    def _like_search(db, words, target, limit):
+        clauses = ["(host || ' ' || path || ' ' || value || ' ' || ip || ' ' || tool || ' ' || target) LIKE ?"
+                   for _ in words]
+        params = [f"%{word}%" for word in words]
+        if target:
+            clauses.append("target = ?")
+            params.append(target)
+        return db.execute(
+            f"SELECT {FINDING_COLUMNS} FROM findings WHERE {' AND '.join(clauses) or '1'}"
+            " ORDER BY last_seen DESC LIMIT ?", (*params, limit),
+        ).fetchall()
+
+    def stats(self):
+        """
+        Returns (run count, finding count).
+        """
+        with self._lock:
+            db = self._connection()
+            return (db.execute("SELECT COUNT(*) FROM runs").fetchone()[0],
+                    db.execute("SELECT COUNT(*) FROM findings").fetchone()[0])
+
+# End of ScanHistory----------------------------------------------
+
+def describe_row(row):
+    """
+    One printable line for a findings row.
+    """
+    details = [detail for detail in (row["ip"], f"{row['kind']} {row['value']}".strip() if row["value"] else "",
+                                     f"status {row['status']}" if row["status"] is not None else "",
+                                     f"size {row['size']}" if row["size"] is not None else "") if detail]
+    seen = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["first_seen"]))
+    return f"{row['host']}{row['path']}  {'; '.join(details)}  [{row['tool']}, first seen {seen}]"
+
+# End of describe_row----------------------------------------------
@@ -0,0 +1,212 @@
+import asyncio
+import queue
+import threading
+
+from Dns_Client import DnsClient
+from Findings import Finding, FindingsIndex, normalize_host, parse_hostnames, parse_output
+from Process_Runner import stream_command
+from Wildcard_Dns import WildcardDetector
+
+# Marks the end of a stage's output on its queue
+DONE = object()
+
+class PipelineStopped(Exception):
+    """Raised inside stage callbacks to abort a running tool when the pipeline is stopped."""
+
+class SubdomainPipeline:
+    """
+    Streams subdomains from discovery tools into DNS resolution, and only live hosts
+    into content brute forcing. Stages run in their own threads and are connected by
+    bounded queues, so resolution and brute forcing start while discovery is still running
+    and a slow stage throttles the ones before it.
+    """
+
+    def __init__(self, domain, discovery_commands, brute_command, dns_server=None, queue_size=1000,
+                 resolve_concurrency=100, brute_workers=2, discovery_timeout=900, brute_timeout=1800,
+                 on_event=None):
+        self.domain = normalize_host(domain)
+        self.discovery_commands = discovery_commands
+        self.brute_command = brute_command
+        self.dns_server = dns_server
+        self.resolve_concurrency = resolve_concurrency
+        self.brute_workers = brute_workers
+        self.discovery_timeout = discovery_timeout
+        self.brute_timeout = brute_timeout
+        self.on_event = on_event
+        self.discovered = queue.Queue(maxsize=queue_size)
+        self.live = queue.Queue(maxsize=queue_size)
+        self.findings = FindingsIndex()
+        self.stats = {"discovered": 0, "resolved": 0, "wildcard": 0, "live": 0, "brute_forced": 0}
+        self.wildcards = None
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _event(self, stage, kind, data):
+        if self.on_event:
+            self.on_event(stage, kind, data)
+
+    def _check_stopped(self):
+        if self._stop.is_set():
+            raise PipelineStopped()
+
+    def _in_scope(self, name):
+        return name == self.domain or name.endswith("." + self.domain)
+
+    def _add_findings(self, findings):
+        with self._lock:
+            return self.findings.update(findings)
+
+    def _offer(self, name, source):
+        """
+        Queues a newly discovered in-scope name for resolution (blocking when the queue is full).
+        """
+        with self._lock:
+            if name in self._seen or not self._in_scope(name):
+                return
+            self._seen.add(name)
+            self.stats["discovered"] += 1
+        self._add_findings([Finding(name, source=source)])
+        self._event("discovery", "subdomain", name)
+        self.discovered.put(name)
+
+    # Stage 1: discovery --------------------------------------------------
+
+    def _discover(self, tool, command):
+        def on_line(line):
+            self._check_stopped()
+            for finding in parse_hostnames([line], tool):
+                self._offer(finding.host, tool)
+
+        try:
+            result = stream_command(command, timeout=self.discovery_timeout, on_line=on_line, cancel=self._stop)
+            self._check_stopped()
+            self._event("discovery", "finished", {"tool": tool, "ok": result.ok, "lines": result.line_count})
+        except PipelineStopped:
+            pass
+        except OSError as e:
+            self._event("discovery", "error", {"tool": tool, "error": str(e)})
+
+    def _discovery_stage(self):
+        self._offer(self.domain, "input")
+        threads = [threading.Thread(target=self._discover, args=(tool, command), daemon=True)
+                   for tool, command in self.discovery_commands]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.discovered.put(DONE)
+
+    # Stage 2: resolution -------------------------------------------------
+
+    async def _resolve_one(self, client, name):
+        addresses, cnames = [], []
+        for rtype in ("A", "AAAA"):
+            result = await client.query(name, rtype)
+            addresses.extend(record.value for record in result.records if record.rtype == rtype)
+            cnames.extend(normalize_host(record.value) for record in result.records if record.rtype == "CNAME")
+            if addresses:
+                break
+        with self._lock:
+            self.stats["resolved"] += 1
+        if not addresses:
+            return
+        # Names answered by a wildcard are not live hosts; don't spend brute forcing on them
+        if await self.wildcards.is_wildcard(name, addresses, cnames):
+            with self._lock:
+                self.stats["wildcard"] += 1
+            self._event("resolution", "wildcard", {"host": name, "addresses": addresses})
+            return
+        self._add_findings([Finding(name, "AAAA" if ":" in address else "A", ip=address, source="resolver")
+                            for address in addresses])
+        with self._lock:
+            self.stats["live"] += 1
+        self._event("resolution", "live", {"host": name, "addresses": addresses})
+        await asyncio.get_running_loop().run_in_executor(None, self.live.put, name)
+
+    async def _resolve_async(self):
+        loop = asyncio.get_running_loop()
+        in_flight = set()
+        async with DnsClient(self.dns_server, concurrency=self.resolve_concurrency) as client:
+            self.wildcards = WildcardDetector(client, self.domain)
+            while not self._stop.is_set():
+                name = await loop.run_in_executor(None, self.discovered.get)
+                if name is DONE:
+                    break
+                task = asyncio.ensure_future(self._resolve_one(client, name))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                if len(in_flight) >= self.resolve_concurrency:
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            if in_flight:
+                await asyncio.wait(in_flight)
+
+    def _resolution_stage(self):
+        try:
+            asyncio.run(self._resolve_async())
+        except OSError as e:
+            self._event("resolution", "error", {"error": str(e)})
+        finally:
+            for _ in range(self.brute_workers):
+                self.live.put(DONE)
+
+    # Stage 3: content brute force ----------------------------------------
+
+    def _brute_worker(self):
+        while True:
+            host = self.live.get()
+            if host is DONE or self._stop.is_set():
+                return
+            tool, command = self.brute_command(host)
+            self._event("brute", "started", {"host": host, "command": command})
+
+            def on_line(line):
+                self._check_stopped()
+                for finding in parse_output(tool, [line], host):
+                    if self._add_findings([finding]):
+                        self._event("brute", "finding", finding)
+
+            try:
+                result = stream_command(command, timeout=self.brute_timeout, on_line=on_line, cancel=self._stop)
+                self._check_stopped()
+                self._event("brute", "finished", {"host": host, "ok": result.ok, "lines": result.line_count})
+            except PipelineStopped:
+                return
+            except OSError as e:
+                self._event("brute", "error", {"host": host, "error": str(e)})
+            with self._lock:
+                self.stats["brute_forced"] += 1
+
+    # ---------------------------------------------------------------------
+
+    def stop(self):
+        """
+        Asks every stage to wind down; running tools are killed within Process_Runner.CANCEL_POLL seconds.
+        """
+        self._stop.set()
+
+    def run(self):
+        """
+        Runs all stages to completion (or until stop()) and returns the FindingsIndex.
+        """
+        threads = [threading.Thread(target=self._discovery_stage, daemon=True),
+                   threading.Thread(target=self._resolution_stage, daemon=True)]
+        threads += [threading.Thread(target=self._brute_worker, daemon=True) for _ in range(self.brute_workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stop()
+            # Unblock stages waiting on a queue so they can see the stop flag
+            for stage_queue in (self.discovered, self.live):
+                try:
+                    stage_queue.put_nowait(DONE)
+                except queue.Full:
+                    pass
+            raise
+        return self.findings
+
+# End of SubdomainPipeline----------------------------------------------
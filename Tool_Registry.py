@@ -0,0 +1,225 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+from Result_Cache import CACHE_DIR
+
+REGISTRY_FILE = os.path.join(CACHE_DIR, "tools.json")
+# Arguments that make each tool print its version; tools without one are not probed
+VERSION_ARGS = {
+    "dig": "-v",
+    "host": "-V",
+    "dnsenum": "--version",
+    "fierce": "--version",
+    "dnsrecon": "--version",
+    "theHarvester": "--version",
+    "amass": "-version",
+    "gobuster": "version",
+    "feroxbuster": "--version",
+    "puredns": "--version",
+}
+VERSION_RE = re.compile(r"\bv?(\d+(?:\.\d+)+(?:[-+~][\w.]+)?)")
+VERSION_TIMEOUT = 5
+# Where Debian/Kali install fierce's module when its interpreter cannot be asked
+FIERCE_MODULE = "/usr/lib/python3/dist-packages/fierce/fierce.py"
+FIERCE_BROKEN = "random.randint(1e10, 1e11)"
+FIERCE_FIXED = "random.randint(10**10, 10**11)"
+
+class ToolInfo:
+    """
+    What is known about one installed tool. Valid while the binary at path keeps
+    its size and mtime, and every fixed file keeps the mtime recorded in fixes.
+    """
+    __slots__ = ("name", "path", "version", "size", "mtime_ns", "fixes", "checked_at")
+
+    def __init__(self, name, path, version=None, size=None, mtime_ns=None, fixes=None, checked_at=None):
+        self.name = name
+        self.path = path
+        self.version = version
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.fixes = fixes or {}
+        self.checked_at = checked_at
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def describe(self):
+        fixes = "".join(f", {name}: {fix['status']}" for name, fix in self.fixes.items())
+        return f"{self.name:<13} {self.version or 'unknown version':<18} {self.path}{fixes}"
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def probe_version(path, name):
+    """
+    Runs the tool's version command and returns the first version-looking string, or None.
+    """
+    args = VERSION_ARGS.get(name)
+    if args is None:
+        return None
+    try:
+        completed = subprocess.run([path, *args.split()], capture_output=True, text=True,
+                                   timeout=VERSION_TIMEOUT, stdin=subprocess.DEVNULL)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_RE.search(completed.stdout + "\n" + completed.stderr)
+    return match.group(1) if match else None
+
+# Compatibility fixes --------------------------------------------------------
+
+def _fierce_module(path):
+    """
+    Finds the fierce.py module the fierce launcher imports, by asking the
+    interpreter from the launcher's shebang. Falls back to FIERCE_MODULE.
+    """
+    try:
+        with open(path, "rb") as launcher:
+            first_line = launcher.readline(256).decode(errors="replace")
+    except OSError:
+        first_line = ""
+    if first_line.startswith("#!"):
+        interpreter = first_line[2:].split()
+        try:
+            completed = subprocess.run(
+                [*interpreter, "-c", "import fierce.fierce as module; print(module.__file__)"],
+                capture_output=True, text=True, timeout=VERSION_TIMEOUT, stdin=subprocess.DEVNULL,
+            )
+            module = completed.stdout.strip()
+            if completed.returncode == 0 and module.endswith(".py"):
+                return module
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return FIERCE_MODULE
+
+def fix_fierce_randint(path):
+    """
+    Older fierce releases call random.randint with floats, which Python 3.12 rejects.
+    Rewrites the call in place (keeping a .bak copy) if the installed module has it.
+    """
+    module = _fierce_module(path)
+    try:
+        with open(module) as module_file:
+            source = module_file.read()
+    except OSError as e:
+        return {"file": module, "mtime_ns": None, "status": f"skipped ({e.strerror})"}
+    if FIERCE_BROKEN not in source:
+        return {"file": module, "mtime_ns": _file_mtime(module), "status": "not needed"}
+    try:
+        shutil.copy2(module, module + ".bak")
+        temp_path = f"{module}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as module_file:
+            module_file.write(source.replace(FIERCE_BROKEN, FIERCE_FIXED))
+        shutil.copymode(module, temp_path)
+        os.replace(temp_path, module)
+    except OSError as e:
+        return {"file": module, "mtime_ns": _file_mtime(module), "status": f"failed ({e.strerror})"}
+    return {"file": module, "mtime_ns": _file_mtime(module), "status": "applied"}
+
+# Fixes applied when a tool is (re)probed: tool -> {fix name: function(path) -> state}
+FIXES = {
+    "fierce": {"randint": fix_fierce_randint},
+}
+
+# End of compatibility fixes----------------------------------------------
+
+class ToolRegistry:
+    """
+    Lazily discovered external tools. A tool is looked up on PATH the first time it is
+    needed; its path, version and compatibility fixes are cached on disk and reused
+    for as long as the binary (and any fixed file) is unchanged, so normal start-up
+    runs no subprocesses and writes nothing.
+    """
+
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path) as registry_file:
+                    self._entries = {name: ToolInfo(**entry) for name, entry in json.load(registry_file).items()}
+            except (OSError, ValueError, TypeError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self, info):
+        """
+        Writes one entry, merging with whatever other processes saved in the meantime.
+        """
+        try:
+            with open(self.path) as registry_file:
+                stored = json.load(registry_file)
+        except (OSError, ValueError):
+            stored = {}
+        stored[info.name] = info.as_dict()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as registry_file:
+                json.dump(stored, registry_file, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _current(info, path, stat):
+        if info is None or info.path != path or (info.size, info.mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            return False
+        return all(_file_mtime(fix["file"]) == fix["mtime_ns"] for fix in info.fixes.values() if fix.get("file"))
+
+    def get(self, name):
+        """
+        Returns the ToolInfo for an installed tool, probing it (version, fixes) only
+        when it is new or has changed since it was cached. Returns None if it is not on PATH.
+        """
+        path = shutil.which(name)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            entries = self._load()
+            info = entries.get(name)
+            if self._current(info, path, stat):
+                return info
+            info = ToolInfo(name, path, probe_version(path, name), stat.st_size, stat.st_mtime_ns,
+                            checked_at=time.time())
+            for fix_name, fix in FIXES.get(name, {}).items():
+                info.fixes[fix_name] = fix(path)
+            entries[name] = info
+            self._save(info)
+            return info
+
+    def available(self, name):
+        return self.get(name) is not None
+
+    def forget(self, name=None):
+        """
+        Drops cached entries (all of them when name is None) so the next get() re-probes.
+        """
+        with self._lock:
+            entries = self._load()
+            if name is None:
+                entries.clear()
+            else:
+                entries.pop(name, None)
+
+    def status(self, names=None):
+        """
+        Returns {name: ToolInfo or None} for the given tools (default: every tool with a version probe).
+        """
+        return {name: self.get(name) for name in (names or VERSION_ARGS)}
+
+# End of ToolRegistry----------------------------------------------
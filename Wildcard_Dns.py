@@ -0,0 +1,317 @@
+import asyncio
+import random
+import string
+import time
+
+from Dns_Client import DnsClient
+from Findings import normalize_host, parse_output
+
+# Random names probed per parent zone when fingerprinting a wildcard
+PROBE_COUNT = 3
+# Extra probes allowed per zone to learn more of a rotating wildcard answer pool
+MAX_REPROBES = 10
+# Output lines whose hosts are checked together, and the longest a line waits for its batch
+FILTER_BATCH = 200
+FILTER_DELAY = 0.5
+
+def random_label(length=16):
+    return "".join(random.choice(string.ascii_lowercase + string.digits) for _ in range(length))
+
+class WildcardZone:
+    """
+    Wildcard fingerprint of one parent name: every address and CNAME target that
+    random, certainly non-existent names under it resolved to.
+    """
+    __slots__ = ("name", "addresses", "cnames", "probes")
+
+    def __init__(self, name):
+        self.name = name
+        self.addresses = set()
+        self.cnames = set()
+        self.probes = 0
+
+    @property
+    def wildcard(self):
+        return bool(self.addresses or self.cnames)
+
+    def matches(self, addresses, cnames=()):
+        """
+        True if an answer looks like it came from this wildcard: it points at a known
+        wildcard CNAME target, or all of its addresses are known wildcard addresses.
+        """
+        if cnames and self.cnames.intersection(cnames):
+            return True
+        return bool(addresses) and set(addresses) <= self.addresses
+
+    def __repr__(self):
+        return f"WildcardZone({self.name!r}, addresses={sorted(self.addresses)!r}, cnames={sorted(self.cnames)!r})"
+
+class WildcardDetector:
+    """
+    Detects wildcard DNS under a domain, including multi-level wildcards
+    (*.dev.example.com), by resolving random labels under each name's parent.
+    Parents are probed once, on first use, and shared by every name below them.
+    """
+
+    def __init__(self, client, domain, probes=PROBE_COUNT):
+        self.client = client
+        self.domain = normalize_host(domain)
+        self.probes = probes
+        self.zones = {}
+        self._probing = {}
+
+    def in_scope(self, name):
+        return name == self.domain or name.endswith("." + self.domain)
+
+    async def _resolve(self, name):
+        """
+        Returns (addresses, cname targets) for a name from its A and AAAA answers.
+        """
+        addresses, cnames = [], []
+        for rtype in ("A", "AAAA"):
+            result = await self.client.query(name, rtype)
+            for record in result.records:
+                if record.rtype in ("A", "AAAA"):
+                    addresses.append(record.value)
+                elif record.rtype == "CNAME":
+                    cnames.append(normalize_host(record.value))
+        return addresses, cnames
+
+    async def _probe_once(self, zone):
+        addresses, cnames = await self._resolve(f"{random_label()}.{zone.name}")
+        zone.addresses.update(addresses)
+        zone.cnames.update(cnames)
+        zone.probes += 1
+
+    async def probe(self, parent):
+        """
+        Returns the WildcardZone for a parent name, probing it on first use.
+        Concurrent callers for the same parent share one probe.
+        """
+        zone = self.zones.get(parent)
+        if zone is not None:
+            return zone
+        pending = self._probing.get(parent)
+        if pending is None:
+            pending = self._probing[parent] = asyncio.ensure_future(self._probe_zone(parent))
+        return await asyncio.shield(pending)
+
+    async def _probe_zone(self, parent):
+        zone = WildcardZone(parent)
+        await asyncio.gather(*(self._probe_once(zone) for _ in range(self.probes)))
+        self.zones[parent] = zone
+        self._probing.pop(parent, None)
+        return zone
+
+    async def is_wildcard(self, name, addresses=None, cnames=()):
+        """
+        True if name's answer is explained by a wildcard at its parent. addresses and
+        cnames are resolved here when not given. A wildcard that answers from a rotating
+        pool is re-probed a few times before an unmatched answer counts as real.
+        """
+        name = normalize_host(name)
+        if name == self.domain or not self.in_scope(name):
+            return False
+        zone = await self.probe(name.split(".", 1)[1])
+        if not zone.wildcard:
+            return False
+        if addresses is None:
+            addresses, cnames = await self._resolve(name)
+        while not zone.matches(addresses, cnames):
+            if zone.probes >= self.probes + MAX_REPROBES:
+                return False
+            before = len(zone.addresses) + len(zone.cnames)
+            await self._probe_once(zone)
+            if len(zone.addresses) + len(zone.cnames) == before:
+                return False
+        return True
+
+# End of WildcardDetector----------------------------------------------
+
+class WildcardFilter:
+    """
+    Blocking wrapper around WildcardDetector for filtering tool output line by line.
+    Keeps one event loop and DNS socket open until close(); decisions are cached per host
+    and filtered counts the distinct wildcard names seen.
+    """
+
+    def __init__(self, domain, dns_server=None, probes=PROBE_COUNT):
+        self.domain = normalize_host(domain)
+        self._loop = asyncio.new_event_loop()
+        self._client = DnsClient(dns_server or None)
+        self._loop.run_until_complete(self._client.__aenter__())
+        self.detector = WildcardDetector(self._client, self.domain, probes)
+        self.apex = None
+        self._decisions = {}
+        self.filtered = 0
+
+    def close(self):
+        if not self._loop.is_closed():
+            self._loop.run_until_complete(self._client.__aexit__(None, None, None))
+            self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def detect(self):
+        """
+        Probes random names directly under the domain; returns and keeps (as .apex) its WildcardZone.
+        """
+        self.apex = self._loop.run_until_complete(self.detector.probe(self.domain))
+        return self.apex
+
+    def decide(self, hosts):
+        """
+        Decides every undecided host of {host: addresses or None} at once: the checks
+        run concurrently on the filter's loop, bounded by the DnsClient's concurrency,
+        so a batch costs about one round trip instead of one per name.
+        """
+        pending = {normalize_host(host): addresses for host, addresses in hosts.items()}
+        pending = {host: addresses for host, addresses in pending.items() if host not in self._decisions}
+        if not pending:
+            return
+        decisions = self._loop.run_until_complete(self._decide_async(pending))
+        for host, wildcard in zip(pending, decisions):
+            self._decisions[host] = wildcard
+            if wildcard:
+                self.filtered += 1
+
+    async def _decide_async(self, pending):
+        return await asyncio.gather(*(self.detector.is_wildcard(host, addresses)
+                                      for host, addresses in pending.items()))
+
+    def is_wildcard(self, name, addresses=None):
+        self.decide({name: addresses})
+        return self._decisions[normalize_host(name)]
+
+    def line_filter(self, tool, target=None):
+        """
+        Returns a WildcardLineFilter for a tool's output.
+        """
+        return WildcardLineFilter(self, tool, target)
+
+# End of WildcardFilter----------------------------------------------
+
+class WildcardLineFilter:
+    """
+    keep(line) for a tool's output: False for lines whose parsed findings are all
+    wildcard answers, True otherwise (including lines with no findings). Called on
+    single lines it checks them one at a time; filter() and stream() check the hosts
+    of many lines together.
+    """
+
+    def __init__(self, wildcards, tool, target=None):
+        self.wildcards = wildcards
+        self.tool = tool
+        self.target = target
+
+    def _hosts(self, line):
+        """
+        Returns {host: addresses or None} for the in-scope findings of a line.
+        """
+        hosts = {}
+        for finding in parse_output(self.tool, [line], self.target):
+            if self.wildcards.detector.in_scope(finding.host):
+                hosts.setdefault(finding.host, [])
+                if finding.ip:
+                    hosts[finding.host].append(finding.ip)
+        return {host: addresses or None for host, addresses in hosts.items()}
+
+    def _decided(self, hosts):
+        # Every host is decided by now, so is_wildcard does not query again
+        return not hosts or not all(self.wildcards.is_wildcard(host) for host in hosts)
+
+    def __call__(self, line):
+        hosts = self._hosts(line)
+        self.wildcards.decide(hosts)
+        return self._decided(hosts)
+
+    def _keep_batch(self, lines):
+        parsed = [(line, self._hosts(line)) for line in lines]
+        pending = {}
+        for _, hosts in parsed:
+            pending.update(hosts)
+        self.wildcards.decide(pending)
+        return [line for line, hosts in parsed if self._decided(hosts)]
+
+    def filter(self, lines, batch_size=FILTER_BATCH):
+        """
+        Yields the kept lines of an iterable, checking batch_size lines at a time.
+        """
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield from self._keep_batch(batch)
+                batch = []
+        if batch:
+            yield from self._keep_batch(batch)
+
+    def stream(self, write, batch_size=FILTER_BATCH, delay=FILTER_DELAY):
+        """
+        Returns an on_line callback that buffers lines and passes the kept ones to write,
+        in order, once batch_size lines are waiting or a line arrives after the oldest
+        has waited delay seconds. Its flush() must be called when the output ends.
+        """
+        return BufferedLines(self._keep_batch, write, batch_size, delay)
+
+# End of WildcardLineFilter----------------------------------------------
+
+class BufferedLines:
+    """
+    on_line callback collecting lines for keep_batch(lines), which returns the ones to write.
+    """
+
+    def __init__(self, keep_batch, write, batch_size=FILTER_BATCH, delay=FILTER_DELAY):
+        self.keep_batch = keep_batch
+        self.write = write
+        self.batch_size = batch_size
+        self.delay = delay
+        self._lines = []
+        self._since = None
+
+    def __call__(self, line):
+        if not self._lines:
+            self._since = time.monotonic()
+        self._lines.append(line)
+        if len(self._lines) >= self.batch_size or time.monotonic() - self._since >= self.delay:
+            self.flush()
+
+    def flush(self):
+        lines, self._lines = self._lines, []
+        for line in self.keep_batch(lines) if lines else ():
+            self.write(line)
+
+# End of BufferedLines----------------------------------------------
+
+def filter_lines(line_filter, lines):
+    """
+    Yields the lines line_filter keeps, in batches when it supports that.
+    """
+    if hasattr(line_filter, "filter"):
+        return line_filter.filter(lines)
+    return filter(line_filter, lines)
+
+def filtered_lines(line_filter, write):
+    """
+    Returns an on_line callback passing only the lines line_filter keeps to write.
+    Buffered callbacks (see WildcardLineFilter.stream) need flush_lines() at the end.
+    """
+    if hasattr(line_filter, "stream"):
+        return line_filter.stream(write)
+
+    def show(line):
+        if line_filter(line):
+            write(line)
+    return show
+
+def flush_lines(on_line):
+    """
+    Writes out whatever a buffered on_line callback is still holding.
+    """
+    flush = getattr(on_line, "flush", None)
+    if flush:
+        flush()
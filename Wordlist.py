@@ -0,0 +1,220 @@
+import hashlib
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+
+from Result_Cache import CACHE_DIR
+
+# Where line-offset indexes are cached, keyed by the wordlist's absolute path
+INDEX_DIR = os.path.join(CACHE_DIR, "wordlists")
+# Chunk size used for counting newlines without building an index
+COUNT_CHUNK = 64 * 1024 * 1024
+
+class Wordlist:
+    """
+    A memory-mapped wordlist. Lines are read straight from the page cache, so
+    rockyou-sized lists never have to be loaded into RAM. A line-offset index is
+    built on first use and cached on disk, keyed by the file's size and mtime.
+    """
+
+    def __init__(self, path, index_dir=INDEX_DIR):
+        self.path = os.path.abspath(path)
+        self.index_dir = index_dir
+        self._file = open(self.path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self._offsets = None
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Index -----------------------------------------------------------------
+
+    @property
+    def index_path(self):
+        return os.path.join(self.index_dir, hashlib.sha256(self.path.encode()).hexdigest()[:32] + ".idx")
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "rb") as index_file:
+                header = array("Q")
+                header.fromfile(index_file, 3)
+                if header[0] != self.size or header[1] != self.mtime_ns:
+                    return None
+                offsets = array("Q")
+                offsets.fromfile(index_file, header[2])
+                return offsets
+        except (OSError, EOFError):
+            return None
+
+    def _save_index(self, offsets):
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as index_file:
+                array("Q", [self.size, self.mtime_ns, len(offsets)]).tofile(index_file)
+                offsets.tofile(index_file)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            pass
+
+    def _build_index(self):
+        offsets = array("Q")
+        data = self._map
+        position = 0
+        find = data.find
+        while position < self.size:
+            offsets.append(position)
+            newline = find(b"\n", position)
+            if newline == -1:
+                break
+            position = newline + 1
+        return offsets
+
+    def rebuild_index(self):
+        """
+        Rebuilds the line-offset index from the file and rewrites the cached copy. Returns the offsets.
+        """
+        self._offsets = self._build_index()
+        self._save_index(self._offsets)
+        return self._offsets
+
+    @property
+    def offsets(self):
+        """
+        Start offset of every line, loaded from the on-disk cache when it is current.
+        """
+        if self._offsets is None:
+            self._offsets = self._load_index()
+            if self._offsets is None:
+                self.rebuild_index()
+        return self._offsets
+
+    @property
+    def line_count(self):
+        """
+        Number of lines. Uses the index when it exists; otherwise counts newlines
+        chunk by chunk without building one.
+        """
+        if self._offsets is None:
+            self._offsets = self._load_index()
+        if self._offsets is not None:
+            return len(self._offsets)
+        count = 0
+        for start in range(0, self.size, COUNT_CHUNK):
+            count += self._map[start:start + COUNT_CHUNK].count(b"\n")
+        if self.size and self._map[self.size - 1:self.size] != b"\n":
+            count += 1
+        return count
+
+    # Reading ---------------------------------------------------------------
+
+    def _line_end(self, index):
+        offsets = self.offsets
+        return offsets[index + 1] if index + 1 < len(offsets) else self.size
+
+    def line(self, index):
+        start = self.offsets[index]
+        return self._map[start:self._line_end(index)].rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+    def lines(self, start=0, stop=None):
+        """
+        Yields decoded lines in [start, stop) straight from the memory map.
+        """
+        offsets = self.offsets
+        stop = len(offsets) if stop is None else min(stop, len(offsets))
+        data = self._map
+        for index in range(start, stop):
+            end = offsets[index + 1] if index + 1 < len(offsets) else self.size
+            yield data[offsets[index]:end].rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+    def __iter__(self):
+        return self.lines()
+
+    def __len__(self):
+        return self.line_count
+
+    def shards(self, count):
+        """
+        Splits the list into up to count (start, stop) line ranges of roughly equal
+        byte size. Nothing is copied; read a shard with lines(start, stop).
+        """
+        offsets = self.offsets
+        total = len(offsets)
+        if not total:
+            return []
+        count = max(1, min(count, total))
+        bounds = [0]
+        for shard in range(1, count):
+            bounds.append(max(bounds[-1], bisect_left(offsets, self.size * shard // count)))
+        bounds.append(total)
+        return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+    # Deduplication -----------------------------------------------------------
+
+    def deduplicate(self, output_path, replace_source=False):
+        """
+        Writes the unique lines (first occurrence wins, order kept) to output_path in a
+        single streaming pass. Seen lines are tracked as 64-bit hashes in an open-addressing
+        table sized from the line count, i.e. about 16 bytes per line of memory.
+        Output goes to a temporary file next to output_path that replaces it only when
+        complete. Writing over the wordlist itself raises ValueError unless replace_source
+        is set, in which case the wordlist is closed before it is replaced.
+        Returns (total lines, unique lines).
+        """
+        same_file = os.path.exists(output_path) and os.path.samefile(output_path, self.path)
+        if same_file and not replace_source:
+            raise ValueError(f"{output_path} is the wordlist being deduplicated")
+        total = self.line_count
+        capacity = 1
+        while capacity < total * 2:
+            capacity <<= 1
+        mask = capacity - 1
+        table = array("Q", bytes(8 * capacity))
+        unique = 0
+        data = self._map
+        temp_path = f"{os.path.abspath(output_path)}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as output:
+                for start, end in self._raw_spans():
+                    line = data[start:end].rstrip(b"\r\n")
+                    fingerprint = int.from_bytes(hashlib.blake2b(line, digest_size=8).digest(), "little") or 1
+                    slot = fingerprint & mask
+                    while True:
+                        stored = table[slot]
+                        if stored == 0:
+                            table[slot] = fingerprint
+                            output.write(line + b"\n")
+                            unique += 1
+                            break
+                        if stored == fingerprint:
+                            break
+                        slot = (slot + 1) & mask
+            if same_file:
+                self.close()
+            os.replace(temp_path, output_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return total, unique
+
+    def _raw_spans(self):
+        offsets = self.offsets
+        for index, start in enumerate(offsets):
+            yield start, offsets[index + 1] if index + 1 < len(offsets) else self.size
+
+# End of Wordlist----------------------------------------------